@@ -13,29 +13,111 @@ import threading
 # Add the project root to sys.path to allow importing from 'brain'
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before anything below (or the brain
+# modules it imports) reads its switches from os.environ
+load_dotenv()
+
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-import pandas as pd # Added for brain service logic
+import numpy as np
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import requests
 
-from brain.quant import QuantEngine
 # Import new GNews fetcher
 from brain.sentiment.news import fetch_gnews
+from brain.analysis.sentiment import SentimentEngine
 from backend.database import NewsDatabase
+from backend.singleflight import SingleFlight
+from backend.cache import TTLCache
+from brain.core.price_store import get_price_store
+from brain.core.twelvedata import get_client as get_twelvedata_client
 
 # --- NEW BRAIN ARCHITECTURE ---
-from brain.service import BrainService
-from brain.core.types import StockDataPoint, Article
-brain_service = BrainService()
-# ------------------------------
+from brain.core.types import StockDataPoint, Article, PriceSeries
+from brain.core.registry import lstm_candidates, model_registry
+from brain.prediction.prediction_cache import get_prediction_cache
+
+# Fast start: BrainService (and with it torch, xgboost, sklearn and pandas) is
+# built on first use instead of at import, so /health answers within a second
+# of boot. FAST_START=false restores eager construction.
+FAST_START = os.getenv("FAST_START", "true").lower() == "true"
+_brain_service = None
+_brain_service_lock = threading.Lock()
+
+
+def get_brain_service():
+    """The process-wide BrainService, constructed on first call."""
+    global _brain_service
+    if _brain_service is None:
+        with _brain_service_lock:
+            if _brain_service is None:
+                from brain.service import BrainService
+                _brain_service = BrainService()
+    return _brain_service
+
+
+if not FAST_START:
+    get_brain_service()
+
+# Warm-up (opt-in): at boot a daemon thread loads every model, runs one synthetic
+# inference through each and one synthetic analysis through BrainService.
+# /health/ready answers 503 until it finishes, so a load balancer can hold traffic.
+# Of the LSTM runtimes only the one PredictionEngine serves from is warmed: the first
+# of lstm_candidates(); the next is loaded only if that one is unavailable.
+WARMUP_ON_BOOT = os.getenv("WARMUP_ON_BOOT", "false").lower() == "true"
+WARMUP_MODELS = [m for m in os.getenv("WARMUP_MODELS", f"finbert,{lstm_candidates()[0]},scaler,xgboost").split(",") if m]
+warmup_state = {"state": "disabled", "seconds": None, "brain_seconds": None, "error": None}
+
+
+def _synthetic_history(n=120):
+    """A smooth fake price series long enough for every indicator and the LSTM window."""
+    start = datetime(2020, 1, 1)
+    closes = 100 + 5 * np.sin(np.arange(n) / 8.0) + np.arange(n) * 0.05
+    return [StockDataPoint(datetime=(start + timedelta(days=i)).strftime("%Y-%m-%d"), open=c, high=c * 1.01,
+                           low=c * 0.99, close=c, volume=1_000_000) for i, c in enumerate(closes.tolist())]
+
+
+def _warm_lstm_fallback():
+    """If no planned LSTM runtime loaded, warms the one PredictionEngine falls back to."""
+    candidates = lstm_candidates()
+    planned = [name for name in WARMUP_MODELS if name in candidates]
+    if not planned or any(model_registry.get(name) is not None for name in planned):
+        return
+    for name in candidates[candidates.index(planned[0]) + 1:]:
+        if name not in planned:
+            model_registry.warm_up([name])
+            if model_registry.get(name) is not None:
+                print(f"[Warm-up] {', '.join(planned)} unavailable; warmed '{name}' instead")
+                return
+
+
+def warm_up():
+    """Loads + exercises the models and the Brain; records progress in warmup_state."""
+    warmup_state.update(state="running", error=None)
+    start = time.perf_counter()
+    try:
+        model_registry.warm_up(WARMUP_MODELS)
+        _warm_lstm_fallback()
+        brain_start = time.perf_counter()
+        get_brain_service().analyze_ticker("WARMUP", _synthetic_history(), 0.0, [])
+        warmup_state["brain_seconds"] = round(time.perf_counter() - brain_start, 3)
+        warmup_state["state"] = "done"
+    except Exception as e:
+        print(f"[Warm-up] Failed: {e}")
+        warmup_state.update(state="failed", error=str(e))
+    warmup_state["seconds"] = round(time.perf_counter() - start, 3)
+    print(f"[Warm-up] {warmup_state}")
 
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+def start_warmup():
+    warmup_state["state"] = "pending"
+    threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+# ------------------------------
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -57,33 +139,27 @@ if not TWELVE_DATA_KEY:
 
 # Initialize DB
 db = NewsDatabase()
+price_store = get_price_store()
+twelvedata = get_twelvedata_client()  # Pooled session + process-wide rate limiter
 
-# In-memory cache: {ticker: {"data": {...}, "timestamp": float}}
-cache = {}
+# In-memory analysis cache: {"TICKER_RANGE": payload}
+# Bounded by entry count AND bytes, LRU-evicted, each entry expires after CACHE_TTL_SECONDS.
 CACHE_TTL_SECONDS = 5 * 60  # 5 minutes
-
-
-def get_cached_data(ticker: str) -> dict | None:
-    """
-    Retrieve cached data for a ticker if it exists and is not expired.
-    """
-    ticker_upper = ticker.upper()
-    if ticker_upper in cache:
-        cached_entry = cache[ticker_upper]
-        age = time.time() - cached_entry["timestamp"]
-        if age < CACHE_TTL_SECONDS:
-            return cached_entry["data"]
-    return None
-
-
-def set_cached_data(ticker: str, data: dict) -> None:
-    """
-    Store data in cache with current timestamp.
-    """
-    cache[ticker.upper()] = {
-        "data": data,
-        "timestamp": time.time()
-    }
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 256))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_MB", 128)) * 1024 * 1024
+
+# Stale-while-revalidate: an expired entry younger than CACHE_MAX_STALE_SECONDS is served
+# immediately (flagged "stale") while a background thread refreshes it. Older entries
+# are dropped, so the request blocks on a fresh fetch.
+SWR_ENABLED = os.getenv("CACHE_SWR", "true").lower() == "true"
+CACHE_MAX_STALE_SECONDS = float(os.getenv("CACHE_MAX_STALE_SECONDS", 30 * 60))
+cache = TTLCache("analysis", max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl_seconds=CACHE_TTL_SECONDS,
+                 stale_seconds=max(CACHE_MAX_STALE_SECONDS - CACHE_TTL_SECONDS, 0) if SWR_ENABLED else 0)
+
+# Single-flight: concurrent misses for the same key share one computation
+SINGLEFLIGHT_TIMEOUT_SECONDS = float(os.getenv("SINGLEFLIGHT_TIMEOUT_SECONDS", 60))
+analyze_flight = SingleFlight("analyze")
+news_flight = SingleFlight("general-news")
 
 def update_news_background(ticker):
     """
@@ -108,12 +184,11 @@ def update_news_background(ticker):
 
 
 
-from backend.manager import model_manager
-
-# ... (Imports) Note: I'm replacing the whole file's critical sections, so I'll do this in chunks.
-# Actually, I'll use replace_file_content to swap specific blocks to be safe.
-
-def fetch_stock_data(ticker, range_str="1W", force_refresh=False, company_name=None):
+def load_news_sentiment(ticker, force_refresh=False, company_name=None):
+    """
+    News stage: DB cache (if fresh and strong enough) or live GNews + FinBERT.
+    Returns (analyzed_news, weighted_sentiment).
+    """
     # 2. Fetch News & Sentiment
     print(f"Checking DB for {ticker}...")
     
@@ -196,6 +271,15 @@ def fetch_stock_data(ticker, range_str="1W", force_refresh=False, company_name=N
     else:
         current_sentiment = 0.0
 
+    return analyzed_news, current_sentiment
+
+
+def fetch_price_history(ticker, range_str="1W"):
+    """
+    Price stage: daily bars from Twelve Data (oldest first).
+    Returns (p_history, requested_points): the store's column arrays wrapped as a
+    PriceSeries without copying; row dicts are only built for the graph (graph_rows).
+    """
     # 3. Fetch Stock Data (Twelve Data)
     # Calculate YTD days
     days_ytd = (datetime.now() - datetime(datetime.now().year, 1, 1)).days + 1
@@ -218,96 +302,81 @@ def fetch_stock_data(ticker, range_str="1W", force_refresh=False, company_name=N
     except:
         fetch_size = 5000; req_int = 5000
 
-    url = "https://api.twelvedata.com/time_series"
-    params = {"symbol": ticker, "interval": "1day", "outputsize": str(fetch_size), "apikey": TWELVE_DATA_KEY}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
-    if "values" not in data:
-        raise ValueError(f"Twelve Data Error: {data.get('message', 'Unknown error')}")
-
-    full_history_data = [{
-        "date": d["datetime"],
-        "open": float(d["open"]),
-        "high": float(d["high"]),
-        "low": float(d["low"]),
-        "close": float(d["close"]),
-        "volume": int(d["volume"]),
-        "price": float(d["close"]),
-        "sentiment": round(current_sentiment, 4)
-    } for d in data["values"]]
-    full_history_data.reverse() # Oldest first
-    
+    # Local OHLCV store: only the bars newer than what is on disk come from Twelve Data
+    bars = price_store.get_history(ticker, outputsize=fetch_size, interval="1day")
+    return PriceSeries.from_bars(bars), req_int
+
+
+def graph_rows(p_history, req_int, current_sentiment):
+    """Graph payload rows for the last req_int bars (the requested range)."""
+    tail = p_history[-req_int:]
+    dates = np.datetime_as_string(tail.datetime, unit="D").tolist()
+    sentiment = round(current_sentiment, 4)
+    return [{
+        "date": date,
+        "open": o,
+        "high": h,
+        "low": l,
+        "close": c,
+        "volume": v,
+        "price": c,
+        "sentiment": sentiment
+    } for date, o, h, l, c, v in zip(dates, tail.open.tolist(), tail.high.tolist(),
+                                     tail.low.tolist(), tail.close.tolist(), tail.volume.tolist())]
+
+
+def to_brain_articles(analyzed_news):
+    """Converts analyzed news dicts to the Brain's Article type."""
+    return [
+        Article(
+            title=n["title"],
+            link=n["link"],
+            published=n["published"],
+            publisher=n["publisher"],
+            sentiment_score=n["sentiment"],
+            metadata=n["debug"]
+        ) for n in analyzed_news
+    ]
+
+
+def build_analysis_response(analyzed_news, current_sentiment, p_history, req_int, analysis):
+    """Assembles the /api/analyze payload from the stage outputs and the Brain result."""
+    import pandas as pd  # Already loaded by BrainService by the time a result exists
     # Slice for Graph (requested range)
-    if req_int < len(full_history_data):
-        graph_data = full_history_data[-req_int:]
-    else:
-        graph_data = full_history_data
+    graph_data = graph_rows(p_history, req_int, current_sentiment)
 
-    # 3. New Brain Architecture Analysis
-    try:
-        # Convert to Pydantic
-        p_history = [
-            StockDataPoint(
-                datetime=d["date"], 
-                open=d["open"], 
-                high=d["high"], 
-                low=d["low"], 
-                close=d["close"], 
-                volume=d["volume"]
-            ) for d in full_history_data
-        ]
-        
-        p_news = [
-            Article(
-                title=n["title"],
-                link=n["link"],
-                published=n["published"],
-                publisher=n["publisher"],
-                sentiment_score=n["sentiment"],
-                metadata=n["debug"]
-            ) for n in analyzed_news
-        ]
-
-        analysis = brain_service.analyze_ticker(ticker, p_history, current_sentiment, p_news)
-        
-        # Adapter for Legacy Frontend
-        tech_vals = analysis.components["technical"]["values"]
-        tech_scores = analysis.components["technical"]["scores"]
-        macd_vals = tech_vals.get("macd", {}) or {}
-        
-        quant_result = {
-            "final_score": analysis.final_score,
-            "signal": analysis.signal.value,
-            "confidence": analysis.confidence, # Add System-Wide Confidence
-            "breakdown": {
-                "rsi_val": round(tech_vals["rsi"], 2) if tech_vals.get("rsi") is not None and not pd.isna(tech_vals["rsi"]) else None,
-                "rsi_normalized": round(tech_scores["rsi"], 2),
-                "sma_val": round(tech_vals["sma"], 2) if tech_vals.get("sma") is not None and not pd.isna(tech_vals["sma"]) else None,
-                "trend_normalized": round(tech_scores["trend"], 2),
-                "current_price": tech_vals["current_price"],
-                "sentiment_input": analysis.sentiment_score,
-                "sentiment_normalized": analysis.sentiment_score * 100,
-                "macd": {
-                    "macd_line": round(macd_vals.get("macd"), 4) if macd_vals.get("macd") is not None and not pd.isna(macd_vals.get("macd")) else None,
-                    "signal_line": round(macd_vals.get("signal"), 4) if macd_vals.get("signal") is not None and not pd.isna(macd_vals.get("signal")) else None,
-                    "histogram": round(macd_vals.get("hist"), 4) if macd_vals.get("hist") is not None and not pd.isna(macd_vals.get("hist")) else None
-                }
-            },
-            "neural_analysis": {
-                "signal": analysis.components["neural"]["signal"],
-                "confidence": round(analysis.components["neural"]["confidence"], 4),
-                "model": "Hybrid LSTM v2 (Industry Grade)"
-            },
-            "weights": analysis.components["weights"],
-            "deep_insight": analysis.components.get("deep_insight", {}),
-            "expert_opinion": analysis.components.get("expert_opinion", {})
-        }
-    except Exception as e:
-        print(f"Brain Service Error: {e}")
-        # Fallback or re-raise? Re-raising to trigger circuit breaker is safer
-        raise e
+    # Adapter for Legacy Frontend
+    tech_vals = analysis.components["technical"]["values"]
+    tech_scores = analysis.components["technical"]["scores"]
+    macd_vals = tech_vals.get("macd", {}) or {}
+    
+    quant_result = {
+        "final_score": analysis.final_score,
+        "signal": analysis.signal.value,
+        "confidence": analysis.confidence, # Add System-Wide Confidence
+        "breakdown": {
+            "rsi_val": round(tech_vals["rsi"], 2) if tech_vals.get("rsi") is not None and not pd.isna(tech_vals["rsi"]) else None,
+            "rsi_normalized": round(tech_scores["rsi"], 2),
+            "sma_val": round(tech_vals["sma"], 2) if tech_vals.get("sma") is not None and not pd.isna(tech_vals["sma"]) else None,
+            "trend_normalized": round(tech_scores["trend"], 2),
+            "current_price": tech_vals["current_price"],
+            "sentiment_input": analysis.sentiment_score,
+            "sentiment_normalized": analysis.sentiment_score * 100,
+            "macd": {
+                "macd_line": round(macd_vals.get("macd"), 4) if macd_vals.get("macd") is not None and not pd.isna(macd_vals.get("macd")) else None,
+                "signal_line": round(macd_vals.get("signal"), 4) if macd_vals.get("signal") is not None and not pd.isna(macd_vals.get("signal")) else None,
+                "histogram": round(macd_vals.get("hist"), 4) if macd_vals.get("hist") is not None and not pd.isna(macd_vals.get("hist")) else None
+            }
+        },
+        "neural_analysis": {
+            "signal": analysis.components["neural"]["signal"],
+            "confidence": round(analysis.components["neural"]["confidence"], 4),
+            "model": "Hybrid LSTM v2 (Industry Grade)"
+        },
+        "weights": analysis.components["weights"],
+        "deep_insight": analysis.components.get("deep_insight", {}),
+        "expert_opinion": analysis.components.get("expert_opinion", {})
+    }
     
     # Debug Stats
     scraping_stats = {
@@ -326,6 +395,249 @@ def fetch_stock_data(ticker, range_str="1W", force_refresh=False, company_name=N
     }
 
 
+# News and price stages are independent: run them side by side on a bounded pool
+STAGE_WORKERS = int(os.getenv("STAGE_WORKERS", 8))
+stage_pool = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="stage")
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+def fetch_stock_data(ticker, range_str="1W", force_refresh=False, company_name=None):
+    start = time.perf_counter()
+
+    # 2. Fetch News & Sentiment + 3. Fetch Stock Data (Twelve Data), concurrently.
+    # Both futures are always awaited, so a failing stage never cancels the other.
+    news_future = stage_pool.submit(_timed, load_news_sentiment, ticker, force_refresh, company_name)
+    price_future = stage_pool.submit(_timed, fetch_price_history, ticker, range_str)
+    wait([news_future, price_future])
+
+    timings = {}
+    try:
+        (analyzed_news, current_sentiment), timings["news_ms"] = news_future.result()
+    except Exception as e:
+        # Degrade to neutral news instead of failing the whole analysis
+        print(f"News Stage Error for {ticker}: {e}. Continuing with neutral sentiment.")
+        analyzed_news, current_sentiment = [], 0.0
+        timings["news_error"] = str(e)
+
+    # No prices -> nothing to analyze: propagate so the caller's circuit breaker kicks in
+    (p_history, req_int), timings["price_ms"] = price_future.result()
+
+    # 4. New Brain Architecture Analysis
+    try:
+        p_news = to_brain_articles(analyzed_news)
+        analysis, timings["brain_ms"] = _timed(get_brain_service().analyze_ticker, ticker, p_history, current_sentiment, p_news)
+        timings["brain_stages"] = analysis.components.get("stages", {})
+    except Exception as e:
+        print(f"Brain Service Error: {e}")
+        # Fallback or re-raise? Re-raising to trigger circuit breaker is safer
+        raise e
+    
+    response = build_analysis_response(analyzed_news, current_sentiment, p_history, req_int, analysis)
+    timings["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    response["debug"]["timings"] = timings
+    print(f"[Timing] {ticker}: {timings}")
+    return response
+
+
+def compute_analysis(ticker, range_str="1W", force_refresh=False, company_name=None):
+    """
+    fetch_stock_data + cache fill, coalesced so concurrent callers for the same
+    ticker/range share one computation. Returns (data, shared).
+    """
+    cache_key = f"{ticker}_{range_str}"
+
+    def compute():
+        if not force_refresh:
+            # Another flight may have filled the cache while we were queued
+            fresh = cache.get(cache_key, record_stats=False)
+            if fresh:
+                return fresh
+        data = fetch_stock_data(ticker, range_str, force_refresh=force_refresh, company_name=company_name)
+        cache.set(cache_key, data)
+        return data
+
+    return analyze_flight.do((ticker, range_str, force_refresh), compute, timeout=SINGLEFLIGHT_TIMEOUT_SECONDS)
+
+
+def compute_analysis_batch(tickers, range_str="1W", force_refresh=False):
+    """
+    compute_analysis for many tickers. Each ticker joins analyze_flight under the same
+    (ticker, range, force) key as the single-ticker path: tickers already in flight
+    wait for that call, the rest are fetched together by fetch_stock_data_batch.
+    Returns {ticker: (data or exception, shared)}.
+    """
+    claimed = {}
+    joined = {}
+    for ticker in tickers:
+        call, leader = analyze_flight.begin((ticker, range_str, force_refresh))
+        (claimed if leader else joined)[ticker] = call
+
+    results = {}
+    try:
+        to_fetch = []
+        for ticker in claimed:
+            # Another flight may have filled the cache while we were queued
+            fresh = None if force_refresh else cache.get(f"{ticker}_{range_str}", record_stats=False)
+            if fresh:
+                results[ticker] = (fresh, False)
+            else:
+                to_fetch.append(ticker)
+        if to_fetch:
+            fetched = fetch_stock_data_batch(to_fetch, range_str, force_refresh=force_refresh)
+            for ticker in to_fetch:
+                data = fetched.get(ticker)
+                if isinstance(data, dict):
+                    cache.set(f"{ticker}_{range_str}", data)
+                elif not isinstance(data, Exception):
+                    data = RuntimeError(f"No result for {ticker}")
+                results[ticker] = (data, False)
+    except Exception as e:
+        for ticker in claimed:
+            results.setdefault(ticker, (e, False))
+    finally:
+        # Every claimed flight is finished, even if the batch itself blew up
+        for ticker, call in claimed.items():
+            data = results.get(ticker, (RuntimeError(f"No result for {ticker}"), False))[0]
+            if isinstance(data, Exception):
+                analyze_flight.finish((ticker, range_str, force_refresh), call, error=data)
+            else:
+                analyze_flight.finish((ticker, range_str, force_refresh), call, data)
+
+    for ticker, call in joined.items():
+        try:
+            data = analyze_flight.wait((ticker, range_str, force_refresh), call, timeout=SINGLEFLIGHT_TIMEOUT_SECONDS)
+        except Exception as e:
+            data = e
+        results[ticker] = (data, True)
+    return results
+
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def update_analysis_background(ticker, range_str="1W", company_name=None):
+    """
+    Refreshes a stale analysis cache entry in the background (one thread per key at a time).
+    """
+    key = (ticker, range_str)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        print(f"[Background] Revalidating analysis for {ticker} ({range_str})...")
+        try:
+            compute_analysis(ticker, range_str, company_name=company_name)
+        except Exception as e:
+            print(f"[Background] Revalidation Failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def serve_cached(ticker, range_str="1W", company_name=None):
+    """
+    Cached payload for ticker/range, or None on a miss.
+    Stale entries are returned flagged "stale" and trigger a background refresh.
+    """
+    entry = cache.get_entry(f"{ticker}_{range_str}")
+    if entry is None:
+        return None
+
+    cached_data = entry.value
+    # Hotfix: Filter cached data on the fly to remove old 0.00 records
+    if 'news' in cached_data:
+        cached_data['news'] = [n for n in cached_data['news'] if abs(n['sentiment']) >= 0.05]
+
+    if entry.stale:
+        update_analysis_background(ticker, range_str, company_name)
+    return {
+        **cached_data,
+        "cached": True,
+        "stale": entry.stale,
+        "cache_age_seconds": round(entry.age, 1)
+    }
+
+
+# --- BATCH ANALYSIS ---
+BATCH_MAX_TICKERS = int(os.getenv("BATCH_MAX_TICKERS", 60))
+BATCH_FETCH_WORKERS = int(os.getenv("BATCH_FETCH_WORKERS", 8))
+
+
+def circuit_breaker_response(ticker, error):
+    return {
+        "ticker": ticker,
+        "current_sentiment": 0.0,
+        "news": [],
+        "graph_data": [],
+        "circuit_breaker": True,
+        "error": str(error)
+    }
+
+
+def fetch_stock_data_batch(tickers, range_str="1W", force_refresh=False):
+    """
+    fetch_stock_data for many tickers at once.
+    News and prices fan out concurrently per ticker; the Brain then scores
+    every ticker that fetched successfully in one batched pass.
+    Returns {ticker: response_or_exception}.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=BATCH_FETCH_WORKERS) as pool:
+        news_futures = {t: pool.submit(load_news_sentiment, t, force_refresh) for t in tickers}
+        price_futures = {t: pool.submit(fetch_price_history, t, range_str) for t in tickers}
+
+        stages = {}
+        for t in tickers:
+            try:
+                analyzed_news, current_sentiment = news_futures[t].result()
+            except Exception as e:
+                print(f"News Stage Error for {t}: {e}. Continuing with neutral sentiment.")
+                analyzed_news, current_sentiment = [], 0.0
+            try:
+                p_history, req_int = price_futures[t].result()
+                stages[t] = (analyzed_news, current_sentiment, p_history, req_int)
+            except Exception as e:
+                results[t] = e
+
+    ready = [t for t in tickers if t in stages]
+    if not ready:
+        return results
+
+    try:
+        analyses = get_brain_service().analyze_batch(
+            ready,
+            [stages[t][2] for t in ready],
+            [stages[t][1] for t in ready],
+            [to_brain_articles(stages[t][0]) for t in ready]
+        )
+    except Exception as e:
+        print(f"Brain Service Error: {e}")
+        for t in ready:
+            results[t] = e
+        return results
+
+    for t, analysis in zip(ready, analyses):
+        analyzed_news, current_sentiment, p_history, req_int = stages[t]
+        if isinstance(analysis, Exception):
+            # The Brain isolates failures per ticker: this one could not be analyzed
+            results[t] = analysis
+            continue
+        try:
+            results[t] = build_analysis_response(analyzed_news, current_sentiment, p_history, req_int, analysis)
+        except Exception as e:
+            results[t] = e
+    return results
+
+
 @app.route("/api/analyze", methods=["GET"])
 def analyze():
     """
@@ -343,41 +655,74 @@ def analyze():
     force_refresh = request.args.get("force", "false").lower() == "true"
     company_name = request.args.get("name") # Optional company name from frontend
     
-    # Check cache first (skip if forcing refresh)
-    cache_key = f"{ticker}_{range_param}"
-    cached_data = get_cached_data(cache_key)
-    
-    if cached_data and not force_refresh:
-        # Hotfix: Filter cached data on the fly to remove old 0.00 records
-        if 'news' in cached_data:
-            cached_data['news'] = [n for n in cached_data['news'] if abs(n['sentiment']) >= 0.05]
-            
-        return jsonify({
-            **cached_data,
-            "cached": True
-        })
+    # Check cache first (skip if forcing refresh); stale entries are served while revalidating
+    if not force_refresh:
+        cached_data = serve_cached(ticker, range_param, company_name)
+        if cached_data:
+            return jsonify(cached_data)
     
-    # Fetch fresh data
+    # Fetch fresh data (coalesced: one computation per ticker/range, concurrent callers share it)
     try:
-        data = fetch_stock_data(ticker, range_param, force_refresh=force_refresh, company_name=company_name)
-        set_cached_data(cache_key, data)
+        data, shared = compute_analysis(ticker, range_param, force_refresh=force_refresh, company_name=company_name)
         return jsonify({
             **data,
-            "cached": False
+            "cached": False,
+            "stale": False,
+            "coalesced": shared
         })
     except Exception as e:
         # Circuit Breaker: Log error and return mock data for frontend rendering
         print(f"Warning: Data provider blocked or failed. Switching to Circuit Breaker. Error: {e}")
-        
-        circuit_breaker_data = {
-            "ticker": ticker,
-            "current_sentiment": 0.0,
-            "news": [],
-            "graph_data": [],
-            "circuit_breaker": True,
-            "error": str(e)
-        }
-        return jsonify(circuit_breaker_data)
+        return jsonify(circuit_breaker_response(ticker, e))
+
+
+@app.route("/api/analyze/batch", methods=["GET", "POST"])
+def analyze_batch():
+    """
+    Analyze many tickers in one call.
+    GET  /api/analyze/batch?tickers=AAPL,MSFT&range=1M
+    POST /api/analyze/batch {"tickers": ["AAPL", "MSFT"], "range": "1M", "force": false}
+    Returns {"results": {ticker: <same payload as /api/analyze>}}.
+    """
+    body = request.get_json(silent=True) or {}
+    tickers = body.get("tickers") or request.args.get("tickers", "")
+    if isinstance(tickers, str):
+        tickers = tickers.split(",")
+    
+    # Normalize + dedupe (keep order)
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+    if not tickers:
+        return jsonify({
+            "error": "Missing required parameter: tickers"
+        }), 400
+    if len(tickers) > BATCH_MAX_TICKERS:
+        return jsonify({
+            "error": f"Too many tickers ({len(tickers)}). Max is {BATCH_MAX_TICKERS}."
+        }), 400
+    
+    range_param = body.get("range") or request.args.get("range", "1W")
+    force_refresh = str(body.get("force", request.args.get("force", "false"))).lower() == "true"
+    
+    results = {}
+    misses = []
+    for ticker in tickers:
+        cached_data = None if force_refresh else serve_cached(ticker, range_param)
+        if cached_data:
+            results[ticker] = cached_data
+        else:
+            misses.append(ticker)
+    
+    if misses:
+        computed = compute_analysis_batch(misses, range_param, force_refresh=force_refresh)
+        for ticker in misses:
+            data, shared = computed[ticker]
+            if isinstance(data, dict):
+                results[ticker] = {**data, "cached": False, "stale": False, "coalesced": shared}
+            else:
+                print(f"Warning: Batch fetch failed for {ticker}. Switching to Circuit Breaker. Error: {data}")
+                results[ticker] = circuit_breaker_response(ticker, data)
+    
+    return jsonify({"results": {t: results[t] for t in tickers}})
 
 
 import threading
@@ -407,25 +752,11 @@ from bs4 import BeautifulSoup
 # --- CACHE STORAGE ---
 
 
-movers_cache = {
-
-
-    "data": {"gainers": [], "losers": [], "active": []},
-
+# Refreshed by the scheduler every 2 hours; entries never expire, they are replaced.
+movers_cache = TTLCache("movers", max_entries=1)
+news_cache = TTLCache("general-news", max_entries=1)
 
-    "timestamp": 0
-
-
-}
-
-
-
-
-
-news_cache = {
-    "data": [],
-    "timestamp": 0
-}
+EMPTY_MOVERS = {"gainers": [], "losers": [], "active": []}
 
 
 
@@ -443,9 +774,6 @@ def update_movers_cache():
     """Scrapes StockAnalysis.com and updates the global cache."""
 
 
-    global movers_cache
-
-
     print("[Scheduler] Updating Market Movers...")
 
 
@@ -608,7 +936,7 @@ def update_movers_cache():
     if gainers or losers:
 
 
-        movers_cache["data"] = {
+        movers_cache.set("data", {
 
 
             "gainers": gainers,
@@ -620,10 +948,7 @@ def update_movers_cache():
             "active": active
 
 
-        }
-
-
-        movers_cache["timestamp"] = time.time()
+        })
 
 
         print("[Scheduler] Market Movers Updated.")
@@ -634,7 +959,6 @@ def update_movers_cache():
 
 def update_news_cache():
     """Fetches GNews 'stock market' and updates global cache."""
-    global news_cache
     print("[Scheduler] Updating General News...")
     
     try:
@@ -642,8 +966,7 @@ def update_news_cache():
         top_news = articles[:20]
         
         if top_news:
-            news_cache["data"] = top_news
-            news_cache["timestamp"] = time.time()
+            news_cache.set("data", top_news)
             print("[Scheduler] General News Updated.")
             
     except Exception as e:
@@ -749,7 +1072,7 @@ def market_movers():
 
 
 
-    return jsonify(movers_cache["data"])
+    return jsonify(movers_cache.get("data") or EMPTY_MOVERS)
 
 
 
@@ -760,10 +1083,14 @@ def general_news():
     """Returns cached general news (auto-refreshed in bg)."""
     force = request.args.get('force', 'false').lower() == 'true'
     
-    if force or not news_cache["data"]:
-        update_news_cache()
+    if force or not news_cache.get("data"):
+        # Coalesced: concurrent callers wait on the same refresh instead of each scraping GNews
+        try:
+            news_flight.do("general-news", update_news_cache, timeout=SINGLEFLIGHT_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"[General News] Refresh wait failed: {e}")
         
-    return jsonify(news_cache["data"])
+    return jsonify(news_cache.get("data") or [])
 
 
 
@@ -778,32 +1105,72 @@ def search_symbols():
     if not query:
         return jsonify({"data": []})
         
-    url = "https://api.twelvedata.com/symbol_search"
-    params = {
-        "symbol": query,
-        "apikey": TWELVE_DATA_KEY
-    }
-    
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if "data" in data:
-            return jsonify(data)
-        else:
-            return jsonify({"data": []})
+        return jsonify({"data": twelvedata.symbol_search(query)})
             
     except Exception as e:
         print(f"Search API Error: {e}")
         return jsonify({"data": []})
 
 
+@app.route("/api/cache/stats", methods=["GET"])
+def cache_stats():
+    """Hit/miss/eviction counters and memory use of the in-process caches."""
+    stats = {c.name: c.stats() for c in (cache, movers_cache, news_cache)}
+    score_cache = SentimentEngine.get_score_cache()
+    if score_cache is not None:
+        stats["finbert-scores"] = score_cache.stats()
+    prediction_cache = get_prediction_cache()
+    if prediction_cache is not None:
+        stats["predictions"] = prediction_cache.stats()
+    if _brain_service is not None:
+        streams = _brain_service.get_indicator_streams()
+        if streams is not None:
+            stats["indicator-streams"] = streams.stats()
+    return jsonify(stats)
+
+
+@app.route("/api/models", methods=["GET"])
+def models_status():
+    """Per-model load state, load time and memory footprint from the shared model registry."""
+    return jsonify(model_registry.status())
+
+
 @app.route("/health", methods=["GET"])
+@app.route("/health/live", methods=["GET"])
 def health():
-    """Health check endpoint."""
+    """Liveness: the process is up and serving. Never touches the models."""
     return jsonify({"status": "healthy"})
 
 
+@app.route("/health/ready", methods=["GET"])
+def readiness():
+    """
+    Readiness: 200 once warm-up has finished (or immediately when warm-up is off,
+    models then load lazily on first use), 503 while it is still running or if it
+    failed ("degraded": the error is in warmup.error, /health/live stays 200).
+    Per-model ready flags and load/warm-up durations come from the model registry.
+    """
+    models = {
+        name: {
+            # A model in the warm-up plan is ready once warmed; any other once it has loaded
+            "ready": s["warm"] if WARMUP_ON_BOOT and name in WARMUP_MODELS else s["available"],
+            "available": s["available"],
+            "load_seconds": s["load_seconds"],
+            "warmup_seconds": s["warmup_seconds"],
+            "error": s["error"],
+        }
+        for name, s in model_registry.status().items()
+    }
+    state = warmup_state["state"]
+    status = {"disabled": "ready", "done": "ready", "failed": "degraded"}.get(state, "warming")
+    return jsonify({"status": status, "warmup": warmup_state, "models": models}), (200 if status == "ready" else 503)
+
+
+if WARMUP_ON_BOOT:
+    start_warmup()
+
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 5000))
     debug = os.getenv("FLASK_DEBUG", "false").lower() == "true"
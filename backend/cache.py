@@ -0,0 +1,179 @@
+"""
+Bounded, memory-accounted LRU + TTL cache.
+
+Replaces the unbounded module-level dicts in backend/app.py. Entries are evicted
+least-recently-used first whenever the entry count or the byte budget is exceeded,
+and expire individually after their TTL. All operations are guarded by one lock,
+so the cache is safe under threaded serving.
+
+With stale_seconds > 0 an expired entry is kept for that extra grace period so
+callers can serve it stale (via get_entry) while a fresh value is computed.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate footprint in bytes: the size of the value serialized as JSON."""
+    try:
+        return len(json.dumps(value, default=str, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class _Entry:
+    __slots__ = ("value", "size", "created", "expires", "stale_until")
+
+    def __init__(self, value: Any, size: int, created: float,
+                 expires: Optional[float], stale_until: Optional[float]):
+        self.value = value
+        self.size = size
+        self.created = created
+        self.expires = expires
+        self.stale_until = stale_until
+
+
+class CacheEntry(NamedTuple):
+    """Result of TTLCache.get_entry: the value, its age in seconds and whether it is past its TTL."""
+    value: Any
+    age: float
+    stale: bool
+
+
+class TTLCache:
+    def __init__(self,
+                 name: str,
+                 max_entries: int = 256,
+                 max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None,
+                 stale_seconds: float = 0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            name: Label used in stats/logs.
+            max_entries: Maximum number of live entries.
+            max_bytes: Byte budget across all entries (None = unlimited).
+            ttl_seconds: Default time-to-live (None = never expires).
+            stale_seconds: How long past its TTL an entry stays servable via get_entry.
+            clock: Time source in seconds (injectable for tests).
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+
+    def get(self, key: Hashable, record_stats: bool = True) -> Optional[Any]:
+        """
+        Value if present and not expired (refreshes its LRU position), else None.
+        record_stats=False is for internal re-checks that should not skew the hit rate.
+        """
+        entry = self.get_entry(key, record_stats=False)
+        fresh = entry is not None and not entry.stale
+        if record_stats:
+            with self._lock:
+                self._counters["hits" if fresh else "misses"] += 1
+        return entry.value if fresh else None
+
+    def get_entry(self, key: Hashable, record_stats: bool = True) -> Optional[CacheEntry]:
+        """
+        Like get(), but an expired entry still inside its stale grace period is
+        returned with stale=True instead of None.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            now = self._clock()
+            if entry is not None and entry.stale_until is not None and now >= entry.stale_until:
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                if record_stats:
+                    self._counters["misses"] += 1
+                return None
+            stale = entry.expires is not None and now >= entry.expires
+            self._data.move_to_end(key)
+            if record_stats:
+                self._counters["stale_hits" if stale else "hits"] += 1
+            return CacheEntry(entry.value, now - entry.created, stale)
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """
+        Stores a value. Returns False if the value alone exceeds the byte budget.
+        """
+        size = estimate_size(value)
+        now = self._clock()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires = now + ttl if ttl is not None else None
+        stale_until = expires + self.stale_seconds if expires is not None else None
+
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                self._counters["rejected"] += 1
+                return False
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = _Entry(value, size, now, expires, stale_until)
+            self._bytes += size
+            self._evict()
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        # Entries past their stale grace go first, then least-recently-used until within budget
+        now = self._clock()
+        for key in [k for k, e in self._data.items() if e.stale_until is not None and now >= e.stale_until]:
+            self._remove(key)
+            self._counters["expirations"] += 1
+
+        while self._data and (
+            len(self._data) > self.max_entries or
+            (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self._counters["evictions"] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, record_stats=False) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["stale_hits"] + self._counters["misses"]
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "stale_seconds": self.stale_seconds,
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0
+            }
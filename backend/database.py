@@ -1,5 +1,4 @@
 import os
-from supabase import create_client, Client
 from dotenv import load_dotenv
 import time
 
@@ -11,9 +10,10 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 class NewsDatabase:
     def __init__(self):
-        self.client: Client = None
+        self.client = None
         if SUPABASE_URL and SUPABASE_KEY:
             try:
+                from supabase import create_client  # Imported only when a database is configured
                 self.client = create_client(SUPABASE_URL, SUPABASE_KEY)
                 print("[DB] Connected to Supabase.")
             except Exception as e:
@@ -1,8 +1,8 @@
-import os
 import torch
 import logging
+from brain.core.config import BrainConfig
+from brain.core.registry import model_registry
 from brain.neural_networks.data_processor import DataProcessor
-from brain.neural_networks.model import StockLSTM
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,7 +22,7 @@ class ModelManager:
         self.device = torch.device('cpu') # Inference on CPU is sufficient
         self.processor = None
         self.model = None
-        self.model_path = "brain/saved_models/hybrid_lstm.pth"
+        self.model_path = BrainConfig.MODEL_PATH
         
         # Lazy load flag
         self._loaded = False
@@ -37,21 +37,18 @@ class ModelManager:
         logger.info("Loading AI Resources...")
         
         try:
-            # 1. Initialize Processor (Loads Scaler)
+            # 1. Initialize Processor
             self.processor = DataProcessor(sequence_length=60)
             
-            # 2. Initialize Model
-            self.model = StockLSTM(input_size=13)
+            # 2. Model: the registry's shared StockLSTM (sized from the checkpoint, same
+            #    instance PredictionEngine uses, so the weights are held in memory once)
+            self.model = model_registry.get("lstm")
             
-            if os.path.exists(self.model_path):
-                logger.info(f"Loading model weights from {self.model_path}")
-                self.model.load_state_dict(torch.load(self.model_path, map_location=self.device))
-                self.model.to(self.device)
-                self.model.eval()
+            if self.model is not None:
+                self.device = next(self.model.parameters()).device
                 self._loaded = True
             else:
                 logger.warning(f"Model file not found at {self.model_path}. Neural predictions will be disabled.")
-                self.model = None
                 
         except Exception as e:
             logger.error(f"Failed to load AI resources: {e}")
@@ -81,7 +78,8 @@ class ModelManager:
             input_tensor = torch.FloatTensor(input_tensor).to(self.device)
             
             with torch.no_grad():
-                prediction = self.model(input_tensor).item()
+                # 3-class logits [Sell, Hold, Buy] -> probability of Buy
+                prediction = torch.softmax(self.model(input_tensor), dim=1)[0, 2].item()
                 
             signal = "Bullish" if prediction > 0.50 else "Bearish"
             return signal, prediction
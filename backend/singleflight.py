@@ -0,0 +1,87 @@
+"""
+Single-flight request coalescing.
+
+When many threads ask for the same key at once, only the first (the "leader")
+runs the computation; the others block until it finishes and receive the same
+result (or the same exception). Waiters give up after a timeout so a hung
+upstream call cannot pin request threads forever.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiter when the in-flight computation did not finish in time."""
+    pass
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = {"leaders": 0, "coalesced": 0, "timeouts": 0}
+
+    def begin(self, key: Hashable) -> Tuple[_Call, bool]:
+        """
+        Joins the in-flight call for key, or starts one. Returns (call, leader).
+        A leader must finish() the call; everyone else wait()s on it. do() is the
+        one-call form; begin/finish let one leader run many keys in a single batch.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["leaders"] += 1
+                return call, True
+            call.waiters += 1
+            self.stats["coalesced"] += 1
+            return call, False
+
+    def finish(self, key: Hashable, call: _Call, result: Any = None, error: Optional[BaseException] = None):
+        """Publishes the leader's result (or exception) to every waiter of call."""
+        call.result, call.error = result, error
+        # Remove before signalling so late arrivals start a fresh call
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+    def wait(self, key: Hashable, call: _Call, timeout: Optional[float] = None) -> Any:
+        """The call's result; raises its exception, or SingleFlightTimeout after `timeout` seconds."""
+        if not call.done.wait(timeout):
+            with self._lock:
+                self.stats["timeouts"] += 1
+            raise SingleFlightTimeout(f"[{self.name}] Timed out after {timeout}s waiting for {key!r}")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Runs fn() once per key among concurrent callers.
+        Returns (result, shared) where shared is True if this caller waited on another's call.
+        Raises fn's exception to every caller, or SingleFlightTimeout to a waiter after `timeout` seconds.
+        """
+        call, leader = self.begin(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self.finish(key, call, error=e)
+            else:
+                self.finish(key, call, result)
+        return self.wait(key, call, timeout), not leader
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,107 @@
+"""
+Benchmark: cold start of the Flask service, fast-start (lazy) vs eager.
+
+For each mode, launches `python backend/app.py` on a free port and reports
+  import ms      time to `import backend.app` in a fresh interpreter
+  healthy ms    process spawn -> first 200 from /health
+and, for fast-start, the deferred cost paid by the first analysis (BrainService build)
+plus the slowest top-level imports (from -X importtime).
+
+Usage: python bench_cold_start.py [--top N]
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def env_for(fast_start: bool, port: int = 0) -> dict:
+    env = dict(os.environ, FAST_START="true" if fast_start else "false", PYTHONUNBUFFERED="1")
+    if port:
+        env["PORT"] = str(port)
+    return env
+
+
+def import_ms(fast_start: bool) -> float:
+    code = "import time; t = time.perf_counter(); import backend.app; print((time.perf_counter() - t) * 1000)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env_for(fast_start),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def top_imports(n: int):
+    """[(cumulative_ms, module)] of the slowest modules imported directly by backend.app."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.app"], cwd=ROOT,
+                         env=env_for(True), capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth <= 1:
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def time_to_healthy(fast_start: bool, timeout: float = 120.0):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join("backend", "app.py")], cwd=ROOT,
+                            env=env_for(fast_start, port), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        healthy = None
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(f"{base}/health", timeout=1) as r:
+                    if r.status == 200:
+                        healthy = (time.perf_counter() - start) * 1000
+                        break
+            except OSError:
+                time.sleep(0.02)
+        if healthy is None:
+            raise RuntimeError("server never became healthy")
+        return healthy
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def brain_load_ms() -> float:
+    code = ("import time, backend.app as a; t = time.perf_counter(); a.get_brain_service(); "
+            "print((time.perf_counter() - t) * 1000)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env_for(True),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    top = int(sys.argv[sys.argv.index("--top") + 1]) if "--top" in sys.argv else 10
+
+    print("--- Cold start: backend/app.py ---")
+    print(f"{'Mode':<12}{'import ms':>12}{'healthy ms':>12}")
+    for name, fast in [("fast-start", True), ("eager", False)]:
+        healthy = time_to_healthy(fast)
+        print(f"{name:<12}{import_ms(fast):>12.0f}{healthy:>12.0f}")
+    print(f"fast-start: first Brain use (BrainService build) {brain_load_ms():.0f} ms")
+
+    print("\nSlowest imports under fast-start (cumulative ms):")
+    for ms, name in top_imports(top):
+        print(f"  {ms:>8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
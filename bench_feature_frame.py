@@ -0,0 +1,106 @@
+"""
+Benchmark: per-request feature CPU cost before/after the shared feature frame.
+
+Before: BrainService, PredictionEngine and XGBoostPredictor each built their own
+DataFrame from the StockDataPoint list and ran add_technical_indicators (3 passes).
+After: build_feature_frame runs once and each consumer selects its columns.
+
+Usage: python bench_feature_frame.py [n_bars] [repeats]
+"""
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from brain.core.types import StockDataPoint
+from brain.core.indicators import add_technical_indicators
+from brain.core.features import build_feature_frame, history_to_frame, select_features
+
+LSTM_COLS = [
+    'Log_Ret', 'RSI', 'MACD', 'MACD_Signal',
+    'BB_Pct', 'Vol_Ratio', 'ROC',
+    'SMA_Ratio', 'ATR_Pct', 'CCI',
+    'Ret_1d', 'Ret_3d', 'Ret_5d', 'Ret_10d', 'Ret_20d',
+    'Sentiment', 'NewsVol'
+]
+XGB_COLS = [
+    'Log_Ret', 'RSI', 'MACD', 'MACD_Signal',
+    'BB_Pct', 'Vol_Ratio', 'ROC',
+    'SMA_Ratio',
+    'Sentiment', 'NewsVol'
+]
+
+
+def make_history(n_bars: int) -> list:
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    dates = pd.bdate_range(end="2025-01-01", periods=n_bars)
+    return [
+        StockDataPoint(
+            datetime=d.strftime('%Y-%m-%d'),
+            open=float(c), high=float(c * 1.01), low=float(c * 0.99), close=float(c),
+            volume=int(v)
+        )
+        for d, c, v in zip(dates, close, rng.integers(1_000_000, 5_000_000, n_bars))
+    ]
+
+
+def legacy_three_passes(history):
+    # BrainService
+    df = add_technical_indicators(history_to_frame(history))
+
+    # PredictionEngine.prepare_data
+    records = [{'Open': d.open, 'High': d.high, 'Low': d.low, 'Close': d.close, 'Volume': d.volume, 'datetime': d.datetime} for d in history]
+    lstm_df = add_technical_indicators(pd.DataFrame(records))
+    lstm_df['Sentiment'] = 0.0
+    lstm_df['NewsVol'] = 0.0
+    lstm_df = lstm_df.replace([np.inf, -np.inf], np.nan).dropna()[LSTM_COLS]
+
+    # XGBoostPredictor.predict_probability
+    records = [{'Close': d.close, 'Open': d.open, 'High': d.high, 'Low': d.low, 'Volume': d.volume} for d in history]
+    xgb_df = add_technical_indicators(pd.DataFrame(records))
+    xgb_df['Sentiment'] = 0.0
+    xgb_df['NewsVol'] = 0.0
+    xgb_df = xgb_df.replace([np.inf, -np.inf], np.nan).dropna()[XGB_COLS]
+    return df, lstm_df, xgb_df
+
+
+def shared_single_pass(history):
+    df = build_feature_frame(history)
+    return df, select_features(df, LSTM_COLS), select_features(df, XGB_COLS)
+
+
+def measure(fn, history, repeats):
+    fn(history)  # warm-up
+    cpu = []
+    for _ in range(repeats):
+        start = time.process_time()
+        fn(history)
+        cpu.append(time.process_time() - start)
+    return float(np.median(cpu))
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    history = make_history(n_bars)
+
+    _, old_lstm, old_xgb = legacy_three_passes(history)
+    _, new_lstm, new_xgb = shared_single_pass(history)
+    assert np.allclose(old_lstm.values, new_lstm.values, equal_nan=True)
+    assert np.allclose(old_xgb.values, new_xgb.values, equal_nan=True)
+
+    legacy = measure(legacy_three_passes, history, repeats)
+    shared = measure(shared_single_pass, history, repeats)
+
+    print(f"--- Feature Stage CPU per Request ({n_bars} bars, median of {repeats}) ---")
+    print(f"Legacy (3 passes): {legacy * 1000:8.1f} ms")
+    print(f"Shared (1 pass):   {shared * 1000:8.1f} ms")
+    print(f"Saving:            {(legacy - shared) * 1000:8.1f} ms ({(1 - shared / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
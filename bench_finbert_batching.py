@@ -0,0 +1,98 @@
+"""
+Benchmark: FinBERT scoring from 16 concurrent callers, per-caller pipeline calls
+vs the cross-request MicroBatcher.
+
+Usage: python bench_finbert_batching.py [callers] [texts_per_caller] [--offline]
+
+--offline swaps in a randomly initialized BERT-base with FinBERT's architecture
+(same compute, meaningless scores) for machines without the downloaded weights.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.getcwd())
+
+from brain.analysis.batcher import MicroBatcher
+from brain.analysis.sentiment import SentimentEngine
+from brain.core.config import BrainConfig
+
+HEADLINES = [
+    "{} beats quarterly earnings estimates as cloud revenue surges",
+    "{} shares fall after regulators open antitrust probe",
+    "Analysts raise {} price target on strong iPhone demand",
+    "{} announces $10 billion buyback and dividend increase",
+    "{} warns of supply chain headwinds in the coming quarter",
+    "Institutional investors trim {} stakes amid valuation concerns",
+]
+
+
+def load_offline_pipeline():
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizer, pipeline
+
+    words = sorted({w.lower().strip(".,$") for h in HEADLINES for w in h.format("ticker").split()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words
+    vocab_file = os.path.join(tempfile.mkdtemp(), "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(vocab))
+
+    config = BertConfig(num_labels=3, id2label={0: "Neutral", 1: "Positive", 2: "Negative"},
+                        label2id={"Neutral": 0, "Positive": 1, "Negative": 2})
+    model = BertForSequenceClassification(config).eval()
+    return pipeline("sentiment-analysis", model=model, tokenizer=BertTokenizer(vocab_file), device=-1, top_k=None)
+
+
+def run(callers, per_caller, score_fn):
+    barrier = threading.Barrier(callers)
+    latencies = [0.0] * callers
+
+    def caller(i):
+        texts = [HEADLINES[(i + j) % len(HEADLINES)].format(f"T{i}") for j in range(per_caller)]
+        barrier.wait()
+        start = time.perf_counter()
+        score_fn(texts)
+        latencies[i] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return wall, latencies[len(latencies) // 2], latencies[-1]
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    callers = int(args[0]) if args else 16
+    per_caller = int(args[1]) if len(args) > 1 else 5
+
+    if "--offline" in sys.argv:
+        SentimentEngine._pipeline = load_offline_pipeline()
+    else:
+        SentimentEngine._load_model()
+
+    batcher = MicroBatcher(SentimentEngine._score_texts,
+                           max_batch_size=BrainConfig.FINBERT_MAX_BATCH_SIZE,
+                           max_wait_ms=BrainConfig.FINBERT_MAX_WAIT_MS)
+
+    # Warm-up (first forward pass allocates)
+    SentimentEngine._score_texts(["warm up"])
+    batcher(["warm up"])
+
+    print(f"--- FinBERT: {callers} concurrent callers x {per_caller} texts "
+          f"(max_batch={batcher.max_batch_size}, max_wait={batcher.max_wait * 1000:.0f}ms) ---")
+    print(f"{'Mode':<16}{'wall ms':>10}{'p50 ms':>10}{'max ms':>10}{'texts/s':>10}")
+    for name, fn in [("per-caller", SentimentEngine._score_texts), ("micro-batched", batcher)]:
+        wall, p50, worst = run(callers, per_caller, fn)
+        print(f"{name:<16}{wall * 1000:>10.0f}{p50 * 1000:>10.0f}{worst * 1000:>10.0f}"
+              f"{callers * per_caller / wall:>10.0f}")
+    print(f"batcher: {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Micro-benchmark: NumPy indicator kernels vs the original pandas implementations.
+
+Usage: python bench_indicator_kernels.py [n_bars] [repeats]
+"""
+import sys
+import os
+import timeit
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from brain.core import kernels
+from brain.core.indicators import add_technical_indicators
+from test_indicator_kernels import make_ohlc, ref_rsi_sma, ref_rsi_ewm, ref_cci, ref_add_technical_indicators
+
+
+def best_of(fn, repeats):
+    return min(timeit.repeat(fn, number=1, repeat=repeats))
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    df = make_ohlc(n=n_bars)
+    close, high, low = df['close'], df['high'], df['low']
+    c, h, l = close.to_numpy(), high.to_numpy(), low.to_numpy()
+
+    cases = [
+        ("RSI (sma)", lambda: ref_rsi_sma(close), lambda: kernels.rsi(c, 14, method="sma")),
+        ("RSI (ewm)", lambda: ref_rsi_ewm(close), lambda: kernels.rsi(c, 14, method="ewm")),
+        ("CCI", lambda: ref_cci(high, low, close), lambda: kernels.cci(h, l, c)),
+        ("Rolling std(20)", lambda: close.rolling(20).std(), lambda: kernels.rolling_std(c, 20)),
+        ("MACD", lambda: close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean(),
+         lambda: kernels.macd(c)),
+        ("add_technical_indicators", lambda: ref_add_technical_indicators(df), lambda: add_technical_indicators(df)),
+        ("add_technical_indicators (f32)", lambda: ref_add_technical_indicators(df),
+         lambda: add_technical_indicators(df, dtype=np.float32)),
+    ]
+
+    print(f"--- Indicator Kernels ({n_bars} bars, best of {repeats}) ---")
+    print(f"{'Indicator':<32}{'pandas ms':>12}{'numpy ms':>12}{'speedup':>10}")
+    for name, ref_fn, new_fn in cases:
+        ref_t = best_of(ref_fn, repeats)
+        new_t = best_of(new_fn, repeats)
+        print(f"{name:<32}{ref_t * 1000:>12.2f}{new_t * 1000:>12.2f}{ref_t / new_t:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
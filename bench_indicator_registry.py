@@ -0,0 +1,73 @@
+"""
+Benchmark: every indicator over the full history vs only the columns (and history
+tail) each consumer needs, through the indicator registry.
+
+    service   the shared frame of BrainService (technical + LSTM columns, last 60 rows)
+    lstm      a standalone LSTM window (PredictionEngine.prepare_data without a frame)
+    xgboost   the XGBoost columns over the full window (its z-score needs every row)
+
+Each is compared with build_feature_frame over the full history, which is what
+they all used before; the last column is the largest difference in the rows read.
+
+Usage: python bench_indicator_registry.py [n_bars]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from synthetic_history import make_history
+from brain.core.features import build_feature_frame
+from brain.core.indicators import FEATURE_SETS, lookback
+from brain.core.types import as_price_series
+from brain.prediction.engine import PredictionEngine
+from brain.prediction.xgboost_engine import feature_matrix
+from brain.service import FRAME_COLUMNS, FRAME_ROWS
+
+
+def best_ms(fn, repeats=20):
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def max_diff(frame, reference, columns):
+    rows = len(frame)
+    return max(float(np.nanmax(np.abs(frame[c].to_numpy() - reference[c].to_numpy()[-rows:]))) for c in columns)
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    series = as_price_series(make_history(n_bars))
+    full = build_feature_frame(series)
+    full_ms = best_ms(lambda: build_feature_frame(series))
+
+    steps = [
+        ("service", FRAME_COLUMNS, lambda: build_feature_frame(series, columns=FRAME_COLUMNS, rows=FRAME_ROWS)),
+        ("lstm", FEATURE_SETS["lstm"], lambda: build_feature_frame(series, columns="lstm",
+                                                                   rows=PredictionEngine.SEQUENCE_LENGTH)),
+        ("xgboost", FEATURE_SETS["xgboost"], lambda: feature_matrix(series.close)),
+    ]
+
+    print(f"--- {n_bars} bars; full frame (all {len(FEATURE_SETS['all'])} indicators): {full_ms:.2f} ms ---")
+    print(f"{'Consumer':<10}{'columns':>8}{'bars':>7}{'ms':>8}{'speedup':>9}{'max |diff|':>12}")
+    for name, columns, fn in steps:
+        ms = best_ms(fn)
+        if name == "xgboost":
+            bars = n_bars
+            diff = float(np.nanmax(np.abs(fn() - full.assign(Sentiment=0.0, NewsVol=0.0)[list(columns)].to_numpy())))
+        else:
+            bars = min(n_bars, PredictionEngine.SEQUENCE_LENGTH + lookback(columns) - 1)
+            diff = max_diff(fn(), full, columns)
+        print(f"{name:<10}{len(columns):>8}{bars:>7}{ms:>8.2f}{full_ms / ms:>8.1f}x{diff:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: StockLSTM worker footprint, torch runtime vs the torch-free NumPy port.
+
+Per runtime, a fresh interpreter imports PredictionEngine, loads the model and
+scores one window; reported are import+load time, peak RSS and whether torch
+was imported. Then forward-pass latency at batch 1 / 64 in this process.
+
+Usage: python bench_numpy_lstm.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from brain.core.config import BrainConfig
+
+WORKER = """
+import resource, sys, time
+t = time.perf_counter()
+import numpy as np
+from brain.prediction.engine import PredictionEngine
+engine = PredictionEngine()
+engine._load_resources()
+engine._forward(np.zeros((1, 60, len(engine.FEATURE_COLS)), dtype=np.float32))
+ms = (time.perf_counter() - t) * 1000
+print(ms, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 'torch' in sys.modules, type(engine.model).__name__)
+"""
+
+
+def worker(runtime):
+    env = dict(os.environ, LSTM_RUNTIME=runtime)
+    out = subprocess.run([sys.executable, "-c", WORKER], env=env, capture_output=True, text=True, check=True)
+    ms, rss, torch_loaded, model = out.stdout.strip().splitlines()[-1].split()
+    return float(ms), float(rss), torch_loaded, model
+
+
+def latency_ms(fn, x, repeats=20):
+    fn(x)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(x)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    print("--- Fresh worker: import + load + first prediction ---")
+    print(f"{'Runtime':<8}{'ms':>8}{'peak RSS MB':>13}{'torch?':>8}  model")
+    for runtime in ("torch", "numpy"):
+        ms, rss, torch_loaded, model = worker(runtime)
+        print(f"{runtime:<8}{ms:>8.0f}{rss:>13.0f}{torch_loaded:>8}  {model}")
+
+    import torch
+    from brain.neural_networks import numpy_lstm
+    from brain.neural_networks.serving import load_eager
+
+    eager = load_eager(BrainConfig.MODEL_PATH)
+    port = numpy_lstm.load()
+    if port is None:
+        port = numpy_lstm.load(numpy_lstm.export(out_path=os.path.join("/tmp", "hybrid_lstm.bench.npz")))
+
+    def torch_fn(x):
+        with torch.no_grad():
+            return eager(torch.from_numpy(x)).numpy()
+
+    print(f"\n--- Forward pass ({torch.get_num_threads()} torch threads) ---")
+    print(f"{'Batch':<8}{'torch ms':>10}{'numpy ms':>10}{'max|dlogit|':>13}")
+    rng = np.random.default_rng(0)
+    for batch in (1, 64):
+        x = rng.standard_normal((batch, 60, port.input_size)).astype(np.float32)
+        diff = np.abs(torch_fn(x) - port(x)).max()
+        print(f"{batch:<8}{latency_ms(torch_fn, x):>10.2f}{latency_ms(port, x):>10.2f}{diff:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
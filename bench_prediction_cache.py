@@ -0,0 +1,66 @@
+"""
+Benchmark: LSTM + XGBoost predictions for one ticker, computed vs served from the prediction cache.
+
+miss       empty cache: features, scaling and both models run
+hit        same ticker/bars again (memory layer)
+restart    a new process's view: fresh cache object over the same SQLite file (disk layer)
+
+Usage: python bench_prediction_cache.py [n_bars]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from bench_xgboost_fastpath import load_model
+from synthetic_history import make_history
+from brain.core.features import build_feature_frame
+from brain.prediction.engine import PredictionEngine
+from brain.prediction.prediction_cache import PredictionCache
+from brain.prediction.xgboost_engine import XGBoostPredictor
+
+
+def run(lstm, xgb_predictor, data, frame, ticker):
+    return (lstm.predict(data, features=frame, ticker=ticker),
+            xgb_predictor.predict_probability(data, features=frame, ticker=ticker))
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    path = os.path.join(tempfile.mkdtemp(), "predictions.sqlite3")
+    model, label = load_model()
+    data = make_history(n_bars)
+    frame = build_feature_frame(data)
+
+    def predictors(cache):
+        lstm = PredictionEngine(cache=cache)
+        lstm._load_resources()
+        return lstm, XGBoostPredictor(model=model, cache=cache)
+
+    lstm, xgb_predictor = predictors(PredictionCache(path))
+    run(lstm, xgb_predictor, make_history(n_bars, seed=99), frame, "WARM")  # first-call allocations
+
+    tickers = [f"T{i}" for i in range(20)]
+    miss = min(timed_ms(lambda: run(lstm, xgb_predictor, data, frame, t)) for t in tickers)
+    hit = min(timed_ms(lambda: run(lstm, xgb_predictor, data, frame, tickers[0])) for _ in range(20))
+    lstm, xgb_predictor = predictors(PredictionCache(path))
+    restart = timed_ms(lambda: run(lstm, xgb_predictor, data, frame, tickers[1]))
+
+    print(f"--- LSTM + XGBoost, {n_bars} bars, XGBoost model: {label} ---")
+    print(f"{'Path':<10}{'ms':>10}")
+    for name, ms in (("miss", miss), ("hit", hit), ("restart", restart)):
+        print(f"{name:<10}{ms:>10.2f}")
+    print(f"hit speedup: {miss / hit:.0f}x")
+    print(lstm.cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: price history as List[StockDataPoint] vs the columnar PriceSeries.
+
+Per step, best-of latency and tracemalloc allocations (peak during the step and
+bytes still held afterwards) for a 5000-bar history:
+
+    convert   price-store bars -> brain input: per-row dicts -> points (the first
+              request path) vs wrapping the arrays (fetch_price_history)
+    frame     brain input -> OHLCV DataFrame (history_to_frame)
+    features  build_feature_frame
+    xgb-in    timestamps/closes for the XGBoost lean path (history_arrays)
+    cache-key prediction-cache key (ticker, last bar, window digest)
+
+Usage: python bench_price_series.py [n_bars]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from brain.core.features import build_feature_frame, history_to_frame
+from brain.core.types import PriceSeries, StockDataPoint
+from brain.prediction.prediction_cache import PredictionCache
+from brain.prediction.xgboost_engine import history_arrays
+
+
+def make_bars(n, seed=0):
+    """Column arrays as the price store returns them."""
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return {"date": np.datetime64("2006-01-02", "s") + np.arange(n) * 86400, "open": closes * 0.995,
+            "high": closes * 1.01, "low": closes * 0.99, "close": closes, "volume": rng.integers(1e5, 1e7, n)}
+
+
+def to_points(bars):
+    # The first request path: one dict per bar, then one StockDataPoint per dict
+    dates = np.datetime_as_string(bars["date"], unit="D").tolist()
+    rows = [{"date": d, "open": o, "high": h, "low": l, "close": c, "volume": v, "price": c}
+            for d, o, h, l, c, v in zip(dates, bars["open"].tolist(), bars["high"].tolist(), bars["low"].tolist(),
+                                        bars["close"].tolist(), bars["volume"].tolist())]
+    return [StockDataPoint(datetime=d["date"], open=d["open"], high=d["high"], low=d["low"], close=d["close"],
+                           volume=d["volume"]) for d in rows]
+
+
+def best_ms(fn, repeats=10):
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def allocations_kb(fn):
+    """(peak KB allocated during fn, KB still allocated once its result is held)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return (peak - before) / 1024, (held - before) / 1024
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    bars = make_bars(n_bars)
+    points = to_points(bars)
+    series = PriceSeries.from_bars(bars)
+
+    steps = [
+        ("convert", lambda: to_points(bars), lambda: PriceSeries.from_bars(bars)),
+        ("frame", lambda: history_to_frame(points), lambda: history_to_frame(series)),
+        ("features", lambda: build_feature_frame(points), lambda: build_feature_frame(series)),
+        ("xgb-in", lambda: history_arrays(points), lambda: history_arrays(series)),
+        ("cache-key", lambda: PredictionCache.key("m", "v", "AAPL", points),
+         lambda: PredictionCache.key("m", "v", "AAPL", series)),
+    ]
+
+    print(f"--- {n_bars} bars: List[StockDataPoint] vs PriceSeries ---")
+    print(f"{'Step':<11}{'list ms':>9}{'series ms':>11}{'speedup':>9}{'list peak KB':>14}{'series peak KB':>16}"
+          f"{'list held KB':>14}{'series held KB':>16}")
+    total_list = total_series = 0.0
+    for name, old, new in steps:
+        old_ms, new_ms = best_ms(old), best_ms(new)
+        (old_peak, old_held), (new_peak, new_held) = allocations_kb(old), allocations_kb(new)
+        total_list += old_ms
+        total_series += new_ms
+        print(f"{name:<11}{old_ms:>9.2f}{new_ms:>11.2f}{old_ms / new_ms:>8.1f}x{old_peak:>14.0f}{new_peak:>16.0f}"
+              f"{old_held:>14.0f}{new_held:>16.0f}")
+    print(f"{'total':<11}{total_list:>9.2f}{total_series:>11.2f}{total_list / total_series:>8.1f}x")
+    print(f"history held: list of points {allocations_kb(lambda: to_points(bars))[1]:.0f} KB, "
+          f"PriceSeries {series.nbytes / 1024:.0f} KB of arrays")
+
+
+if __name__ == "__main__":
+    main()
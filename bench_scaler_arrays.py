@@ -0,0 +1,84 @@
+"""
+Benchmark: LSTM feature scaler, legacy pickle vs the array file.
+
+load       fresh interpreter: import + load (pickle pulls in sklearn; the .npz only numpy)
+transform  one (60, 17) window: sklearn StandardScaler.transform vs FeatureNormalizer.transform
+
+Usage: python bench_scaler_arrays.py
+"""
+import os
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from brain.neural_networks import normalizer
+
+LOAD_PICKLE = """
+import pickle, sys, time
+t = time.perf_counter()
+with open(sys.argv[1], 'rb') as f:
+    pickle.load(f)
+print((time.perf_counter() - t) * 1000, 'sklearn' in sys.modules)
+"""
+
+LOAD_ARRAYS = """
+import sys, time
+t = time.perf_counter()
+from brain.neural_networks.normalizer import FeatureNormalizer
+FeatureNormalizer.load(sys.argv[1])
+print((time.perf_counter() - t) * 1000, 'sklearn' in sys.modules)
+"""
+
+
+def fresh_ms(code, path, runs=5):
+    best, sklearn = float("inf"), None
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-W", "ignore", "-c", code, path], capture_output=True, text=True,
+                             check=True)
+        ms, sklearn = out.stdout.split()
+        best = min(best, float(ms))
+    return best, sklearn
+
+
+def best_us(fn, repeats=2000):
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    from brain.core.config import BrainConfig
+    import pickle
+
+    print("--- Fresh interpreter: import + load ---")
+    print(f"{'Format':<10}{'ms':>10}{'sklearn?':>10}")
+    for name, code, path in (("pickle", LOAD_PICKLE, BrainConfig.SCALER_PATH),
+                             ("npz", LOAD_ARRAYS, BrainConfig.SCALER_ARRAYS_PATH)):
+        ms, sklearn = fresh_ms(code, path)
+        print(f"{name:<10}{ms:>10.1f}{sklearn:>10}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with open(BrainConfig.SCALER_PATH, "rb") as f:
+            scaler = pickle.load(f)["scaler"]
+    arrays = normalizer.load()
+    x = np.random.default_rng(0).standard_normal((60, scaler.n_features_in_))
+
+    sk_us = best_us(lambda: scaler.transform(x))
+    np_us = best_us(lambda: arrays.transform(x))
+    print(f"\n--- transform, one (60, {scaler.n_features_in_}) window ---")
+    print(f"sklearn {sk_us:.1f} us, fused numpy {np_us:.1f} us ({sk_us / np_us:.0f}x), "
+          f"identical: {np.array_equal(scaler.transform(x), arrays.transform(x))}")
+
+
+if __name__ == "__main__":
+    main()
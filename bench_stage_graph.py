@@ -0,0 +1,66 @@
+"""
+Benchmark: BrainService.analyze_ticker, sequential stages vs the concurrent stage graph.
+
+sequential  features, technical, LSTM, XGBoost, ensemble one after the other (the previous flow)
+graph       analyze_ticker: technical / LSTM / XGBoost concurrently on the shared stage pool
+            (the shared frame only covers the LSTM window; XGBoost builds its own columns)
+
+The prediction cache is disabled so every call runs the models. The XGBoost stage
+uses the stand-in model of bench_xgboost_fastpath when the shipped one does not fit.
+
+Usage: python bench_stage_graph.py [n_bars]
+"""
+import os
+import sys
+import time
+
+os.environ["PREDICTION_CACHE"] = "false"
+sys.path.append(os.getcwd())
+
+from bench_xgboost_fastpath import load_model
+from synthetic_history import make_history
+from brain.core.features import build_feature_frame
+from brain.core.types import as_price_series
+from brain.prediction.xgboost_engine import XGBoostPredictor
+from brain.service import BrainService
+
+
+def sequential(service, ticker, data):
+    df = build_feature_frame(data)
+    technical = service._technical_analysis(df)
+    lstm_result = service.lstm_predictor.predict(data, features=df, ticker=ticker)
+    xgb_result = service.xgb_predictor.predict_probability(data, features=df, ticker=ticker)
+    return service._compose_result(ticker, data, 0.0, [], technical, lstm_result, xgb_result)
+
+
+def best_ms(fn, repeats=30):
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    n_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    service = BrainService()
+    model, label = load_model()
+    service.xgb_predictor = XGBoostPredictor(model=model)
+    data = as_price_series(make_history(n_bars))
+
+    seq_ms = best_ms(lambda: sequential(service, "BENCH", data))
+    graph_ms = best_ms(lambda: service.analyze_ticker("BENCH", data, 0.0, []))
+    stages = service.analyze_ticker("BENCH", data, 0.0, []).components["stages"]
+
+    print(f"--- analyze_ticker, {n_bars} bars, {os.cpu_count()} CPUs, XGBoost model: {label} ---")
+    print(f"sequential {seq_ms:.2f} ms, graph {graph_ms:.2f} ms ({seq_ms / graph_ms:.2f}x)")
+    print("stages: " + ", ".join(f"{name} {s['ms']:.2f} ms ({s['status']})" for name, s in stages.items()))
+    critical = max(stages["features"]["ms"] + max(stages[n]["ms"] for n in ("technical", "lstm")),
+                   stages["xgboost"]["ms"])
+    print(f"stage sum {sum(s['ms'] for s in stages.values()):.2f} ms, critical path {critical:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
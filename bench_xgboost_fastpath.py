@@ -0,0 +1,91 @@
+"""
+Benchmark: XGBoost scoring, previous path vs the fast path.
+
+previous  build_feature_frame (all indicators, DataFrame) + StandardScaler.fit_transform
+          over the window + sklearn predict_proba on the last row
+fast      the 10 FEATURE_COLS from the kernels + running moments + booster.inplace_predict
+
+Usage: python bench_xgboost_fastpath.py [n_bars] [batch]
+
+The shipped xgboost_model.json expects 17 features while the predictor feeds 10,
+so if it does not take 10 inputs a stand-in model with the same hyperparameters
+is trained on random data (tree count/depth drive the cost, not the weights).
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(os.getcwd())
+
+from brain.core.features import build_feature_frame, select_features
+from brain.core.registry import model_registry
+from brain.prediction.xgboost_engine import XGBoostPredictor
+from synthetic_history import make_history
+
+
+def load_model():
+    model = model_registry.get("xgboost")
+    if model is not None and model.n_features_in_ == 10:
+        return model, "shipped"
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((5000, 10))
+    y = np.digitize(X[:, 0] - X[:, 5], [-0.5, 0.5])
+    stand_in = xgb.XGBClassifier(n_estimators=500, max_depth=3, learning_rate=0.01, objective="multi:softprob",
+                                 num_class=3).fit(X, y)
+    return stand_in, "stand-in (500 trees, depth 3, 3 classes)"
+
+
+def previous_path(model, cols, data):
+    df = select_features(build_feature_frame(data), cols)
+    row = StandardScaler().fit_transform(df.values)[-1]
+    return model.predict_proba(row[None])[0][1]
+
+
+def previous_batch(model, cols, histories):
+    rows = [StandardScaler().fit_transform(select_features(build_feature_frame(h), cols).values)[-1]
+            for h in histories]
+    return model.predict_proba(np.vstack(rows))[:, 1]
+
+
+def best_ms(fn, repeats=20):
+    fn()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n_bars = int(args[0]) if args else 500
+    batch = int(args[1]) if len(args) > 1 else 32
+
+    model, label = load_model()
+    predictor = XGBoostPredictor(model=model)
+    cols = predictor.FEATURE_COLS
+    data = make_history(n_bars)
+    histories = [make_history(n_bars, seed=s) for s in range(batch)]
+    predictor.predict_probability(data, ticker="BENCH")  # primes the per-ticker running moments
+
+    print(f"--- XGBoost scoring, {n_bars} bars, model: {label} ---")
+    rows = [
+        ("single, previous", best_ms(lambda: previous_path(model, cols, data))),
+        ("single, fast", best_ms(lambda: predictor.predict_probability(data))),
+        ("single, fast + ticker", best_ms(lambda: predictor.predict_probability(data, ticker="BENCH"))),
+        (f"batch {batch}, previous", best_ms(lambda: previous_batch(model, cols, histories), repeats=5)),
+        (f"batch {batch}, fast", best_ms(lambda: predictor.predict_probability_batch(histories), repeats=5)),
+    ]
+    print(f"{'Path':<26}{'ms':>10}")
+    for name, ms in rows:
+        print(f"{name:<26}{ms:>10.2f}")
+    print(f"single speedup: {rows[0][1] / rows[1][1]:.1f}x, batch speedup: {rows[3][1] / rows[4][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Cross-request micro-batching.
+
+Concurrent callers submit small lists of inputs. A single worker thread merges
+whatever arrives within `max_wait_ms` (up to `max_batch_size` items) into one
+call of the batch function, then hands each caller its own slice of the
+results through a Future. For FinBERT this turns many small forward passes
+from parallel requests into a few large ones.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    __slots__ = ("items", "future")
+
+    def __init__(self, items: Sequence[Any]):
+        self.items = list(items)
+        self.future: Future = Future()
+
+
+class MicroBatcher:
+    def __init__(self,
+                 fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 32,
+                 max_wait_ms: float = 10.0,
+                 name: str = "microbatch"):
+        """
+        Args:
+            fn: Batch function; must return one result per input, in order.
+            max_batch_size: Items per call of fn. A single larger request is never split.
+            max_wait_ms: How long the first request of a batch waits for company.
+            name: Worker thread name.
+        """
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._carry = None  # Request that did not fit into the previous batch
+        self._stats_lock = threading.Lock()
+        self._counters = {"requests": 0, "items": 0, "batches": 0}
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, items: Sequence[Any]) -> Future:
+        """Queues items; the Future resolves to fn's results for exactly these items."""
+        request = _Request(items)
+        if not request.items:
+            request.future.set_result([])
+            return request.future
+        self._queue.put(request)
+        return request.future
+
+    def __call__(self, items: Sequence[Any]) -> List[Any]:
+        return self.submit(items).result()
+
+    def _collect(self) -> List[_Request]:
+        first = self._carry or self._queue.get()
+        self._carry = None
+        batch, size = [first], len(first.items)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(request.items) > self.max_batch_size:
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.items)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for request in batch for item in request.items]
+            try:
+                results = self.fn(items)
+                if len(results) != len(items):
+                    raise ValueError(f"{self.name}: batch function returned {len(results)} results for {len(items)} inputs")
+            except BaseException as e:
+                logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                n = len(request.items)
+                request.future.set_result(results[offset:offset + n])
+                offset += n
+
+            with self._stats_lock:
+                self._counters["requests"] += len(batch)
+                self._counters["items"] += len(items)
+                self._counters["batches"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            c = dict(self._counters)
+        c["avg_batch_items"] = round(c["items"] / c["batches"], 2) if c["batches"] else 0.0
+        c["queued"] = self._queue.qsize()
+        return c
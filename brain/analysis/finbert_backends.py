@@ -0,0 +1,180 @@
+"""
+Interchangeable FinBERT inference backends.
+
+Selected by BrainConfig.FINBERT_BACKEND:
+    "torch"       full-precision transformers pipeline (default)
+    "torch-int8"  dynamic int8 quantization of every nn.Linear (CPU)
+    "onnx"        exported once to ONNX, served by ONNX Runtime (CPU)
+    "onnx-int8"   the ONNX export with int8-quantized weights
+
+Every backend is called like the transformers pipeline with top_k=None:
+backend(texts, truncation=True, max_length=512, batch_size=n) returns, per text,
+a list of {"label", "score"} dicts, so SentimentEngine's scoring is unchanged.
+parity_check() compares any backend against the fp32 reference.
+"""
+import logging
+import os
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from brain.core.config import BrainConfig
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+try:
+    import onnxruntime as ort
+except ImportError:  # ONNX Runtime is optional; the onnx backends fall back to torch-int8
+    ort = None
+
+
+def _device():
+    import torch
+    if torch.cuda.is_available():
+        logger.info(f"FinBERT: Using GPU ({torch.cuda.get_device_name(0)})")
+        return 0
+    if torch.backends.mps.is_available():
+        logger.info("FinBERT: Using MPS (Apple Silicon)")
+        return "mps"
+    logger.info("FinBERT: Using CPU")
+    return -1
+
+
+def _load_fp32(model_name: str):
+    from transformers import BertTokenizer, BertForSequenceClassification
+    tokenizer = BertTokenizer.from_pretrained(model_name)
+    model = BertForSequenceClassification.from_pretrained(model_name).eval()
+    return tokenizer, model
+
+
+def _torch_pipeline(model, tokenizer, device):
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=device, top_k=None)
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of the Linear layers (weights int8, activations quantized on the fly)."""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+    return quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def onnx_path(model_name: str, quantized: bool = False) -> str:
+    stem = model_name.replace("/", "__") + ("-int8" if quantized else "")
+    return os.path.join(BrainConfig.FINBERT_ONNX_DIR, f"{stem}.onnx")
+
+
+def export_onnx(model, tokenizer, path: str) -> str:
+    """One-time ONNX export with dynamic batch/sequence axes."""
+    import torch
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    sample = tokenizer(["FinBERT export sample"], return_tensors="pt")
+    names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+    tmp = path + ".tmp"
+    with torch.no_grad():
+        torch.onnx.export(
+            model, tuple(sample[n] for n in names), tmp,
+            input_names=names, output_names=["logits"],
+            dynamic_axes={**{n: {0: "batch", 1: "sequence"} for n in names}, "logits": {0: "batch"}},
+            opset_version=17, dynamo=False
+        )
+    os.replace(tmp, path)
+    logger.info(f"FinBERT exported to ONNX: {path}")
+    return path
+
+
+def quantize_onnx(src: str, dst: str) -> str:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+    return dst
+
+
+class OnnxSentimentPipeline:
+    """Pipeline-compatible callable over an ONNX Runtime session."""
+
+    def __init__(self, path: str, tokenizer, id2label: Dict[int, str], threads: int = 0):
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = tokenizer
+        self.labels = [id2label[i] for i in range(len(id2label))]
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def __call__(self, texts: List[str], truncation: bool = True, max_length: int = 512,
+                 batch_size: int = 32, **kwargs) -> List[List[dict]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        out = []
+        for start in range(0, len(texts), max(batch_size, 1)):
+            enc = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=truncation,
+                                 max_length=max_length, return_tensors="np")
+            feed = {name: enc[name].astype(np.int64) for name in self.input_names}
+            logits = self.session.run(["logits"], feed)[0]
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            out.extend([[{"label": label, "score": float(p)} for label, p in zip(self.labels, row)]
+                        for row in probs])
+        return out
+
+
+def build_pipeline(model_name: str, backend: str = None) -> Callable:
+    """Loads FinBERT behind the requested backend (default BrainConfig.FINBERT_BACKEND)."""
+    backend = (backend or BrainConfig.FINBERT_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown FinBERT backend '{backend}'. Choose one of {BACKENDS}.")
+    if backend.startswith("onnx") and ort is None:
+        logger.warning("onnxruntime not installed; FinBERT falls back to the torch-int8 backend.")
+        backend = "torch-int8"
+
+    tokenizer, model = _load_fp32(model_name)
+    logger.info(f"FinBERT backend: {backend}")
+
+    if backend == "torch":
+        return _torch_pipeline(model, tokenizer, _device())
+    if backend == "torch-int8":
+        return _torch_pipeline(quantize_int8(model), tokenizer, -1)
+
+    path = onnx_path(model_name)
+    if not os.path.exists(path):
+        export_onnx(model, tokenizer, path)
+    if backend == "onnx-int8":
+        q_path = onnx_path(model_name, quantized=True)
+        if not os.path.exists(q_path):
+            path = quantize_onnx(path, q_path)
+        path = q_path
+    return OnnxSentimentPipeline(path, tokenizer, model.config.id2label)
+
+
+def composite_scores(results: List[List[dict]]) -> np.ndarray:
+    """The score SentimentEngine derives: (Positive - Negative) * 0.95."""
+    out = []
+    for res in results:
+        scores = {item["label"]: item["score"] for item in res}
+        out.append((scores.get("Positive", 0.0) - scores.get("Negative", 0.0)) * 0.95)
+    return np.asarray(out)
+
+
+def parity_check(reference: Callable, candidate: Callable, texts: List[str],
+                 tolerance: float = None) -> Dict[str, float]:
+    """
+    Scores texts with both backends. Returns max/mean absolute composite-score
+    difference, top-label agreement and `ok` (max diff within tolerance).
+    """
+    tolerance = BrainConfig.FINBERT_PARITY_TOLERANCE if tolerance is None else tolerance
+    ref = reference(texts, truncation=True, max_length=512, batch_size=len(texts))
+    cand = candidate(texts, truncation=True, max_length=512, batch_size=len(texts))
+    diff = np.abs(composite_scores(ref) - composite_scores(cand))
+    top = lambda res: [max(r, key=lambda item: item["score"])["label"] for r in res]
+    agreement = float(np.mean([a == b for a, b in zip(top(ref), top(cand))]))
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "label_agreement": agreement,
+        "tolerance": tolerance,
+        "ok": bool(diff.max() <= tolerance),
+    }
@@ -0,0 +1,43 @@
+"""
+Persistent, content-addressed cache for FinBERT sentiment scores.
+
+Keys are sha256(model id + normalized text), so the same headline is scored once
+no matter which ticker, link or job it arrives through. Stored in a
+brain.core.sqlite_store.SqliteLRUStore (in-memory LRU over SQLite).
+"""
+import hashlib
+import unicodedata
+from typing import Dict, Iterable, List
+
+from brain.core.sqlite_store import SqliteLRUStore
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for hashing: NFKC, collapsed whitespace, trimmed."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def text_key(text: str, model_id: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class ScoreCache(SqliteLRUStore):
+    def __init__(self, path: str, model_id: str, memory_entries: int = 4096):
+        """
+        Args:
+            path: SQLite file (created on first use).
+            model_id: Model name/version (and scoring formula); part of every key.
+            memory_entries: Capacity of the in-memory LRU layer.
+        """
+        super().__init__(path, "scores", {"score": "REAL NOT NULL"},
+                         memory_entries=memory_entries, name="finbert-scores")
+        self.model_id = model_id
+
+    def keys_for(self, texts: Iterable[str]) -> List[str]:
+        return [text_key(t, self.model_id) for t in texts]
+
+    def put_many(self, scores: Dict[str, float]) -> None:
+        super().put_many({key: float(score) for key, score in scores.items()})
+
+    def stats(self) -> Dict[str, object]:
+        return {**super().stats(), "model_id": self.model_id}
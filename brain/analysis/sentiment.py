@@ -1,9 +1,11 @@
-import torch
 import logging
-from transformers import BertTokenizer, BertForSequenceClassification, pipeline
 from typing import List, Optional
 from threading import Lock
 from brain.core.exceptions import ModelLoadException, AnalysisException
+from brain.core.config import BrainConfig
+from brain.analysis.score_cache import ScoreCache
+from brain.analysis.batcher import MicroBatcher
+from brain.core.registry import model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -13,7 +15,11 @@ class SentimentEngine:
     Thread-safe Singleton implementation.
     """
     _pipeline = None
-    _model_name = "yiyanghkust/finbert-tone"
+    _model_name = BrainConfig.FINBERT_MODEL_NAME
+    # Bump when the score formula changes: cached scores are keyed by it
+    _score_version = "pos-neg*0.95/r4"
+    _score_cache = None
+    _batcher = None
     _lock = Lock() # Thread Safety
 
     @classmethod
@@ -26,43 +32,69 @@ class SentimentEngine:
             if cls._pipeline is not None:
                 return
 
-            logger.info("Initializing FinBERT model...")
-            try:
-                tokenizer = BertTokenizer.from_pretrained(cls._model_name)
-                model = BertForSequenceClassification.from_pretrained(cls._model_name)
-                
-                device = -1 
-                if torch.cuda.is_available():
-                    device = 0
-                    logger.info(f"FinBERT: Using GPU ({torch.cuda.get_device_name(0)})")
-                elif torch.backends.mps.is_available():
-                    device = "mps"
-                    logger.info("FinBERT: Using MPS (Apple Silicon)")
-                else:
-                    logger.info("FinBERT: Using CPU")
+            # Shared with every other FinBERT user via the model registry (loaded once per process).
+            # Backend (fp32 torch / int8 / ONNX Runtime) chosen by BrainConfig.FINBERT_BACKEND
+            pipe = model_registry.get("finbert")
+            if pipe is None:
+                error = model_registry.status()["finbert"]["error"]
+                logger.critical(f"FinBERT Load Failed: {error}")
+                raise ModelLoadException(f"Could not load FinBERT: {error}")
+            cls._pipeline = pipe
 
-                cls._pipeline = pipeline(
-                    "sentiment-analysis", 
-                    model=model, 
-                    tokenizer=tokenizer, 
-                    device=device,
-                    top_k=None 
-                )
-                
-            except Exception as e:
-                logger.critical(f"FinBERT Load Failed: {e}")
-                raise ModelLoadException(f"Could not load FinBERT: {e}")
+    @classmethod
+    def get_score_cache(cls) -> Optional[ScoreCache]:
+        """Process-wide score cache (None when disabled via SCORE_CACHE=false)."""
+        if cls._score_cache is None and BrainConfig.SCORE_CACHE_ENABLED:
+            with cls._lock:
+                if cls._score_cache is None:
+                    cls._score_cache = ScoreCache(
+                        BrainConfig.SCORE_CACHE_PATH,
+                        model_id=f"{cls._model_name}|{BrainConfig.FINBERT_BACKEND}|{cls._score_version}",
+                        memory_entries=BrainConfig.SCORE_CACHE_MEMORY_ENTRIES
+                    )
+        return cls._score_cache
+
+    @staticmethod
+    def _composite(res) -> float:
+        scores = {item['label']: item['score'] for item in res}
+        composite = scores.get("Positive", 0.0) - scores.get("Negative", 0.0)
+        composite = composite * 0.95
+        return round(composite, 4)
+
+    @classmethod
+    def _score_texts(cls, texts: List[str]) -> List[float]:
+        """One pipeline call over non-empty texts."""
+        cls._load_model()
+        try:
+            results = cls._pipeline(texts, truncation=True, max_length=512, batch_size=len(texts))
+            return [cls._composite(res) for res in results]
+        except Exception as e:
+            logger.error(f"Sentiment Batch Error: {e}")
+            raise AnalysisException(f"Sentiment analysis failed: {e}")
+
+    @classmethod
+    def get_batcher(cls) -> Optional[MicroBatcher]:
+        """Process-wide micro-batcher in front of the pipeline (None when FINBERT_MICROBATCH=false)."""
+        if cls._batcher is None and BrainConfig.FINBERT_MICROBATCH:
+            with cls._lock:
+                if cls._batcher is None:
+                    cls._batcher = MicroBatcher(
+                        cls._score_texts,
+                        max_batch_size=BrainConfig.FINBERT_MAX_BATCH_SIZE,
+                        max_wait_ms=BrainConfig.FINBERT_MAX_WAIT_MS,
+                        name="finbert-batcher"
+                    )
+        return cls._batcher
 
     @classmethod
     def analyze_batch(cls, texts: List[str]) -> List[float]:
         """
         Analyzes a batch of texts.
         Returns sentiment scores from -1.0 (Negative) to 1.0 (Positive).
+        Scores already in the score cache are filled in; only misses reach the pipeline.
         """
         if not texts:
             return []
-            
-        cls._load_model()
         
         cleaned_texts = [t[:1500] if t else "" for t in texts]
         
@@ -71,23 +103,36 @@ class SentimentEngine:
         
         if not valid_inputs:
             return [0.0] * len(texts)
+        
+        cache = cls.get_score_cache()
+        if cache is not None:
+            keys = cache.keys_for(valid_inputs)
+            known = cache.get_many(keys)
+        else:
+            keys = [str(j) for j in range(len(valid_inputs))]
+            known = {}
+        
+        # Each distinct uncached text is scored once, even if repeated in the batch
+        misses = {}
+        for key, text in zip(keys, valid_inputs):
+            if key not in known and key not in misses:
+                misses[key] = text
+        
+        if misses:
+            miss_inputs = list(misses.values())
+            batcher = cls.get_batcher()
+            # Micro-batching merges misses from concurrent callers into one forward pass
+            scores = batcher(miss_inputs) if batcher is not None else cls._score_texts(miss_inputs)
+            scored = dict(zip(misses, scores))
             
-        try:
-            results = cls._pipeline(valid_inputs, truncation=True, max_length=512, batch_size=len(valid_inputs))
-            
-            final_scores = [0.0] * len(texts)
-            
-            for idx, res in zip(valid_indices, results):
-                scores = {item['label']: item['score'] for item in res}
-                composite = scores.get("Positive", 0.0) - scores.get("Negative", 0.0)
-                composite = composite * 0.95
-                final_scores[idx] = round(composite, 4)
-                
-            return final_scores
-            
-        except Exception as e:
-            logger.error(f"Sentiment Batch Error: {e}")
-            raise AnalysisException(f"Sentiment analysis failed: {e}")
+            if cache is not None:
+                cache.put_many(scored)
+            known = {**known, **scored}
+        
+        final_scores = [0.0] * len(texts)
+        for idx, key in zip(valid_indices, keys):
+            final_scores[idx] = known[key]
+        return final_scores
 
     @classmethod
     def analyze_one(cls, text: str) -> float:
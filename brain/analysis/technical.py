@@ -1,8 +1,9 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
-from brain.core.types import StockDataPoint
+from typing import Dict, Any
+from brain.core.types import PriceHistory, PriceSeries
 from brain.core.config import BrainConfig
+from brain.core import kernels
 
 class TechnicalAnalyzer:
     """
@@ -10,11 +11,14 @@ class TechnicalAnalyzer:
     Uses Pandas for vectorized calculations.
     """
     
-    def __init__(self, data: List[StockDataPoint]):
+    def __init__(self, data: PriceHistory):
         # Fast conversion from Pydantic models to DataFrame
-        if not data:
+        if data is None or not len(data):
             self.df = pd.DataFrame()
             return
+        if isinstance(data, PriceSeries):
+            self.df = data.to_frame()  # already sorted, float64 prices
+            return
             
         # Optimize: model_dump() can be slow for large lists. 
         # Accessing attributes directly is faster.
@@ -46,50 +50,37 @@ class TechnicalAnalyzer:
         if self.df.empty or len(self.df) < period + 1:
             return np.nan
             
-        delta = self.df['close'].diff()
-        gains = delta.where(delta > 0, 0.0)
-        losses = (-delta).where(delta < 0, 0.0)
-        
-        avg_gain = gains.ewm(span=period, min_periods=period, adjust=False).mean()
-        avg_loss = losses.ewm(span=period, min_periods=period, adjust=False).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return float(rsi.iloc[-1])
+        rsi = kernels.rsi(self.df['close'].to_numpy(), period, method="ewm")
+        return float(rsi[-1])
 
     def _calc_sma(self, period: int = 50) -> float:
         if self.df.empty or len(self.df) < period:
             return np.nan
-        return float(self.df['close'].rolling(window=period).mean().iloc[-1])
+        return float(kernels.rolling_mean(self.df['close'].to_numpy(), period)[-1])
 
     def _calc_macd(self, fast=12, slow=26, signal=9) -> Dict[str, float]:
         if self.df.empty or len(self.df) < slow + signal:
             return {'macd': np.nan, 'signal': np.nan, 'hist': np.nan}
             
-        ema_fast = self.df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = self.df['close'].ewm(span=slow, adjust=False).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        macd_line, signal_line = kernels.macd(self.df['close'].to_numpy(), fast, slow, signal)
         hist = macd_line - signal_line
         
         return {
-            'macd': float(macd_line.iloc[-1]),
-            'signal': float(signal_line.iloc[-1]),
-            'hist': float(hist.iloc[-1])
+            'macd': float(macd_line[-1]),
+            'signal': float(signal_line[-1]),
+            'hist': float(hist[-1])
         }
 
     def _calc_bollinger(self, period=20, std_dev=2) -> Dict[str, float]:
         if self.df.empty or len(self.df) < period:
             return {'upper': np.nan, 'lower': np.nan, 'middle': np.nan}
             
-        middle = self.df['close'].rolling(window=period).mean()
-        std = self.df['close'].rolling(window=period).std()
+        upper, lower, middle, _ = kernels.bollinger_bands(self.df['close'].to_numpy(), period, std_dev)
         
         return {
-            'upper': float((middle + (std * std_dev)).iloc[-1]),
-            'lower': float((middle - (std * std_dev)).iloc[-1]),
-            'middle': float(middle.iloc[-1])
+            'upper': float(upper[-1]),
+            'lower': float(lower[-1]),
+            'middle': float(middle[-1])
         }
 
     def analyze(self) -> Dict[str, Any]:
@@ -17,7 +17,52 @@ class BrainConfig:
     # Using relative paths assuming execution from project root
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # brain/
     MODEL_PATH: str = os.path.join(BASE_DIR, "saved_models", "hybrid_lstm.pth")
-    SCALER_PATH: str = os.path.join(BASE_DIR, "saved_models", "scaler.pkl")
+    SCALER_PATH: str = os.path.join(BASE_DIR, "saved_models", "scaler.pkl")  # legacy pickle, written during the migration
+    SCALER_ARRAYS_PATH: str = os.getenv("SCALER_ARRAYS_PATH", os.path.join(BASE_DIR, "saved_models", "scaler.npz"))
+    XGB_MODEL_PATH: str = os.path.join(BASE_DIR, "saved_models", "xgboost_model.json")
+    
+    # Optimized StockLSTM for CPU serving (brain.neural_networks.serving), used when present and current
+    LSTM_SERVING: bool = os.getenv("LSTM_SERVING", "true").lower() == "true"
+    LSTM_SERVING_PATH: str = os.getenv("LSTM_SERVING_PATH", os.path.join(BASE_DIR, "saved_models", "hybrid_lstm.serving.pt"))
+    # "fp32" matches the eager model; "int8" is opt-in (smaller, but only ~99% top-class agreement)
+    LSTM_SERVING_MODE: str = os.getenv("LSTM_SERVING_MODE", "fp32")  # "fp32" | "int8"
+    
+    # LSTM runtime: "torch" (serving artifact or eager checkpoint) | "numpy" (torch-free, brain.neural_networks.numpy_lstm)
+    LSTM_RUNTIME: str = os.getenv("LSTM_RUNTIME", "torch")
+    LSTM_NUMPY_PATH: str = os.getenv("LSTM_NUMPY_PATH", os.path.join(BASE_DIR, "saved_models", "hybrid_lstm.npz"))
+    FINBERT_MODEL_NAME: str = "yiyanghkust/finbert-tone"
+    
+    # Local OHLCV store (brain.core.price_store)
+    PRICE_STORE_DIR: str = os.getenv("PRICE_STORE_DIR", os.path.join(BASE_DIR, "price_store"))
+    
+    # Persistent FinBERT score cache (brain.analysis.score_cache)
+    SCORE_CACHE_ENABLED: bool = os.getenv("SCORE_CACHE", "true").lower() == "true"
+    SCORE_CACHE_PATH: str = os.getenv("SCORE_CACHE_PATH", os.path.join(BASE_DIR, "cache", "finbert_scores.sqlite3"))
+    SCORE_CACHE_MEMORY_ENTRIES: int = int(os.getenv("SCORE_CACHE_MEMORY_ENTRIES", 4096))
+    
+    # BrainService stage graph (brain.core.stage_graph): shared pool size and per-model-stage timeout
+    BRAIN_STAGE_WORKERS: int = int(os.getenv("BRAIN_STAGE_WORKERS", 8))
+    BRAIN_STAGE_TIMEOUT_SECONDS: float = float(os.getenv("BRAIN_STAGE_TIMEOUT_SECONDS", 30))
+    
+    # Per-ticker incremental indicators for the shared feature frame (brain.core.streaming)
+    STREAMING_INDICATORS: bool = os.getenv("STREAMING_INDICATORS", "true").lower() == "true"
+    STREAMING_INDICATORS_MAX_TICKERS: int = int(os.getenv("STREAMING_INDICATORS_MAX_TICKERS", 1024))
+    
+    # Persistent LSTM / XGBoost prediction cache (brain.prediction.prediction_cache)
+    PREDICTION_CACHE_ENABLED: bool = os.getenv("PREDICTION_CACHE", "true").lower() == "true"
+    PREDICTION_CACHE_PATH: str = os.getenv("PREDICTION_CACHE_PATH", os.path.join(BASE_DIR, "cache", "predictions.sqlite3"))
+    PREDICTION_CACHE_MEMORY_ENTRIES: int = int(os.getenv("PREDICTION_CACHE_MEMORY_ENTRIES", 2048))
+    PREDICTION_CACHE_MAX_ROWS: int = int(os.getenv("PREDICTION_CACHE_MAX_ROWS", 50000))  # disk rows, oldest dropped first
+    
+    # FinBERT cross-request micro-batching (brain.analysis.batcher)
+    FINBERT_MICROBATCH: bool = os.getenv("FINBERT_MICROBATCH", "true").lower() == "true"
+    FINBERT_MAX_BATCH_SIZE: int = int(os.getenv("FINBERT_MAX_BATCH_SIZE", 32))
+    FINBERT_MAX_WAIT_MS: float = float(os.getenv("FINBERT_MAX_WAIT_MS", 10))
+    
+    # FinBERT inference backend: "torch" | "torch-int8" | "onnx" | "onnx-int8" (brain.analysis.finbert_backends)
+    FINBERT_BACKEND: str = os.getenv("FINBERT_BACKEND", "torch")
+    FINBERT_ONNX_DIR: str = os.getenv("FINBERT_ONNX_DIR", os.path.join(BASE_DIR, "cache", "onnx"))
+    FINBERT_PARITY_TOLERANCE: float = float(os.getenv("FINBERT_PARITY_TOLERANCE", 0.05))
     
     # API Limits
     MAX_NEWS_ARTICLES: int = 20
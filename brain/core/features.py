@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Union
+from brain.core.types import PriceHistory, PriceSeries
+from brain.core.indicators import add_technical_indicators, resolve
+
+PLACEHOLDER_COLUMNS = ("Sentiment", "NewsVol")
+
+
+def history_to_frame(history_data: PriceHistory) -> pd.DataFrame:
+    """
+    Converts StockDataPoint objects to an OHLCV DataFrame (datetime index, oldest first).
+    A PriceSeries is wrapped without copying.
+    """
+    if isinstance(history_data, PriceSeries):
+        return history_data.to_frame()
+    # Accessing attributes directly is faster than model_dump() for large lists.
+    records = [
+        {
+            'datetime': d.datetime,
+            'open': d.open,
+            'high': d.high,
+            'low': d.low,
+            'close': d.close,
+            'volume': d.volume
+        }
+        for d in history_data
+    ]
+    df = pd.DataFrame(records)
+    if df.empty:
+        return df
+
+    df['datetime'] = pd.to_datetime(df['datetime'])
+    df.set_index('datetime', inplace=True)
+    df.sort_index(inplace=True)
+    return df
+
+
+def build_feature_frame(history_data: PriceHistory,
+                        sentiment: float = 0.0,
+                        news_volume: float = 0.0,
+                        columns: Union[str, Sequence[str], None] = None,
+                        rows: Optional[int] = None) -> pd.DataFrame:
+    """
+    The shared feature stage: builds the OHLCV frame and the technical indicators ONCE.
+    The result is handed to the technical scoring, the LSTM and XGBoost,
+    which each select only the columns they need.
+    `columns` (a FEATURE_SETS name or column list, default every indicator) limits the
+    indicators computed; `rows` keeps only the last rows, computed from just the history
+    tail they depend on (see brain.core.indicators.compute_indicators).
+    """
+    df = history_to_frame(history_data)
+    if df.empty:
+        return df
+
+    wanted = [c for c in resolve(columns) if c not in PLACEHOLDER_COLUMNS]
+    # Models were trained with these placeholders (live news features are not wired in yet)
+    return add_technical_indicators(df, columns=wanted, rows=rows,
+                                    constants={'Sentiment': sentiment, 'NewsVol': news_volume})
+
+
+def select_features(frame: Optional[pd.DataFrame], columns: List[str]) -> Optional[pd.DataFrame]:
+    """
+    Returns only the requested columns with inf/NaN rows removed,
+    i.e. the model-ready rows of a shared feature frame.
+    """
+    if frame is None or frame.empty or any(c not in frame.columns for c in columns):
+        return None
+    return frame[columns].replace([np.inf, -np.inf], np.nan).dropna()
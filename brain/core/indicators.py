@@ -1,136 +1,246 @@
 import pandas as pd
 import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from brain.core import kernels
+
+# Thin pandas wrappers over the NumPy kernels (brain.core.kernels).
+# Inputs/outputs keep the Series/DataFrame contract the rest of the code relies on.
 
 def calculate_rsi(series: pd.Series, period: int = 14) -> pd.Series:
     """Relative Strength Index"""
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+    return pd.Series(kernels.rsi(series.to_numpy(), period, method="sma"), index=series.index)
 
 def calculate_macd(series: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
     """Moving Average Convergence Divergence"""
-    exp1 = series.ewm(span=fast, adjust=False).mean()
-    exp2 = series.ewm(span=slow, adjust=False).mean()
-    macd = exp1 - exp2
-    signal_line = macd.ewm(span=signal, adjust=False).mean()
-    return pd.DataFrame({'MACD': macd, 'MACD_Signal': signal_line})
+    macd, signal_line = kernels.macd(series.to_numpy(), fast, slow, signal)
+    return pd.DataFrame({'MACD': macd, 'MACD_Signal': signal_line}, index=series.index)
 
 def calculate_bollinger_bands(series: pd.Series, period: int = 20, std_dev: int = 2) -> pd.DataFrame:
     """
     Returns Raw Bands (for Trend Logic) AND %B (for ML).
     %B = (Price - Lower) / (Upper - Lower)
     """
-    middle = series.rolling(window=period).mean()
-    std = series.rolling(window=period).std()
-    upper = middle + (std * std_dev)
-    lower = middle - (std * std_dev)
-    
-    # %B (Normalized Position within bands) - Good for ML
-    pct_b = (series - lower) / (upper - lower)
-    
+    upper, lower, middle, pct_b = kernels.bollinger_bands(series.to_numpy(), period, std_dev)
     return pd.DataFrame({
-        'BB_Upper': upper, 
-        'BB_Lower': lower, 
+        'BB_Upper': upper,
+        'BB_Lower': lower,
         'BB_Middle': middle,
         'BB_Pct': pct_b
-    })
+    }, index=series.index)
 
 def calculate_sma(series: pd.Series, period: int = 50) -> pd.Series:
     """Simple Moving Average"""
-    return series.rolling(window=period).mean()
+    return pd.Series(kernels.rolling_mean(series.to_numpy(), period), index=series.index)
 
 def calculate_sma_ratio(series: pd.Series, period: int = 50) -> pd.Series:
     """Ratio of Price to SMA. > 1.0 means uptrend."""
-    sma = series.rolling(window=period).mean()
-    return series / sma
+    close = kernels.as_array(series.to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.Series(close / kernels.rolling_mean(close, period), index=series.index)
 
 def calculate_log_returns(series: pd.Series) -> pd.Series:
     """Log Returns = ln(P_t / P_t-1). Better statistical properties than % change."""
-    return np.log(series / series.shift(1))
+    return pd.Series(kernels.log_returns(series.to_numpy()), index=series.index)
 
 def calculate_volatility_ratio(series: pd.Series, short_window: int = 5, long_window: int = 20) -> pd.Series:
     """Ratio of Short-term Volatility to Long-term Volatility. >1 means expanding volatility."""
-    returns = series.pct_change()
-    short_vol = returns.rolling(window=short_window).std()
-    long_vol = returns.rolling(window=long_window).std()
-    return short_vol / long_vol
+    return pd.Series(kernels.volatility_ratio(series.to_numpy(), short_window, long_window), index=series.index)
 
 def calculate_roc(series: pd.Series, period: int = 10) -> pd.Series:
     """Rate of Change"""
-    return series.pct_change(periods=period) * 100
+    return pd.Series(kernels.pct_change(series.to_numpy(), period) * 100, index=series.index)
 
 def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
     """Average True Range (Volatility Magnitude)"""
-    high_low = high - low
-    high_close = np.abs(high - close.shift())
-    low_close = np.abs(low - close.shift())
-    
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = ranges.max(axis=1)
-    
-    return true_range.rolling(window=period).mean()
+    return pd.Series(kernels.atr(high.to_numpy(), low.to_numpy(), close.to_numpy(), period), index=close.index)
 
 def calculate_cci(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
     """Commodity Channel Index (Cyclical Trends)"""
-    tp = (high + low + close) / 3
-    sma = tp.rolling(window=period).mean()
-    mad = tp.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean())
-    
-    # Avoid division by zero
-    cci = (tp - sma) / (0.015 * mad + 1e-6)
-    return cci
-
-def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.Series(kernels.cci(high.to_numpy(), low.to_numpy(), close.to_numpy(), period), index=close.index)
+
+# --- Declarative indicator registry ---
+# Each indicator declares the columns it reads (raw OHLC or other indicators), the
+# columns it produces, and its window: how many consecutive input rows one output
+# row depends on. lookback() chains windows through the dependencies, so a caller
+# that needs the last `rows` rows of some columns only computes the indicators
+# those columns need, over the last rows + lookback - 1 bars of history.
+
+RAW_INPUTS = ("close", "high", "low")
+
+# Recursive EWMs never forget their seed; they count as settled once the seed's
+# weight has decayed below this (relative to the seed gap, far below float32 resolution).
+EWM_TOLERANCE = 1e-12
+
+
+def ewm_window(span: int) -> int:
+    """Bars after which an adjust=False EWM of the given span no longer depends on its seed."""
+    decay = 1.0 - 2.0 / (span + 1.0)
+    return int(np.ceil(np.log(EWM_TOLERANCE) / np.log(decay))) + 1
+
+
+class Indicator:
+    def __init__(self, outputs: Tuple[str, ...], inputs: Tuple[str, ...], window: int,
+                 fn: Callable[..., Union[np.ndarray, Tuple[np.ndarray, ...]]]):
+        """fn(*input arrays) returns one array per output, in order."""
+        self.outputs = outputs
+        self.inputs = inputs
+        self.window = window
+        self.fn = fn
+
+
+INDICATORS: Dict[str, Indicator] = {}  # output column -> indicator
+
+
+def register(outputs: Sequence[str], inputs: Sequence[str], window: int, fn) -> Indicator:
+    indicator = Indicator(tuple(outputs), tuple(inputs), window, fn)
+    for name in indicator.outputs:
+        INDICATORS[name] = indicator
+    return indicator
+
+
+# 1. Momentum / Oscillators
+register(["RSI"], ["close"], 15, lambda c: kernels.rsi(c, 14, method="sma"))
+register(["ROC"], ["close"], 11, lambda c: kernels.pct_change(c, 10) * 100)
+register(["CCI"], ["high", "low", "close"], 20, lambda h, l, c: kernels.cci(h, l, c, 20))
+# 2. Trend (MACD): the signal EWM runs over the MACD line
+register(["MACD", "MACD_Signal"], ["close"], ewm_window(26) + ewm_window(9) - 1, kernels.macd)
+# 3. Volatility (Bollinger & ATR)
+register(["BB_Upper", "BB_Lower", "BB_Middle", "BB_Pct"], ["close"], 20, kernels.bollinger_bands)
+# Normalized ATR (Volatility relative to price)
+register(["ATR_Pct"], ["high", "low", "close"], 15, lambda h, l, c: kernels.atr(h, l, c) / c)
+# 4. Moving Averages (for Trend Logic)
+register(["SMA_50"], ["close"], 50, lambda c: kernels.rolling_mean(c, 50))
+# 5. Advanced Stationary Features (For ML)
+register(["Log_Ret"], ["close"], 2, kernels.log_returns)
+register(["Vol_Ratio"], ["close"], 21, kernels.volatility_ratio)
+register(["SMA_Ratio"], ["close", "SMA_50"], 1, lambda c, sma: c / sma)
+# 6. Lagged Returns (Short-term memory helper)
+# The LSTM sees sequence, but explicit features help
+register(["Ret_1d"], ["Log_Ret"], 2, lambda r: kernels.shift(r, 1))
+for _lag in (3, 5, 10, 20):
+    register([f"Ret_{_lag}d"], ["close"], _lag + 1, lambda c, lag=_lag: kernels.pct_change(c, lag))
+
+# Named feature sets: the columns each consumer reads.
+# Sentiment / NewsVol are placeholders filled by build_feature_frame, not indicators.
+FEATURE_SETS: Dict[str, Tuple[str, ...]] = {
+    "all": tuple(INDICATORS),
+    "technical": ("RSI", "SMA_50", "BB_Upper", "BB_Lower", "MACD", "MACD_Signal"),
+    "lstm": ("Log_Ret", "RSI", "MACD", "MACD_Signal", "BB_Pct", "Vol_Ratio", "ROC", "SMA_Ratio", "ATR_Pct", "CCI",
+             "Ret_1d", "Ret_3d", "Ret_5d", "Ret_10d", "Ret_20d", "Sentiment", "NewsVol"),
+    "xgboost": ("Log_Ret", "RSI", "MACD", "MACD_Signal", "BB_Pct", "Vol_Ratio", "ROC", "SMA_Ratio",
+                "Sentiment", "NewsVol"),
+}
+
+
+def resolve(columns: Union[str, Sequence[str], None]) -> Tuple[str, ...]:
+    """A feature-set name, a column list, or None (every indicator) as a column tuple."""
+    if columns is None:
+        return FEATURE_SETS["all"]
+    if isinstance(columns, str):
+        if columns not in FEATURE_SETS:
+            raise KeyError(f"Unknown feature set '{columns}'. Known: {sorted(FEATURE_SETS)}")
+        return FEATURE_SETS[columns]
+    return tuple(columns)
+
+
+def plan(columns: Iterable[str]) -> List[Indicator]:
+    """The indicators needed for the given columns (dependencies first, each once). Unknown names are skipped."""
+    ordered: List[Indicator] = []
+
+    def visit(name: str):
+        indicator = INDICATORS.get(name)
+        if indicator is None or indicator in ordered:
+            return
+        for dep in indicator.inputs:
+            visit(dep)
+        ordered.append(indicator)
+
+    for name in columns:
+        visit(name)
+    return ordered
+
+
+def lookback(columns: Iterable[str]) -> int:
+    """Bars of history one output row of all the given columns depends on."""
+    memo: Dict[str, int] = {}
+
+    def bars(name: str) -> int:
+        if name not in memo:
+            indicator = INDICATORS.get(name)
+            memo[name] = 1 if indicator is None else \
+                indicator.window + max(bars(dep) for dep in indicator.inputs) - 1
+        return memo[name]
+
+    return max((bars(name) for name in columns), default=1)
+
+
+def compute_indicators(close: np.ndarray, columns: Union[str, Sequence[str], None] = None,
+                       high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+                       rows: Optional[int] = None) -> Tuple[int, Dict[str, np.ndarray]]:
     """
-    Adds all technical indicators to the DataFrame.
+    Computes just the indicators behind `columns` (a feature-set name, column list, or None for all).
+    With `rows`, only the last rows + lookback - 1 bars are used. The tail is widened to the full
+    history if any of the last `rows` rows is not finite in every column. Returns (start, arrays):
+    the arrays cover bars start..end and include the intermediate columns that were computed.
+    """
+    wanted = [c for c in resolve(columns) if c in INDICATORS]
+    steps = plan(wanted)
+    close = kernels.as_array(close)
+    raw = {"close": close,
+           "high": kernels.as_array(high) if high is not None else close,
+           "low": kernels.as_array(low) if low is not None else close}
+
+    n = len(close)
+    start = max(0, n - (rows + lookback(wanted) - 1)) if rows else 0
+    while True:
+        values = {name: array[start:] for name, array in raw.items()}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for indicator in steps:
+                out = indicator.fn(*(values[name] for name in indicator.inputs))
+                for name, array in zip(indicator.outputs, out if len(indicator.outputs) > 1 else (out,)):
+                    values[name] = array
+        if start == 0 or all(np.isfinite(values[c][-rows:]).all() for c in wanted):
+            break
+        start = 0  # gaps/infinities inside the tail: their true warm-up lies further back
+
+    for name in RAW_INPUTS:
+        values.pop(name)
+    return start, values
+
+
+def add_technical_indicators(df: pd.DataFrame, dtype=np.float64,
+                             columns: Union[str, Sequence[str], None] = None,
+                             rows: Optional[int] = None,
+                             constants: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Adds technical indicators to the DataFrame.
     Returns both Raw indicators (for Logic) and Normalized ones (for ML).
+    Pass dtype=np.float32 for float32 indicator columns.
+    `columns` (feature-set name or column list) limits the work to those indicators;
+    with `rows`, only the last `rows` rows are returned, computed over just the tail
+    of history their lookback needs (see compute_indicators).
+    `constants` are scalar columns appended after the indicators.
     """
-    df = df.copy()
-    
     col_map = {c.lower(): c for c in df.columns}
     close_col = col_map.get('close', 'Close')
     high_col = col_map.get('high', 'High')
     low_col = col_map.get('low', 'Low')
-    
+
     if close_col not in df.columns:
-        return df 
-        
-    close = df[close_col].astype(float)
-    high = df[high_col].astype(float) if high_col in df.columns else close
-    low = df[low_col].astype(float) if low_col in df.columns else close
-    
-    # 1. Momentum / Oscillators
-    df['RSI'] = calculate_rsi(close)
-    df['ROC'] = calculate_roc(close)
-    df['CCI'] = calculate_cci(high, low, close)
-    
-    # 2. Trend (MACD)
-    macd_df = calculate_macd(close)
-    df = pd.concat([df, macd_df], axis=1)
-    
-    # 3. Volatility (Bollinger & ATR)
-    bb_df = calculate_bollinger_bands(close)
-    df = pd.concat([df, bb_df], axis=1)
-    
-    atr = calculate_atr(high, low, close)
-    df['ATR_Pct'] = atr / close # Normalized ATR (Volatility relative to price)
-    
-    # 4. Moving Averages (for Trend Logic)
-    df['SMA_50'] = calculate_sma(close, 50)
-    
-    # 5. Advanced Stationary Features (For ML)
-    df['Log_Ret'] = calculate_log_returns(close)
-    df['Vol_Ratio'] = calculate_volatility_ratio(close)
-    df['SMA_Ratio'] = calculate_sma_ratio(close)
-    
-    # 6. Lagged Returns (Short-term memory helper)
-    # The LSTM sees sequence, but explicit features help
-    df['Ret_1d'] = df['Log_Ret'].shift(1)
-    df['Ret_3d'] = close.pct_change(3)
-    df['Ret_5d'] = close.pct_change(5)
-    df['Ret_10d'] = close.pct_change(10)
-    df['Ret_20d'] = close.pct_change(20)
-    
-    return df
\ No newline at end of file
+        return df.copy()
+
+    start, cols = compute_indicators(
+        df[close_col].to_numpy(), columns,
+        high=df[high_col].to_numpy() if high_col in df.columns else None,
+        low=df[low_col].to_numpy() if low_col in df.columns else None,
+        rows=rows,
+    )
+    base = df.iloc[start:]
+    if rows:
+        base, cols = base.iloc[-rows:], {name: values[-rows:] for name, values in cols.items()}
+
+    # One frame construction instead of a column insert per indicator
+    data = {name: base[name].to_numpy() for name in base.columns if name not in cols}
+    data.update((name, values.astype(dtype, copy=False)) for name, values in cols.items())
+    data.update((name, np.full(len(base), value)) for name, value in (constants or {}).items())
+    return pd.DataFrame(data, index=base.index)
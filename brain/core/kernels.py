@@ -0,0 +1,207 @@
+"""
+Vectorized NumPy indicator kernels.
+
+Single implementation behind brain.core.indicators, brain.analysis.technical and
+brain.quant.engine. Every kernel takes contiguous 1-D arrays and returns arrays of
+the same length, NaN-padded where the lookback is not yet filled, matching the
+pandas rolling/ewm semantics the call sites were written against.
+
+float32 mode: pass dtype=np.float32 to get float32 outputs (what the models consume).
+Running sums and EWM recursions are still accumulated in float64 so precision
+does not degrade over long histories.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Tuple
+
+try:
+    from scipy.signal import lfilter
+except ImportError:  # SciPy is optional; ewm_mean falls back to the Python recursion
+    lfilter = None
+
+DEFAULT_DTYPE = np.float64
+
+
+def as_array(values) -> np.ndarray:
+    """Contiguous float64 view/copy of any array-like (list, Series, ndarray)."""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _out(values: np.ndarray, dtype) -> np.ndarray:
+    return values if values.dtype == dtype else values.astype(dtype)
+
+
+def shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    x = as_array(x)
+    out = np.full_like(x, np.nan)
+    if periods == 0:
+        out[:] = x
+    elif 0 < periods < len(x):
+        out[periods:] = x[:-periods]
+    return out
+
+
+def pct_change(x: np.ndarray, periods: int = 1, dtype=DEFAULT_DTYPE) -> np.ndarray:
+    x = as_array(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(x / shift(x, periods) - 1, dtype)
+
+
+def log_returns(x: np.ndarray, dtype=DEFAULT_DTYPE) -> np.ndarray:
+    x = as_array(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(np.log(x / shift(x, 1)), dtype)
+
+
+def rolling_mean(x: np.ndarray, window: int, dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """
+    Rolling mean via cumulative sums (O(n) for any window).
+    A window containing NaN yields NaN, like pandas rolling(window).mean().
+    """
+    x = as_array(x)
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n < window:
+        return _out(out, dtype)
+
+    nan_mask = np.isnan(x)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(nan_mask, 0.0, x))))
+    nan_count = np.concatenate(([0], np.cumsum(nan_mask)))
+
+    sums = csum[window:] - csum[:-window]
+    nans = nan_count[window:] - nan_count[:-window]
+    out[window - 1:] = np.where(nans > 0, np.nan, sums / window)
+    return _out(out, dtype)
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1, dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """Rolling standard deviation over sliding-window views (two-pass, no cancellation)."""
+    x = as_array(x)
+    out = np.full(len(x), np.nan)
+    if len(x) < window or window <= ddof:
+        return _out(out, dtype)
+    out[window - 1:] = sliding_window_view(x, window).std(axis=1, ddof=ddof)
+    return _out(out, dtype)
+
+
+def rolling_mad(x: np.ndarray, window: int, dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """Rolling mean absolute deviation around each window's own mean."""
+    x = as_array(x)
+    out = np.full(len(x), np.nan)
+    if len(x) < window:
+        return _out(out, dtype)
+    windows = sliding_window_view(x, window)
+    out[window - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return _out(out, dtype)
+
+
+def ewm_mean(x: np.ndarray, span: int, min_periods: int = 0, dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """
+    Recursive EWM equal to pandas ewm(span=span, adjust=False, min_periods=min_periods).mean().
+    NaN inputs are skipped but still decay the previous weight (pandas ignore_na=False).
+    """
+    x = as_array(x)
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+
+    nan_mask = np.isnan(x)
+    if lfilter is not None and len(x) and not nan_mask.any():
+        # Gap-free input: y_t = decay * y_{t-1} + alpha * x_t as one IIR filter pass, seeded so y_0 = x_0
+        out, _ = lfilter([alpha], [1.0, -decay], x, zi=[decay * x[0]])
+        out[:max(min_periods, 1) - 1] = np.nan
+        return _out(out, dtype)
+
+    out = np.empty(len(x))
+    weighted = np.nan
+    old_wt = 1.0
+    n_obs = 0
+    # Python floats over a list are much faster than indexing NumPy scalars in the loop
+    for i, cur in enumerate(x.tolist()):
+        is_obs = cur == cur
+        if is_obs:
+            n_obs += 1
+        if weighted == weighted:
+            old_wt *= decay
+            if is_obs:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_obs:
+            weighted = cur
+        out[i] = weighted if n_obs >= max(min_periods, 1) else np.nan
+    return _out(out, dtype)
+
+
+def _gains_losses(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    delta = np.diff(as_array(close), prepend=np.nan)
+    # The first (undefined) delta counts as 0 in both legs, as delta.where(...) did in pandas
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+    return gains, losses
+
+
+def rsi(close: np.ndarray, period: int = 14, method: str = "sma", dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """
+    Relative Strength Index.
+    method="sma": simple rolling mean of gains/losses (ML feature, brain.core.indicators).
+    method="ewm": EWM(span=period) smoothing (scoring engines).
+    """
+    gains, losses = _gains_losses(close)
+    if method == "sma":
+        avg_gain = rolling_mean(gains, period)
+        avg_loss = rolling_mean(losses, period)
+    elif method == "ewm":
+        avg_gain = ewm_mean(gains, period, min_periods=period)
+        avg_loss = ewm_mean(losses, period, min_periods=period)
+    else:
+        raise ValueError(f"Unknown RSI method: {method}")
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        return _out(100 - (100 / (1 + rs)), dtype)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9,
+         dtype=DEFAULT_DTYPE) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (macd_line, signal_line)."""
+    macd_line = ewm_mean(close, fast) - ewm_mean(close, slow)
+    signal_line = ewm_mean(macd_line, signal)
+    return _out(macd_line, dtype), _out(signal_line, dtype)
+
+
+def bollinger_bands(close: np.ndarray, period: int = 20, std_dev: float = 2,
+                    dtype=DEFAULT_DTYPE) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (upper, lower, middle, pct_b)."""
+    close = as_array(close)
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    upper = middle + std * std_dev
+    lower = middle - std * std_dev
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_b = (close - lower) / (upper - lower)
+    return _out(upper, dtype), _out(lower, dtype), _out(middle, dtype), _out(pct_b, dtype)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14,
+        dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """Average True Range. The first bar's true range is high - low."""
+    high, low = as_array(high), as_array(low)
+    prev_close = shift(close, 1)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _out(rolling_mean(true_range, period), dtype)
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 20,
+        dtype=DEFAULT_DTYPE) -> np.ndarray:
+    """Commodity Channel Index."""
+    tp = (as_array(high) + as_array(low) + as_array(close)) / 3
+    sma = rolling_mean(tp, period)
+    mad = rolling_mad(tp, period)
+    return _out((tp - sma) / (0.015 * mad + 1e-6), dtype)
+
+
+def volatility_ratio(close: np.ndarray, short_window: int = 5, long_window: int = 20,
+                     dtype=DEFAULT_DTYPE) -> np.ndarray:
+    returns = pct_change(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _out(rolling_std(returns, short_window) / rolling_std(returns, long_window), dtype)
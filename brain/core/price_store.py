@@ -0,0 +1,245 @@
+"""
+Local on-disk OHLCV store with incremental (tail-only) provider fetches.
+
+Bars for past sessions never change, so each ticker/interval is kept on disk as
+one .npy file per column (date, open, high, low, close, volume). On a read the
+store asks the provider only for the bars after the last stored date (plus that
+last bar again, since it may have been a partial session) and serves the rest
+from memory-mapped arrays.
+
+Layout:
+    <root>/<TICKER>/<interval>/meta.json
+    <root>/<TICKER>/<interval>/g<generation>/<column>.npy
+
+A write goes into a new generation directory, and meta.json is swapped last
+with os.replace. Readers in other processes (e.g. training while the Flask app
+serves) therefore always see one consistent set of columns.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from brain.core.config import BrainConfig
+from brain.core.exceptions import DataFetchException
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("date", "open", "high", "low", "close", "volume")
+DTYPES = {
+    "date": "datetime64[s]",
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.int64,
+}
+
+# Provider cap on outputsize (Twelve Data)
+MAX_OUTPUTSIZE = 5000
+
+INTERVAL_SECONDS = {
+    "1min": 60, "5min": 300, "15min": 900, "30min": 1800, "45min": 2700,
+    "1h": 3600, "2h": 7200, "4h": 14400,
+    "1day": 86400, "1week": 7 * 86400, "1month": 31 * 86400,
+}
+
+# fetch(ticker, interval, outputsize) -> column arrays, oldest first
+Fetcher = Callable[[str, str, int], Dict[str, np.ndarray]]
+
+
+def twelvedata_fetch(ticker: str, interval: str, outputsize: int) -> Dict[str, np.ndarray]:
+    """Default fetcher: the process-wide pooled Twelve Data client."""
+    from brain.core.twelvedata import get_client
+    return get_client().time_series(ticker, interval=interval, outputsize=outputsize)
+
+
+def tail(bars: Dict[str, np.ndarray], n: int) -> Dict[str, np.ndarray]:
+    """Last n bars as in-memory copies (detached from any memmap)."""
+    return {c: np.array(bars[c][-n:]) if n > 0 else bars[c][:0].copy() for c in COLUMNS}
+
+
+def to_frame(bars: Dict[str, np.ndarray]) -> "pd.DataFrame":
+    """Bars -> DataFrame in the training layout (Date/Open/High/Low/Close/Volume, oldest first)."""
+    import pandas as pd
+    return pd.DataFrame({
+        "Date": bars["date"],
+        "Open": bars["open"],
+        "High": bars["high"],
+        "Low": bars["low"],
+        "Close": bars["close"],
+        "Volume": bars["volume"].astype(np.float64),
+    })
+
+
+class PriceStore:
+    def __init__(self, root: Optional[str] = None, fetch: Optional[Fetcher] = None):
+        """
+        Args:
+            root: Store directory (default BrainConfig.PRICE_STORE_DIR).
+            fetch: Provider callable; defaults to twelvedata_fetch.
+        """
+        self.root = root or BrainConfig.PRICE_STORE_DIR
+        self.fetch = fetch or twelvedata_fetch
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"full_fetches": 0, "tail_fetches": 0, "bars_fetched": 0}
+
+    # --- Disk I/O ---
+
+    def _dir(self, ticker: str, interval: str) -> str:
+        return os.path.join(self.root, ticker.upper(), interval)
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        key = (ticker.upper(), interval)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def meta(self, ticker: str, interval: str = "1day") -> Optional[dict]:
+        try:
+            with open(os.path.join(self._dir(ticker, interval), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, ticker: str, interval: str = "1day") -> Optional[Dict[str, np.ndarray]]:
+        """
+        Stored bars as read-only memory-mapped arrays, or None if nothing is stored.
+        Only the pages that are actually sliced get read from disk.
+        """
+        meta = self.meta(ticker, interval)
+        if meta is None:
+            return None
+        gen_dir = os.path.join(self._dir(ticker, interval), f"g{meta['generation']}")
+        try:
+            return {c: np.load(os.path.join(gen_dir, f"{c}.npy"), mmap_mode="r") for c in COLUMNS}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Price store read failed for {ticker}/{interval}: {e}")
+            return None
+
+    def write(self, ticker: str, interval: str, bars: Dict[str, np.ndarray], complete: bool) -> None:
+        """Writes a full column set as a new generation and switches meta.json to it."""
+        base = self._dir(ticker, interval)
+        old = self.meta(ticker, interval)
+        generation = old["generation"] + 1 if old else 1
+
+        gen_dir = os.path.join(base, f"g{generation}")
+        os.makedirs(gen_dir, exist_ok=True)
+        for c in COLUMNS:
+            np.save(os.path.join(gen_dir, f"{c}.npy"), np.ascontiguousarray(bars[c], dtype=DTYPES[c]))
+
+        meta = {
+            "ticker": ticker.upper(),
+            "interval": interval,
+            "generation": generation,
+            "rows": int(len(bars["date"])),
+            "first_date": str(bars["date"][0]) if len(bars["date"]) else None,
+            "last_date": str(bars["date"][-1]) if len(bars["date"]) else None,
+            # Provider returned less than asked for: nothing older exists upstream
+            "complete": complete,
+            "updated": time.time(),
+        }
+        tmp = os.path.join(base, f"meta.json.{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(base, "meta.json"))
+
+        # Keep the previous generation for readers still mapping it; drop anything older
+        for name in os.listdir(base):
+            if name.startswith("g") and name[1:].isdigit() and int(name[1:]) < generation - 1:
+                shutil.rmtree(os.path.join(base, name), ignore_errors=True)
+
+    # --- Incremental fetch ---
+
+    @staticmethod
+    def missing_bars(last_date: np.datetime64, interval: str, now: Optional[np.datetime64] = None) -> int:
+        """
+        Upper bound on bars published after last_date, +1 to re-fetch the last stored
+        (possibly partial) bar. Over-estimating is harmless: the overlap is de-duplicated.
+        """
+        now = now if now is not None else np.datetime64("now", "s")
+        if interval == "1day":
+            gap = int(np.busday_count(last_date.astype("datetime64[D]"), now.astype("datetime64[D]")))
+        else:
+            step = INTERVAL_SECONDS.get(interval, 86400)
+            gap = int((now - last_date.astype("datetime64[s]")).astype(np.int64) // step)
+        return min(max(gap, 0) + 1, MAX_OUTPUTSIZE)
+
+    @staticmethod
+    def merge(stored: Dict[str, np.ndarray], fresh: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Appends fresh bars; bars at or after the first fresh date are replaced."""
+        if not len(fresh["date"]):
+            return {c: np.asarray(stored[c]) for c in COLUMNS}
+        keep = int(np.searchsorted(stored["date"], fresh["date"][0], side="left"))
+        return {c: np.concatenate([stored[c][:keep], fresh[c]]) for c in COLUMNS}
+
+    def get_history(self, ticker: str, outputsize: int = MAX_OUTPUTSIZE, interval: str = "1day",
+                    refresh: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Last `outputsize` bars (oldest first) as column arrays.
+        Cold ticker: one full fetch. Warm ticker: only the missing tail is fetched
+        (refresh=False skips the provider entirely and serves what is on disk).
+        Raises DataFetchException if the provider fails and nothing usable is stored.
+        """
+        ticker = ticker.upper()
+        outputsize = min(int(outputsize), MAX_OUTPUTSIZE)
+
+        with self._lock(ticker, interval):
+            meta = self.meta(ticker, interval)
+            stored = self.load(ticker, interval) if meta else None
+            deep_enough = stored is not None and (meta["rows"] >= outputsize or meta["complete"])
+
+            if stored is not None and deep_enough and not refresh:
+                return tail(stored, outputsize)
+
+            try:
+                if stored is not None and deep_enough and len(stored["date"]):
+                    n = self.missing_bars(stored["date"][-1], interval)
+                    fresh = self.fetch(ticker, interval, n)
+                    self.stats["tail_fetches"] += 1
+                    self.stats["bars_fetched"] += len(fresh["date"])
+                    # The tail must overlap what we have, otherwise there is a hole: refetch fully
+                    if len(fresh["date"]) and fresh["date"][0] <= stored["date"][-1]:
+                        merged = self.merge(stored, fresh)
+                        # A single re-fetched bar that did not move needs no new generation
+                        changed = len(fresh["date"]) > 1 or fresh["close"][-1] != stored["close"][-1] or \
+                            fresh["volume"][-1] != stored["volume"][-1]
+                        if changed:
+                            self.write(ticker, interval, merged, meta["complete"])
+                        return tail(merged, outputsize)
+
+                size = max(outputsize, meta["rows"] if meta else 0)
+                size = min(size, MAX_OUTPUTSIZE)
+                fresh = self.fetch(ticker, interval, size)
+                self.stats["full_fetches"] += 1
+                self.stats["bars_fetched"] += len(fresh["date"])
+                if not len(fresh["date"]):
+                    raise DataFetchException(f"No bars returned for {ticker}")
+                merged = self.merge(stored, fresh) if stored is not None else fresh
+                self.write(ticker, interval, merged, complete=len(fresh["date"]) < size)
+                return tail(merged, outputsize)
+            except Exception as e:
+                if stored is not None and len(stored["date"]):
+                    logger.warning(f"Provider fetch failed for {ticker}, serving stored bars: {e}")
+                    return tail(stored, outputsize)
+                if isinstance(e, DataFetchException):
+                    raise
+                raise DataFetchException(f"Failed to fetch {ticker}: {e}") from e
+
+
+_default_store: Optional[PriceStore] = None
+_default_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Process-wide store shared by the Flask app and the training scripts."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = PriceStore()
+        return _default_store
@@ -0,0 +1,335 @@
+"""
+Process-wide model registry.
+
+Every model the service uses (FinBERT, the LSTM, XGBoost, the feature scaler)
+is registered here once with a loader. get(name) loads it lazily on first use,
+exactly once even under concurrent callers, and every entry point shares that
+instance. Load time, resident-memory growth during the load and the model's own
+parameter footprint are recorded per model for status().
+
+warm_up() additionally runs each model's synthetic inference once (first-call
+allocations, kernel selection, lazy init) so real traffic never pays for it.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from brain.core.config import BrainConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, if the platform exposes it."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+_sha_cache: Dict[tuple, str] = {}
+
+
+def artifact_sha256(path: str) -> str:
+    """sha256 of a model file, memoized per (path, size, mtime)."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _sha_cache:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _sha_cache[key] = h.hexdigest()
+    return _sha_cache[key]
+
+
+def model_size_bytes(model: Any) -> Optional[int]:
+    """Bytes held by a model's own tensors/arrays (parameters, buffers, trees, ...)."""
+    if model is None:
+        return None
+    if hasattr(model, "parameters") and hasattr(model, "buffers"):  # torch.nn.Module
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    if hasattr(model, "model") and hasattr(model.model, "parameters"):  # transformers pipeline
+        return model_size_bytes(model.model)
+    if hasattr(model, "get_booster"):  # xgboost sklearn wrapper
+        return len(model.get_booster().save_raw())
+    if isinstance(model, dict):
+        sizes = [model_size_bytes(v) for v in model.values()]
+        return sum(s for s in sizes if s) or None
+    if isinstance(getattr(model, "nbytes", None), int):  # ndarray, serialized artifacts
+        return model.nbytes
+    arrays = [v for v in getattr(model, "__dict__", {}).values() if isinstance(v, np.ndarray)]
+    return sum(a.nbytes for a in arrays) if arrays else None
+
+
+class _Slot:
+    __slots__ = ("loader", "warmup", "value", "loaded", "error", "load_seconds", "rss_delta_bytes", "size_bytes",
+                 "warm", "warmup_seconds", "lock")
+
+    def __init__(self, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]] = None):
+        self.loader = loader
+        self.warmup = warmup
+        self.value = None
+        self.loaded = False
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.rss_delta_bytes: Optional[int] = None
+        self.size_bytes: Optional[int] = None
+        self.warm = False
+        self.warmup_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._slots: Dict[str, _Slot] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any],
+                 warmup: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        Registers (or replaces) the loader for `name`. Nothing is loaded yet.
+        `warmup(model)` runs one synthetic inference; see warm_up().
+        """
+        with self._lock:
+            self._slots[name] = _Slot(loader, warmup)
+
+    def _slot(self, name: str) -> _Slot:
+        with self._lock:
+            if name not in self._slots:
+                raise KeyError(f"No model registered as '{name}'")
+            return self._slots[name]
+
+    def get(self, name: str) -> Any:
+        """
+        The shared instance, loading it on first use.
+        A loader that fails (or finds no artifact and returns None) is not retried;
+        get() then returns None and status() reports the error. Use reload() to retry.
+        """
+        slot = self._slot(name)
+        if slot.loaded:
+            return slot.value
+
+        with slot.lock:
+            if slot.loaded:
+                return slot.value
+
+            logger.info(f"[Registry] Loading '{name}'...")
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            try:
+                slot.value = slot.loader()
+                if slot.value is None:
+                    slot.error = "artifact not found"
+            except Exception as e:
+                logger.error(f"[Registry] Failed to load '{name}': {e}")
+                slot.value = None
+                slot.error = str(e)
+            slot.load_seconds = round(time.perf_counter() - start, 3)
+            rss_after = _rss_bytes()
+            if rss_before is not None and rss_after is not None:
+                slot.rss_delta_bytes = max(rss_after - rss_before, 0)
+            slot.size_bytes = model_size_bytes(slot.value)
+            slot.loaded = True
+            logger.info(f"[Registry] '{name}' ready in {slot.load_seconds}s"
+                        + (f" (error: {slot.error})" if slot.error else ""))
+            return slot.value
+
+    def is_loaded(self, name: str) -> bool:
+        return self._slot(name).loaded
+
+    def reload(self, name: str) -> Any:
+        slot = self._slot(name)
+        with slot.lock:
+            slot.loaded = False
+            slot.value = None
+            slot.error = None
+            slot.warm = False
+            slot.warmup_seconds = None
+        return self.get(name)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._slots)
+
+    def warm_up(self, names: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Loads each model and runs its synthetic inference once.
+        Returns {name: ready}; a model is ready once loaded and warmed (models without
+        a warmup function count as warm after loading). Never raises.
+        """
+        ready = {}
+        for name in self.names() if names is None else names:
+            slot = self._slot(name)
+            model = self.get(name)
+            with slot.lock:
+                if model is not None and not slot.warm:
+                    start = time.perf_counter()
+                    try:
+                        if slot.warmup is not None:
+                            slot.warmup(model)
+                        slot.warm = True
+                    except Exception as e:
+                        logger.error(f"[Registry] Warm-up of '{name}' failed: {e}")
+                        slot.error = f"warm-up failed: {e}"
+                    slot.warmup_seconds = round(time.perf_counter() - start, 3)
+                    logger.info(f"[Registry] '{name}' warmed in {slot.warmup_seconds}s")
+                ready[name] = slot.warm
+        return ready
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            slots = dict(self._slots)
+        return {
+            name: {
+                "loaded": slot.loaded,
+                "available": slot.loaded and slot.value is not None,
+                "load_seconds": slot.load_seconds,
+                "rss_delta_mb": round(slot.rss_delta_bytes / 2**20, 1) if slot.rss_delta_bytes is not None else None,
+                "size_mb": round(slot.size_bytes / 2**20, 1) if slot.size_bytes is not None else None,
+                "warm": slot.warm,
+                "warmup_seconds": slot.warmup_seconds,
+                "error": slot.error,
+            }
+            for name, slot in slots.items()
+        }
+
+
+def lstm_candidates(runtime: Optional[str] = None) -> List[str]:
+    """
+    LSTM entries in the order PredictionEngine tries them: the NumPy port (runtime
+    "numpy" only), the TorchScript serving artifact, then the eager checkpoint.
+    The first that loads serves; the rest never do.
+    """
+    runtime = BrainConfig.LSTM_RUNTIME if runtime is None else runtime
+    return (["lstm_numpy"] if runtime == "numpy" else []) + ["lstm_serving", "lstm"]
+
+
+# --- Default loaders ---
+
+def torch_device():
+    import torch
+    return torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+
+def load_finbert():
+    from brain.analysis.finbert_backends import build_pipeline
+    return build_pipeline(BrainConfig.FINBERT_MODEL_NAME)
+
+
+def load_lstm():
+    """StockLSTM sized from the checkpoint itself (input width = weight_ih_l0 columns)."""
+    import torch
+    from brain.neural_networks.model import StockLSTM
+
+    if not os.path.exists(BrainConfig.MODEL_PATH):
+        logger.warning("Model weights not found.")
+        return None
+    device = torch_device()
+    state = torch.load(BrainConfig.MODEL_PATH, map_location=device)
+    model = StockLSTM(input_size=state["lstm.weight_ih_l0"].shape[1])
+    model.load_state_dict(state)
+    model.to(device)
+    model.eval()
+    return model
+
+
+def load_lstm_serving():
+    """TorchScript StockLSTM (fp32, or opt-in int8) built next to the checkpoint; None if absent, stale or disabled."""
+    if not BrainConfig.LSTM_SERVING:
+        return None
+    from brain.neural_networks import serving
+    return serving.load()
+
+
+def load_lstm_numpy():
+    """Torch-free StockLSTM from the exported .npz; None if absent or stale."""
+    from brain.neural_networks import numpy_lstm
+    return numpy_lstm.load()
+
+
+def load_scaler():
+    """
+    {"scaler", "mean", "std"}: the FeatureNormalizer from the array file (no sklearn),
+    else converted from the legacy pickle; bare-scaler pickles get default target stats.
+    """
+    from brain.neural_networks import normalizer
+
+    scaler = normalizer.load()
+    if scaler is None:
+        if not os.path.exists(BrainConfig.SCALER_PATH):
+            logger.warning("Scaler not found. Predictions will be inaccurate.")
+            return None
+        logger.warning(f"Scaler arrays not found at {BrainConfig.SCALER_ARRAYS_PATH}; reading the legacy pickle. "
+                       f"Export them with `python -m brain.neural_networks.normalizer`.")
+        scaler = normalizer.read_pickle(BrainConfig.SCALER_PATH)
+    return {"scaler": scaler, "mean": scaler.target_mean, "std": scaler.target_std}
+
+
+def load_xgboost():
+    import xgboost as xgb
+
+    if not os.path.exists(BrainConfig.XGB_MODEL_PATH):
+        logger.warning(f"XGBoost model file not found at {BrainConfig.XGB_MODEL_PATH}. Predictor disabled.")
+        return None
+    model = xgb.XGBClassifier()
+    model.load_model(BrainConfig.XGB_MODEL_PATH)
+    logger.info(f"XGBoost Model loaded from {BrainConfig.XGB_MODEL_PATH}")
+    return model
+
+
+# --- Synthetic warm-up inferences ---
+
+WARMUP_SEQUENCE_LENGTH = 60  # PredictionEngine's input window
+
+
+def warm_finbert(pipeline) -> None:
+    pipeline(["Shares rose after the company beat quarterly earnings estimates."],
+             truncation=True, max_length=512, batch_size=1)
+
+
+def warm_lstm(model) -> None:
+    import torch
+    device = next(model.parameters()).device
+    with torch.no_grad():
+        model(torch.zeros(1, WARMUP_SEQUENCE_LENGTH, model.lstm.input_size, device=device))
+
+
+def warm_lstm_serving(model) -> None:
+    import torch
+    with torch.no_grad():
+        model(torch.zeros(1, WARMUP_SEQUENCE_LENGTH, model.input_size))
+
+
+def warm_lstm_numpy(model) -> None:
+    model(np.zeros((1, WARMUP_SEQUENCE_LENGTH, model.input_size), dtype=np.float32))
+
+
+def warm_scaler(bundle) -> None:
+    scaler = bundle["scaler"]
+    scaler.transform(np.zeros((1, scaler.n_features_in_)))
+
+
+def warm_xgboost(model) -> None:
+    model.predict_proba(np.zeros((1, model.n_features_in_), dtype=np.float32))
+
+
+model_registry = ModelRegistry()
+model_registry.register("finbert", load_finbert, warm_finbert)
+model_registry.register("lstm", load_lstm, warm_lstm)
+model_registry.register("lstm_serving", load_lstm_serving, warm_lstm_serving)
+model_registry.register("lstm_numpy", load_lstm_numpy, warm_lstm_numpy)
+model_registry.register("scaler", load_scaler, warm_scaler)
+model_registry.register("xgboost", load_xgboost, warm_xgboost)
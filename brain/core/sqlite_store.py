@@ -0,0 +1,199 @@
+"""
+Two-level key/value store: an in-memory LRU in front of an on-disk SQLite table
+(WAL mode) that survives restarts and is shared between processes.
+
+Backs the FinBERT score cache (brain.analysis.score_cache) and the prediction
+cache (brain.prediction.prediction_cache). A broken disk never breaks callers:
+the store logs a warning and runs memory-only.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SqliteLRUStore:
+    def __init__(self, path: str, table: str, value_columns: Dict[str, str],
+                 key_columns: Optional[Dict[str, str]] = None,
+                 key_parts: Optional[Callable[[str], Tuple]] = None,
+                 indexes: Sequence[Sequence[str]] = (),
+                 memory_entries: int = 4096, max_rows: Optional[int] = None, name: str = "cache"):
+        """
+        Args:
+            path: SQLite file (created on first use).
+            table: Table name.
+            value_columns: Column -> SQL type of the stored value. Values are tuples in this
+                order, or bare values when there is a single column.
+            key_columns: Column -> SQL type of fields derived from the key by key_parts(key),
+                so rows can be queried / deleted by them (see delete_where).
+            indexes: Column lists to index.
+            memory_entries: Capacity of the in-memory LRU layer.
+            max_rows: Cap on the disk rows; the oldest are dropped on write (None: unbounded).
+            name: Label for logs and stats.
+        """
+        self.path = path
+        self.table = table
+        self.value_columns = dict(value_columns)
+        self.key_columns = dict(key_columns or {})
+        self.key_parts = key_parts
+        self.indexes = [tuple(cols) for cols in indexes]
+        self.memory_entries = memory_entries
+        self.max_rows = max_rows
+        self.name = name
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evicted": 0}
+
+    @property
+    def _columns(self) -> Dict[str, str]:
+        return {"key": "TEXT PRIMARY KEY", **self.key_columns, **self.value_columns, "created": "REAL NOT NULL"}
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        # Caller holds self._lock
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                existing = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")]
+                if existing and existing != list(self._columns):
+                    # A cache from an older layout: its rows are disposable
+                    logger.info(f"{self.name}: table '{self.table}' has an older layout; recreating it")
+                    conn.execute(f"DROP TABLE {self.table}")
+                columns = ", ".join(f"{name} {sql_type}" for name, sql_type in self._columns.items())
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({columns})")
+                indexes = self.indexes + ([("created",)] if self.max_rows else [])
+                for cols in indexes:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_{'_'.join(cols)} "
+                                 f"ON {self.table} ({', '.join(cols)})")
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} disabled on disk ({self.path}): {e}")
+                return None
+        return self._conn
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Cached values for the given keys (memory first, then disk). Missing keys are absent."""
+        found: Dict[str, Any] = {}
+        single = len(self.value_columns) == 1
+        with self._lock:
+            pending = []
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self._counters["memory_hits"] += 1
+                else:
+                    pending.append(key)
+
+            conn = self._db() if pending else None
+            if conn is not None:
+                try:
+                    # Chunked to stay under SQLite's bound-parameter limit
+                    for i in range(0, len(pending), 500):
+                        chunk = pending[i:i + 500]
+                        rows = conn.execute(
+                            f"SELECT key, {', '.join(self.value_columns)} FROM {self.table} "
+                            f"WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                        ).fetchall()
+                        for key, *value in rows:
+                            value = value[0] if single else tuple(value)
+                            found[key] = value
+                            self._remember(key, value)
+                            self._counters["disk_hits"] += 1
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.name} read failed: {e}")
+
+            self._counters["misses"] += sum(1 for key in pending if key not in found)
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        single = len(self.value_columns) == 1
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            conn = self._db()
+            if conn is None:
+                return
+            try:
+                now = time.time()
+                rows = [(key, *(self.key_parts(key) if self.key_columns else ()),
+                         *((value,) if single else value), now) for key, value in items.items()]
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} ({', '.join(self._columns)}) "
+                    f"VALUES ({', '.join('?' * len(self._columns))})", rows
+                )
+                if self.max_rows:
+                    self._counters["evicted"] += conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN "
+                        f"(SELECT key FROM {self.table} ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                        (self.max_rows,)
+                    ).rowcount
+                conn.commit()
+                self._counters["writes"] += len(rows)
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} write failed: {e}")
+
+    def delete_where(self, where: str, params: Sequence, in_memory: Callable[[str], bool]) -> int:
+        """
+        Deletes the disk rows matching the SQL condition (over the key columns) and the
+        memory entries whose key satisfies in_memory. Returns the disk rows removed.
+        """
+        with self._lock:
+            for key in [k for k in self._memory if in_memory(k)]:
+                del self._memory[key]
+            conn = self._db()
+            if conn is None:
+                return 0
+            try:
+                removed = conn.execute(f"DELETE FROM {self.table} WHERE {where}", tuple(params)).rowcount
+                conn.commit()
+                return removed
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} delete failed: {e}")
+                return 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            c = self._counters
+            lookups = c["memory_hits"] + c["disk_hits"] + c["misses"]
+            disk_entries = None
+            conn = self._conn
+            if conn is not None:
+                try:
+                    disk_entries = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                "name": self.name,
+                "path": self.path,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.memory_entries,
+                "disk_entries": disk_entries,
+                "disk_capacity": self.max_rows,
+                **c,
+                "hit_rate": round((c["memory_hits"] + c["disk_hits"]) / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,154 @@
+"""
+Small dependency graph of named analysis stages.
+
+Each Stage is a function of its dependencies' results. StageGraph.run() starts
+every stage as soon as its dependencies are done, so independent stages run
+concurrently on a shared thread pool (torch, xgboost and NumPy release the GIL
+in their kernels). Every stage records its own duration and status; a stage
+that raises or exceeds its timeout is replaced by its fallback value, so one
+failing model never blocks the stages after it.
+
+A stage's timeout counts from when it starts executing, not from when it is
+queued, so time spent waiting for a busy pool never fails a stage. A timed-out
+stage cannot be interrupted: its thread keeps running to completion on the pool
+and its result is discarded.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How often queued stages are checked for having started (their deadline begins then)
+_POLL_SECONDS = 0.01
+
+
+class Stage:
+    def __init__(self, name: str, fn: Callable[..., Any], deps: Sequence[str] = (),
+                 fallback: Optional[Callable[..., Any]] = None, timeout: Optional[float] = None,
+                 inline: bool = False):
+        """
+        Args:
+            name: Unique stage name (key of the results and the report).
+            fn: Called with the results of `deps`, in order.
+            deps: Names of the stages this one reads.
+            fallback: Called with the same arguments when fn raises or times out; its value
+                stands in for the stage's result. Without one the error propagates from run().
+            timeout: Seconds of execution before the stage is given up on (None: wait indefinitely).
+            inline: Run in the calling thread instead of the pool (cheap or strictly
+                sequential stages: no hand-off cost, and no timeout applies). Pool stages
+                that are ready at the same time are submitted first.
+        """
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.fallback = fallback
+        self.timeout = timeout
+        self.inline = inline
+
+
+def _timed_call(fn: Callable[..., Any], args: Tuple,
+                started: Optional[List[float]] = None) -> Tuple[Any, float, Optional[Exception]]:
+    """(value, ms, None), or (None, ms, exception) if fn raised. The start time is appended to `started`."""
+    start = time.perf_counter()
+    if started is not None:
+        started.append(start)
+    try:
+        value, error = fn(*args), None
+    except Exception as e:
+        value, error = None, e
+    return value, (time.perf_counter() - start) * 1000, error
+
+
+class StageGraph:
+    def __init__(self, stages: List[Stage]):
+        names = [s.name for s in stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names in {names}")
+        self.stages = {s.name: s for s in stages}
+
+        # Topological order (also rejects unknown dependencies and cycles)
+        order, done = [], set()
+        remaining = list(stages)
+        while remaining:
+            ready = [s for s in remaining if all(d in done for d in s.deps)]
+            if not ready:
+                unknown = {d for s in remaining for d in s.deps if d not in self.stages}
+                raise ValueError(f"Unknown stage dependencies {unknown}" if unknown
+                                 else f"Dependency cycle among {[s.name for s in remaining]}")
+            for s in ready:
+                order.append(s)
+                done.add(s.name)
+                remaining.remove(s)
+        self.order = order
+
+    def run(self, pool: Executor) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Runs every stage once. Returns (results by stage name, report), where the
+        report holds {"ms", "status": "ok" | "error" | "timeout"[, "error"]} per stage.
+        """
+        results: Dict[str, Any] = {}
+        report: Dict[str, Dict[str, Any]] = {}
+        started = set()
+        # future -> (stage, args, [start time once it runs])
+        running: Dict[Future, Tuple[Stage, Tuple, List[float]]] = {}
+
+        def settle(stage: Stage, args: Tuple, value: Any, ms: float, error: Optional[Exception] = None,
+                   timed_out: bool = False):
+            status = "timeout" if timed_out else "error" if error is not None else "ok"
+            if status != "ok":
+                if stage.fallback is None:
+                    raise error if error is not None else TimeoutError(
+                        f"Stage '{stage.name}' timed out after {stage.timeout}s")
+                logger.warning(f"Stage '{stage.name}' {status}: {error or f'after {stage.timeout}s'}. Using fallback.")
+                value = stage.fallback(*args)
+            results[stage.name] = value
+            report[stage.name] = {"ms": round(ms, 2), "status": status}
+            if error is not None:
+                report[stage.name]["error"] = str(error)
+
+        while len(report) < len(self.order):
+            # Submit every ready pool stage first, so they are not held up by inline work;
+            # then run one ready inline stage here and rescan, since its dependents may now be ready
+            ready = [s for s in self.order if s.name not in started and all(d in results for d in s.deps)]
+            for stage in ready:
+                if not stage.inline:
+                    started.add(stage.name)
+                    args = tuple(results[d] for d in stage.deps)
+                    start_box: List[float] = []
+                    running[pool.submit(_timed_call, stage.fn, args, start_box)] = (stage, args, start_box)
+            inline = next((s for s in ready if s.inline), None)
+            if inline is not None:
+                started.add(inline.name)
+                args = tuple(results[d] for d in inline.deps)
+                settle(inline, args, *_timed_call(inline.fn, args))
+                continue
+            if not running:
+                raise RuntimeError(f"Stage graph stalled with {sorted(started - set(report))} unfinished")
+
+            # Deadlines of running stages; queued stages with a timeout are polled until they start
+            deadlines, queued = [], False
+            for stage, _, start_box in running.values():
+                if stage.timeout is not None:
+                    if start_box:
+                        deadlines.append(start_box[0] + stage.timeout)
+                    else:
+                        queued = True
+            wait_for = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+            if queued:
+                wait_for = _POLL_SECONDS if wait_for is None else min(wait_for, _POLL_SECONDS)
+            done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            now = time.perf_counter()
+            for future in list(running):
+                stage, args, start_box = running[future]
+                deadline = start_box[0] + stage.timeout if start_box and stage.timeout is not None else None
+                if future in done:
+                    del running[future]
+                    settle(stage, args, *future.result())
+                elif deadline is not None and now >= deadline:
+                    del running[future]
+                    future.cancel()  # only helps if it never started
+                    settle(stage, args, None, stage.timeout * 1000, timed_out=True)
+        return results, report
@@ -0,0 +1,522 @@
+import math
+from collections import OrderedDict, deque
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from brain.core import kernels
+from brain.core.types import PriceHistory, as_price_series
+
+# Column order produced by add_technical_indicators (brain.core.indicators)
+INDICATOR_COLUMNS = [
+    'RSI', 'ROC', 'CCI',
+    'MACD', 'MACD_Signal',
+    'BB_Upper', 'BB_Lower', 'BB_Middle', 'BB_Pct',
+    'ATR_Pct', 'SMA_50',
+    'Log_Ret', 'Vol_Ratio', 'SMA_Ratio',
+    'Ret_1d', 'Ret_3d', 'Ret_5d', 'Ret_10d', 'Ret_20d'
+]
+
+NAN = float('nan')
+
+
+def _div(a: float, b: float) -> float:
+    """Division with NumPy semantics (x/0 -> +/-inf, 0/0 -> nan) instead of raising."""
+    if b == 0.0:
+        if a == 0.0 or math.isnan(a):
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def _log(x: float) -> float:
+    if x > 0:
+        return math.log(x)
+    if x == 0:
+        return -math.inf
+    return NAN
+
+
+class _RollingWindow:
+    """
+    Fixed-size ring buffer with O(1) running mean and variance (Welford add/remove).
+    The accumulators are re-derived from the buffer once per full wrap so
+    floating-point drift stays bounded over long histories.
+    """
+    def __init__(self, size: int, values: Optional[List[float]] = None):
+        self.size = size
+        self.buf = deque(maxlen=size)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self._since_reseed = 0
+        for v in values or []:
+            self.push(v)
+
+    def push(self, value: float):
+        if len(self.buf) == self.size:
+            self._remove(self.buf[0])
+        self.buf.append(value)
+        self._add(value)
+
+        self._since_reseed += 1
+        if self._since_reseed >= self.size:
+            self._reseed()
+
+    def _add(self, value: float):
+        n = len(self.buf)
+        delta = value - self.mean
+        self.mean += delta / n
+        self.m2 += (n - 1) * delta * delta / n
+
+    def _remove(self, value: float):
+        n = len(self.buf) - 1
+        if n == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / n
+        self.m2 -= (n + 1) * delta * delta / n
+
+    def _reseed(self):
+        n = len(self.buf)
+        self.mean = math.fsum(self.buf) / n
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in self.buf)
+        self._since_reseed = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.buf) == self.size
+
+    def avg(self) -> float:
+        return self.mean if self.full else NAN
+
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), matching pandas rolling().std()."""
+        if not self.full or self.size < 2:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (self.size - 1))
+
+
+class RunningMoments:
+    """
+    Column-wise running mean and population variance of a set of rows that grows
+    at the end and shrinks at the front (batched Welford/Chan merge and its inverse).
+    std() matches StandardScaler: ddof=0, zero-variance columns scale by 1.
+    """
+    def __init__(self, n_features: int):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    @classmethod
+    def of(cls, rows: np.ndarray) -> 'RunningMoments':
+        moments = cls(rows.shape[1])
+        moments.add(rows)
+        return moments
+
+    def add(self, rows: np.ndarray):
+        k = len(rows)
+        if k == 0:
+            return
+        batch_mean = rows.mean(axis=0)
+        batch_m2 = ((rows - batch_mean) ** 2).sum(axis=0)
+        n = self.count + k
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * (k / n)
+        self.m2 = self.m2 + batch_m2 + delta * delta * (self.count * k / n)
+        self.count = n
+
+    def remove(self, rows: np.ndarray):
+        k = len(rows)
+        if k == 0:
+            return
+        n = self.count - k
+        if n <= 0:
+            self.count, self.mean, self.m2 = 0, np.zeros_like(self.mean), np.zeros_like(self.m2)
+            return
+        batch_mean = rows.mean(axis=0)
+        batch_m2 = ((rows - batch_mean) ** 2).sum(axis=0)
+        rest_mean = (self.mean * self.count - batch_mean * k) / n
+        delta = batch_mean - rest_mean
+        self.m2 = self.m2 - batch_m2 - delta * delta * (n * k / self.count)
+        self.mean = rest_mean
+        self.count = n
+
+    def var(self) -> np.ndarray:
+        return np.maximum(self.m2, 0.0) / max(self.count, 1)
+
+    def std(self) -> np.ndarray:
+        std = np.sqrt(self.var())
+        std[std < 10 * np.finfo(np.float64).eps] = 1.0
+        return std
+
+
+class IndicatorState:
+    """
+    Running state for every column of add_technical_indicators for ONE ticker.
+    Each call to update() consumes one bar in O(1) and returns that bar's indicator row.
+    """
+    RSI_PERIOD = 14
+    ROC_PERIOD = 10
+    CCI_PERIOD = 20
+    MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+    BB_PERIOD, BB_STD = 20, 2
+    ATR_PERIOD = 14
+    SMA_PERIOD = 50
+    VOL_SHORT, VOL_LONG = 5, 20
+    RET_LAGS = (3, 5, 10, 20)
+
+    def __init__(self):
+        self.count = 0
+        self.prev_close = NAN
+        self.prev_log_ret = NAN
+
+        # Close history long enough for ROC and the lagged returns
+        self.closes = deque(maxlen=max(self.ROC_PERIOD, *self.RET_LAGS) + 1)
+
+        self.gains = _RollingWindow(self.RSI_PERIOD)
+        self.losses = _RollingWindow(self.RSI_PERIOD)
+        self.tp = _RollingWindow(self.CCI_PERIOD)
+        self.bb = _RollingWindow(self.BB_PERIOD)
+        self.tr = _RollingWindow(self.ATR_PERIOD)
+        self.sma = _RollingWindow(self.SMA_PERIOD)
+        self.ret_short = _RollingWindow(self.VOL_SHORT)
+        self.ret_long = _RollingWindow(self.VOL_LONG)
+
+        self.ema_fast = NAN
+        self.ema_slow = NAN
+        self.ema_signal = NAN
+
+    @staticmethod
+    def _ewm(prev: float, value: float, span: int) -> float:
+        # pandas ewm(span=..., adjust=False): y0 = x0, y_t = (1 - a) * y_{t-1} + a * x_t
+        if math.isnan(prev):
+            return value
+        alpha = 2.0 / (span + 1.0)
+        return (1.0 - alpha) * prev + alpha * value
+
+    def _lag_close(self, lag: int) -> float:
+        # closes[-1] is the current bar
+        if len(self.closes) <= lag:
+            return NAN
+        return self.closes[-1 - lag]
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        prev_close = self.prev_close
+        self.closes.append(close)
+
+        # 1. Momentum / Oscillators
+        delta = close - prev_close if self.count else 0.0
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+        rsi = 100 - _div(100, 1 + _div(self.gains.avg(), self.losses.avg()))
+
+        roc = (_div(close, self._lag_close(self.ROC_PERIOD)) - 1) * 100
+
+        tp = (high + low + close) / 3
+        self.tp.push(tp)
+        if self.tp.full:
+            tp_mean = self.tp.mean
+            mad = math.fsum(abs(v - tp_mean) for v in self.tp.buf) / self.CCI_PERIOD
+            cci = (tp - tp_mean) / (0.015 * mad + 1e-6)
+        else:
+            cci = NAN
+
+        # 2. Trend (MACD)
+        self.ema_fast = self._ewm(self.ema_fast, close, self.MACD_FAST)
+        self.ema_slow = self._ewm(self.ema_slow, close, self.MACD_SLOW)
+        macd = self.ema_fast - self.ema_slow
+        self.ema_signal = self._ewm(self.ema_signal, macd, self.MACD_SIGNAL)
+
+        # 3. Volatility (Bollinger & ATR)
+        self.bb.push(close)
+        middle = self.bb.avg()
+        std = self.bb.std()
+        upper = middle + std * self.BB_STD
+        lower = middle - std * self.BB_STD
+        pct_b = _div(close - lower, upper - lower)
+
+        if self.count:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        else:
+            true_range = high - low
+        self.tr.push(true_range)
+        atr_pct = _div(self.tr.avg(), close)
+
+        # 4. Moving Averages
+        self.sma.push(close)
+        sma_50 = self.sma.avg()
+
+        # 5. Stationary Features
+        if self.count:
+            log_ret = _log(_div(close, prev_close))
+            pct_ret = _div(close, prev_close) - 1
+            self.ret_short.push(pct_ret)
+            self.ret_long.push(pct_ret)
+        else:
+            log_ret = NAN
+        vol_ratio = _div(self.ret_short.std(), self.ret_long.std())
+        sma_ratio = _div(close, sma_50)
+
+        # 6. Lagged Returns
+        row = {
+            'RSI': rsi,
+            'ROC': roc,
+            'CCI': cci,
+            'MACD': macd,
+            'MACD_Signal': self.ema_signal,
+            'BB_Upper': upper,
+            'BB_Lower': lower,
+            'BB_Middle': middle,
+            'BB_Pct': pct_b,
+            'ATR_Pct': atr_pct,
+            'SMA_50': sma_50,
+            'Log_Ret': log_ret,
+            'Vol_Ratio': vol_ratio,
+            'SMA_Ratio': sma_ratio,
+            'Ret_1d': self.prev_log_ret,
+        }
+        for lag in self.RET_LAGS:
+            row[f'Ret_{lag}d'] = _div(close, self._lag_close(lag)) - 1
+
+        self.prev_close = close
+        self.prev_log_ret = log_ret
+        self.count += 1
+        return row
+
+    @classmethod
+    def from_arrays(cls, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> 'IndicatorState':
+        """
+        The state update() would reach over these bars, taken from array slices
+        instead of a per-bar loop (the EWMs through brain.core.kernels).
+        """
+        state = cls()
+        n = len(close)
+        if n == 0:
+            return state
+        high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+        prev_close = kernels.shift(close, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = np.concatenate([[0.0], np.diff(close)])  # update() counts the first bar's delta as 0
+            true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+            pct_ret = close[1:] / close[:-1] - 1
+            ema_fast = kernels.ewm_mean(close, cls.MACD_FAST)
+            ema_slow = kernels.ewm_mean(close, cls.MACD_SLOW)
+            ema_signal = kernels.ewm_mean(ema_fast - ema_slow, cls.MACD_SIGNAL)
+
+        def last(values: np.ndarray, size: int) -> List[float]:
+            return values[-size:].tolist()
+
+        state.count = n
+        state.prev_close = float(close[-1])
+        state.prev_log_ret = _log(_div(float(close[-1]), float(close[-2]))) if n > 1 else NAN
+        state.closes.extend(last(close, state.closes.maxlen))
+        state.gains = _RollingWindow(cls.RSI_PERIOD, last(np.where(delta > 0, delta, 0.0), cls.RSI_PERIOD))
+        state.losses = _RollingWindow(cls.RSI_PERIOD, last(np.where(delta < 0, -delta, 0.0), cls.RSI_PERIOD))
+        state.tp = _RollingWindow(cls.CCI_PERIOD, last((high + low + close) / 3, cls.CCI_PERIOD))
+        state.bb = _RollingWindow(cls.BB_PERIOD, last(close, cls.BB_PERIOD))
+        state.tr = _RollingWindow(cls.ATR_PERIOD, last(true_range, cls.ATR_PERIOD))
+        state.sma = _RollingWindow(cls.SMA_PERIOD, last(close, cls.SMA_PERIOD))
+        state.ret_short = _RollingWindow(cls.VOL_SHORT, last(pct_ret, cls.VOL_SHORT))
+        state.ret_long = _RollingWindow(cls.VOL_LONG, last(pct_ret, cls.VOL_LONG))
+        state.ema_fast, state.ema_slow, state.ema_signal = (float(ema_fast[-1]), float(ema_slow[-1]),
+                                                             float(ema_signal[-1]))
+        return state
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-Python (JSON/pickle friendly) copy of the running state."""
+        windows = {
+            name: list(getattr(self, name).buf)
+            for name in ('gains', 'losses', 'tp', 'bb', 'tr', 'sma', 'ret_short', 'ret_long')
+        }
+        return {
+            'count': self.count,
+            'prev_close': self.prev_close,
+            'prev_log_ret': self.prev_log_ret,
+            'closes': list(self.closes),
+            'ema_fast': self.ema_fast,
+            'ema_slow': self.ema_slow,
+            'ema_signal': self.ema_signal,
+            'windows': windows,
+        }
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> 'IndicatorState':
+        state = cls()
+        state.count = snapshot['count']
+        state.prev_close = snapshot['prev_close']
+        state.prev_log_ret = snapshot['prev_log_ret']
+        state.closes.extend(snapshot['closes'])
+        state.ema_fast = snapshot['ema_fast']
+        state.ema_slow = snapshot['ema_slow']
+        state.ema_signal = snapshot['ema_signal']
+        for name, values in snapshot['windows'].items():
+            window = getattr(state, name)
+            setattr(state, name, _RollingWindow(window.size, values))
+        return state
+
+
+class _TickerStream:
+    """
+    One ticker's running indicator state, its last output rows, and the raw bars
+    (timestamps + high/low/close) the state depends on.
+    """
+    def __init__(self, state: IndicatorState, timestamps: np.ndarray, bars: np.ndarray,
+                 rows: Dict[str, np.ndarray]):
+        self.state = state
+        self.timestamps = timestamps  # int64 ns, oldest first
+        self.bars = bars  # (len(timestamps), 3): high, low, close
+        self.rows = rows  # column -> last output values
+        self.lock = Lock()
+
+    def position(self, stamps: np.ndarray, bars: np.ndarray, verify_bars: int) -> Optional[int]:
+        """
+        Index of the last consumed bar in the given history, if every kept bar reappears
+        there unchanged at the same offsets; else None. A stream built from a history
+        shorter than verify_bars also requires that history's first bar to be the first one.
+        """
+        k = len(self.timestamps)
+        if k == 0:
+            return None
+        p = int(np.searchsorted(stamps, self.timestamps[-1]))
+        if p >= len(stamps) or stamps[p] != self.timestamps[-1] or p + 1 < k:
+            return None
+        if k < verify_bars and p + 1 != k:
+            return None
+        window = slice(p + 1 - k, p + 1)
+        if not (np.array_equal(stamps[window], self.timestamps)
+                and np.array_equal(bars[window], self.bars, equal_nan=True)):
+            return None
+        return p
+
+    def extend(self, stamps: np.ndarray, bars: np.ndarray, keep_rows: int, verify_bars: int):
+        """Consumes the given new bars: one update() each."""
+        new_rows = [self.state.update(float(h), float(l), float(c)) for h, l, c in bars]
+        self.rows = {col: np.concatenate([values, [row[col] for row in new_rows]])[-keep_rows:]
+                     for col, values in self.rows.items()}
+        self.timestamps = np.concatenate([self.timestamps, stamps])[-verify_bars:]
+        self.bars = np.concatenate([self.bars, bars])[-verify_bars:]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'state': self.state.snapshot(),
+            'timestamps': self.timestamps.tolist(),
+            'bars': self.bars.tolist(),
+            'rows': {c: v.tolist() for c, v in self.rows.items()},
+        }
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> '_TickerStream':
+        return cls(IndicatorState.restore(snapshot['state']),
+                   np.asarray(snapshot['timestamps'], dtype=np.int64),
+                   np.asarray(snapshot['bars'], dtype=np.float64).reshape(-1, 3),
+                   {c: np.asarray(snapshot['rows'][c], dtype=np.float64) for c in INDICATOR_COLUMNS})
+
+
+class StreamingIndicatorEngine:
+    """
+    Incremental feature frames, per ticker: frame(ticker, history, rows) returns what
+    build_feature_frame(history, rows=rows) returns, to within float tolerance.
+
+    The first call for a ticker builds the frame vectorized and seeds the running state
+    from the same arrays. Later calls on a history that extends the one consumed only
+    run update() for the new bars (O(1) each) and reuse the kept rows. A history lines up
+    when its bars up to the last consumed one match the kept ones: the last verify_bars
+    bars, compared on timestamps and high/low/close. Those bars are everything the output
+    depends on (the MACD EWMs to brain.core.indicators.EWM_TOLERANCE). Revised, missing
+    or shifted bars inside that window, or too many new bars, trigger a rebuild.
+    """
+    def __init__(self, keep_rows: int, max_tickers: int = 1024, verify_bars: Optional[int] = None):
+        """
+        Args:
+            keep_rows: Output rows kept per ticker (the largest `rows` callers ask for).
+            max_tickers: Tickers kept, least recently used dropped first.
+            verify_bars: Raw bars kept and compared (default: the lookback of every indicator).
+        """
+        from brain.core.indicators import lookback
+        self.keep_rows = keep_rows
+        self.max_tickers = max_tickers
+        self.verify_bars = verify_bars or lookback(INDICATOR_COLUMNS)
+        self._streams: "OrderedDict[str, _TickerStream]" = OrderedDict()
+        self._lock = Lock()
+        self._counters = {"incremental": 0, "rebuilds": 0, "bars_appended": 0}
+
+    def _stream(self, key: str) -> Optional[_TickerStream]:
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is not None:
+                self._streams.move_to_end(key)
+            return stream
+
+    def _install(self, key: str, stream: _TickerStream):
+        with self._lock:
+            self._streams[key] = stream
+            self._streams.move_to_end(key)
+            while len(self._streams) > self.max_tickers:
+                self._streams.popitem(last=False)
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] += n
+
+    def frame(self, ticker: str, history: PriceHistory, rows: int,
+              sentiment: float = 0.0, news_volume: float = 0.0) -> pd.DataFrame:
+        from brain.core.features import build_feature_frame
+
+        series = as_price_series(history)
+        n = len(series)
+        if n == 0 or rows > self.keep_rows:
+            return build_feature_frame(series, sentiment, news_volume, rows=rows)
+        stamps = series.datetime.view(np.int64)
+        bars = np.column_stack([series.high, series.low, series.close])
+
+        key = ticker.upper()
+        stream = self._stream(key)
+        if stream is not None:
+            with stream.lock:
+                p = stream.position(stamps, bars, self.verify_bars)
+                if p is not None and n - (p + 1) <= self.keep_rows:
+                    if p + 1 < n:
+                        stream.extend(stamps[p + 1:], bars[p + 1:], self.keep_rows, self.verify_bars)
+                        self._count("bars_appended", n - (p + 1))
+                    self._count("incremental")
+                    base = series[-rows:].to_frame()
+                    data = {c: base[c].to_numpy() for c in base.columns}
+                    data.update((c, stream.rows[c][-rows:]) for c in INDICATOR_COLUMNS)
+                    data.update(Sentiment=np.full(len(base), sentiment), NewsVol=np.full(len(base), news_volume))
+                    return pd.DataFrame(data, index=base.index)
+
+        # Rebuild: the vectorized frame, plus the running state seeded from the raw bars
+        self._count("rebuilds")
+        df = build_feature_frame(series, sentiment, news_volume, rows=self.keep_rows)
+        tail = slice(max(0, n - self.verify_bars), n)
+        state = IndicatorState.from_arrays(series.high[tail], series.low[tail], series.close[tail])
+        self._install(key, _TickerStream(state, stamps[tail].copy(), bars[tail],
+                                         {c: df[c].to_numpy(dtype=np.float64) for c in INDICATOR_COLUMNS}))
+        return df.iloc[-rows:]
+
+    def snapshot(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Plain-Python copy of one ticker's stream (None if it has none)."""
+        stream = self._stream(ticker.upper())
+        if stream is None:
+            return None
+        with stream.lock:
+            return stream.snapshot()
+
+    def restore(self, ticker: str, snapshot: Dict[str, Any]):
+        self._install(ticker.upper(), _TickerStream.restore(snapshot))
+
+    def reset(self, ticker: Optional[str] = None):
+        with self._lock:
+            if ticker is None:
+                self._streams.clear()
+            else:
+                self._streams.pop(ticker.upper(), None)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {"name": "indicator-streams", "tickers": len(self._streams), "capacity": self.max_tickers,
+                    "keep_rows": self.keep_rows, "verify_bars": self.verify_bars, **self._counters}
@@ -0,0 +1,246 @@
+"""
+Pooled, rate-aware Twelve Data client.
+
+One requests.Session (keep-alive, pooled connections) per client, with
+connect/read timeouts on every call, bounded retries with full jitter for
+transient failures, and a token bucket shared by every caller in the process,
+so the free-tier per-minute credit limit is respected without fixed sleeps.
+Waiting for a credit is bounded too: past rate_limit_timeout the call fails
+fast with RateLimitTimeout, and callers fall back to stored bars.
+
+time_series() parses the `values` payload straight into column arrays
+(oldest first), the layout brain.core.price_store stores.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from brain.core.exceptions import DataFetchException
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.twelvedata.com"
+
+# Twelve Data reports most errors as HTTP 200 with {"status": "error", "code": ...}
+RETRYABLE_CODES = {429, 500, 502, 503, 504}
+
+
+class TwelveDataError(DataFetchException):
+    """Twelve Data returned an error payload (bad symbol, exhausted credits, ...)."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class RateLimitTimeout(TwelveDataError):
+    """No rate-limit credit became available within the client's rate_limit_timeout."""
+
+    def __init__(self, message: str):
+        super().__init__(message, 429)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per `per` seconds, bursts up to `capacity`.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, capacity: Optional[float] = None):
+        self.rate = rate / per
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Blocks until `tokens` are available. Returns False if `timeout` elapses first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+def parse_time_series(values: List[dict]) -> Dict[str, np.ndarray]:
+    """Twelve Data `values` (newest first, numbers as strings) -> column arrays, oldest first."""
+    n = len(values)
+    rows = values[::-1]
+    bars = {
+        "date": np.array([v["datetime"] for v in rows], dtype="datetime64[s]"),
+        "open": np.fromiter((v["open"] for v in rows), dtype=np.float64, count=n),
+        "high": np.fromiter((v["high"] for v in rows), dtype=np.float64, count=n),
+        "low": np.fromiter((v["low"] for v in rows), dtype=np.float64, count=n),
+        "close": np.fromiter((v["close"] for v in rows), dtype=np.float64, count=n),
+        # Indices/forex have no volume
+        "volume": np.fromiter((v.get("volume") or 0 for v in rows), dtype=np.float64, count=n).astype(np.int64),
+    }
+    return bars
+
+
+class TwelveDataClient:
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 limiter: Optional[TokenBucket] = None,
+                 connect_timeout: float = 3.05,
+                 read_timeout: float = 15.0,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 20.0,
+                 pool_size: int = 16,
+                 rate_limit_timeout: Optional[float] = None):
+        """
+        Args:
+            api_key: Defaults to $TWELVE_DATA_KEY.
+            base_url: Defaults to $TWELVE_DATA_URL or the public API (tests point it at a local server).
+            limiter: Token bucket to draw one credit per request from (default: the process-wide one).
+            connect_timeout, read_timeout: Per-request timeouts in seconds.
+            max_retries: Retries after the first attempt for transient failures.
+            backoff, max_backoff: Full-jitter exponential backoff bounds in seconds.
+            pool_size: Max pooled keep-alive connections.
+            rate_limit_timeout: Longest wait in seconds for a rate-limit credit per attempt
+                (default: $TWELVE_DATA_RATE_LIMIT_TIMEOUT, 10s; <= 0 waits indefinitely).
+        """
+        self.api_key = api_key or os.getenv("TWELVE_DATA_KEY")
+        self.base_url = (base_url or os.getenv("TWELVE_DATA_URL", DEFAULT_BASE_URL)).rstrip("/")
+        self.limiter = limiter or get_rate_limiter()
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        if rate_limit_timeout is None:
+            rate_limit_timeout = float(os.getenv("TWELVE_DATA_RATE_LIMIT_TIMEOUT", 10))
+        self.rate_limit_timeout = rate_limit_timeout if rate_limit_timeout > 0 else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.stats = {"requests": 0, "retries": 0, "errors": 0, "throttled": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _sleep_backoff(self, attempt: int) -> None:
+        time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt))))
+
+    def get(self, endpoint: str, params: Optional[dict] = None, credits: float = 1.0) -> dict:
+        """
+        GET {base_url}/{endpoint} and return the decoded JSON.
+        Retries timeouts, connection errors, HTTP 429/5xx and retryable error payloads.
+        `credits` is drawn from the rate limiter per attempt (0 for free endpoints);
+        raises RateLimitTimeout if none is available within rate_limit_timeout.
+        """
+        params = {**(params or {}), "apikey": self.api_key}
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+                self._sleep_backoff(attempt - 1)
+            if credits and not self.limiter.acquire(credits, timeout=self.rate_limit_timeout):
+                # Out of credits: fail fast instead of holding the request thread
+                self._count("throttled")
+                raise RateLimitTimeout(f"Twelve Data {endpoint}: no rate-limit credit within "
+                                       f"{self.rate_limit_timeout}s")
+            self._count("requests")
+
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                logger.warning(f"Twelve Data {endpoint} attempt {attempt + 1} failed: {e}")
+                continue
+
+            if response.status_code in RETRYABLE_CODES:
+                last_error = TwelveDataError(f"HTTP {response.status_code}", response.status_code)
+                logger.warning(f"Twelve Data {endpoint} attempt {attempt + 1}: HTTP {response.status_code}")
+                continue
+
+            try:
+                data = response.json()
+            except ValueError as e:
+                if response.status_code >= 400:
+                    self._count("errors")
+                    raise TwelveDataError(f"HTTP {response.status_code}", response.status_code) from e
+                last_error = e
+                continue
+
+            if isinstance(data, dict) and data.get("status") == "error":
+                code = data.get("code")
+                error = TwelveDataError(f"Twelve Data Error: {data.get('message', 'Unknown error')}", code)
+                if code in RETRYABLE_CODES:
+                    last_error = error
+                    continue
+                self._count("errors")
+                raise error
+
+            return data
+
+        self._count("errors")
+        if isinstance(last_error, TwelveDataError):
+            raise last_error
+        raise DataFetchException(f"Twelve Data {endpoint} failed after {self.max_retries + 1} attempts: {last_error}")
+
+    def time_series(self, symbol: str, interval: str = "1day", outputsize: int = 5000) -> Dict[str, np.ndarray]:
+        """OHLCV bars as column arrays (oldest first)."""
+        data = self.get("time_series", {"symbol": symbol, "interval": interval, "outputsize": str(outputsize)})
+        if "values" not in data:
+            raise TwelveDataError(f"Twelve Data Error: {data.get('message', 'Unknown error')}", data.get("code"))
+        return parse_time_series(data["values"])
+
+    def symbol_search(self, query: str) -> List[dict]:
+        # symbol_search does not consume API credits
+        return self.get("symbol_search", {"symbol": query}, credits=0).get("data", [])
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_limiter: Optional[TokenBucket] = None
+_client: Optional[TwelveDataClient] = None
+_singleton_lock = threading.Lock()
+
+
+def get_rate_limiter() -> TokenBucket:
+    """Process-wide credit bucket ($TWELVE_DATA_RATE_PER_MIN, free tier = 8/min)."""
+    global _limiter
+    with _singleton_lock:
+        if _limiter is None:
+            _limiter = TokenBucket(float(os.getenv("TWELVE_DATA_RATE_PER_MIN", 8)), per=60.0)
+        return _limiter
+
+
+def get_client() -> TwelveDataClient:
+    """Process-wide pooled client."""
+    global _client
+    limiter = get_rate_limiter()
+    with _singleton_lock:
+        if _client is None:
+            _client = TwelveDataClient(limiter=limiter)
+        return _client
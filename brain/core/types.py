@@ -1,3 +1,4 @@
+import numpy as np
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
@@ -52,3 +53,126 @@ class AnalysisResult(BaseModel):
     confidence: float
     components: Dict[str, Any]
     articles: List[Article]
+
+
+def _as_datetime64(values) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return np.ascontiguousarray(values, dtype="datetime64[ns]")
+    try:
+        return np.array(values, dtype="datetime64[ns]")
+    except (ValueError, TypeError):
+        import pandas as pd  # Offsets / mixed formats
+        return pd.to_datetime(list(values)).to_numpy(dtype="datetime64[ns]")
+
+
+class PriceSeries:
+    """
+    Columnar OHLCV history, oldest first: contiguous datetime64[ns] timestamps,
+    float64 open/high/low/close and int64 volume. Validated (and sorted) once at
+    construction; the arrays are read-only, slices are views and to_frame() wraps
+    them without copying. Every brain entry point accepts it in place of
+    List[StockDataPoint]; indexing/iterating still yields StockDataPoint.
+    """
+    __slots__ = ("datetime", "open", "high", "low", "close", "volume")
+    PRICE_FIELDS = ("open", "high", "low", "close")
+
+    def __init__(self, datetime, open, high, low, close, volume):
+        timestamps = _as_datetime64(datetime)
+        prices = [np.ascontiguousarray(p, dtype=np.float64) for p in (open, high, low, close)]
+        volume = np.asarray(volume)
+        if volume.dtype.kind != "i":
+            as_int = volume.astype(np.int64)
+            if volume.dtype.kind not in "uf" or not np.array_equal(as_int, volume):
+                raise ValueError("PriceSeries volume must hold integers")
+            volume = as_int
+        volume = np.ascontiguousarray(volume, dtype=np.int64)
+
+        n = len(timestamps)
+        columns = [timestamps, *prices, volume]
+        if any(c.ndim != 1 or len(c) != n for c in columns):
+            raise ValueError(f"PriceSeries columns must be 1-D and equally long, got {[c.shape for c in columns]}")
+        if np.isnat(timestamps).any():
+            raise ValueError("PriceSeries timestamps contain NaT")
+        if n > 1 and (np.diff(timestamps) < np.timedelta64(0)).any():
+            order = np.argsort(timestamps, kind="stable")
+            columns = [c[order] for c in columns]
+        self._set(columns)
+
+    def _set(self, columns) -> None:
+        for name, column in zip(self.__slots__, columns):
+            column = column.view()
+            column.flags.writeable = False
+            object.__setattr__(self, name, column)
+
+    @classmethod
+    def _trusted(cls, columns) -> "PriceSeries":
+        series = object.__new__(cls)
+        series._set(columns)
+        return series
+
+    @classmethod
+    def from_points(cls, points: List[StockDataPoint]) -> "PriceSeries":
+        n = len(points)
+        return cls([p.datetime for p in points],
+                   *(np.fromiter((getattr(p, f) for p in points), dtype=np.float64, count=n) for f in cls.PRICE_FIELDS),
+                   np.fromiter((p.volume for p in points), dtype=np.int64, count=n))
+
+    @classmethod
+    def from_records(cls, rows: List[Dict[str, Any]], date_key: str = "date") -> "PriceSeries":
+        """From row dicts with date/open/high/low/close/volume keys (the /api/analyze graph rows)."""
+        n = len(rows)
+        return cls([r[date_key] for r in rows],
+                   *(np.fromiter((r[f] for r in rows), dtype=np.float64, count=n) for f in cls.PRICE_FIELDS),
+                   np.fromiter((r["volume"] for r in rows), dtype=np.int64, count=n))
+
+    @classmethod
+    def from_bars(cls, bars: Dict[str, np.ndarray]) -> "PriceSeries":
+        """From price-store column arrays (brain.core.price_store)."""
+        return cls(bars["date"], bars["open"], bars["high"], bars["low"], bars["close"], bars["volume"])
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PriceSeries._trusted([getattr(self, name)[index] for name in self.__slots__])
+        return StockDataPoint(datetime=self.datetime[index].astype("datetime64[us]").item(),
+                              open=self.open[index], high=self.high[index], low=self.low[index],
+                              close=self.close[index], volume=int(self.volume[index]))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PriceSeries is immutable")
+
+    def __repr__(self) -> str:
+        span = f"{self.datetime[0].astype('datetime64[s]')} .. {self.datetime[-1].astype('datetime64[s]')}" \
+            if len(self) else "empty"
+        return f"PriceSeries({len(self)} bars, {span})"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def to_points(self) -> List[StockDataPoint]:
+        return list(self)
+
+    def to_frame(self) -> "pd.DataFrame":
+        """
+        OHLCV DataFrame (datetime index, oldest first) over the same buffers, like
+        history_to_frame. Replacing or adding columns is fine; writing into the
+        OHLCV values in place raises (the buffers are read-only): .copy() first.
+        """
+        import pandas as pd
+        index = pd.DatetimeIndex(self.datetime, name="datetime")
+        return pd.DataFrame({name: getattr(self, name) for name in self.__slots__[1:]}, index=index, copy=False)
+
+
+# Price history as accepted by the brain entry points
+PriceHistory = Union[List[StockDataPoint], PriceSeries]
+
+
+def as_price_series(data: PriceHistory) -> PriceSeries:
+    """The history as a PriceSeries (returned as-is if it already is one)."""
+    return data if isinstance(data, PriceSeries) else PriceSeries.from_points(data)
@@ -1,31 +1,32 @@
 import pandas as pd
 import numpy as np
 import os
-import requests
 import pickle
 import logging
-from sklearn.preprocessing import StandardScaler
-from brain.core.indicators import add_technical_indicators
+from brain.core.config import BrainConfig
+from brain.core.indicators import FEATURE_SETS, add_technical_indicators
+from brain.core.exceptions import DataFetchException
+from brain.core.price_store import get_price_store, to_frame
+from brain.core.streaming import RunningMoments
+from brain.neural_networks import normalizer
 
 logger = logging.getLogger(__name__)
 
 class DataProcessor:
-    def __init__(self, sequence_length=60, scaler_path="brain/saved_models/scaler.pkl"):
+    def __init__(self, sequence_length=60, scaler_path="brain/saved_models/scaler.pkl", scaler_arrays_path=None):
         self.sequence_length = sequence_length
         self.scaler_path = scaler_path
-        self.scaler = StandardScaler()
+        # Array file next to the pickle (see brain.neural_networks.normalizer)
+        self.scaler_arrays_path = scaler_arrays_path or os.path.join(
+            os.path.dirname(scaler_path), os.path.basename(BrainConfig.SCALER_ARRAYS_PATH))
+        self.scaler = None  # sklearn StandardScaler while training, FeatureNormalizer once loaded
         self.target_mean = 0.0
         self.target_std = 1.0
         
-        self.FEATURE_COLS = [
-            'Log_Ret', 'RSI', 'MACD', 'MACD_Signal', 
-            'BB_Pct', 'Vol_Ratio', 'ROC', 
-            'SMA_Ratio', 'ATR_Pct', 'CCI', 
-            'Ret_1d', 'Ret_3d', 'Ret_5d', 'Ret_10d', 'Ret_20d',
-            'Sentiment', 'NewsVol'
-        ]
+        self.FEATURE_COLS = list(FEATURE_SETS["lstm"])
         
     def save_scaler(self):
+        """Writes both formats: the legacy pickle and the array file serving reads."""
         os.makedirs(os.path.dirname(self.scaler_path), exist_ok=True)
         data = {
             'scaler': self.scaler,
@@ -34,39 +35,30 @@ class DataProcessor:
         }
         with open(self.scaler_path, 'wb') as f:
             pickle.dump(data, f)
-        logger.info(f"Scaler & Target Stats saved to {self.scaler_path}")
+        normalizer.export(self.scaler_path, self.scaler_arrays_path, self.FEATURE_COLS)
+        logger.info(f"Scaler & Target Stats saved to {self.scaler_path} and {self.scaler_arrays_path}")
             
     def load_scaler(self):
-        if os.path.exists(self.scaler_path):
-            with open(self.scaler_path, 'rb') as f:
-                data = pickle.load(f)
-                # Handle legacy format (just scaler) vs new dict format
-                if isinstance(data, dict):
-                    self.scaler = data['scaler']
-                    self.target_mean = data.get('mean', 0.0)
-                    self.target_std = data.get('std', 1.0)
-                else:
-                    self.scaler = data
-            return True
-        return False
+        """Loads the array file, else the legacy pickle, as a FeatureNormalizer."""
+        self.scaler = normalizer.load(self.scaler_arrays_path, self.scaler_path)
+        if self.scaler is None:
+            if not os.path.exists(self.scaler_path):
+                return False
+            self.scaler = normalizer.read_pickle(self.scaler_path)
+        self.target_mean = self.scaler.target_mean
+        self.target_std = self.scaler.target_std
+        return True
         
     def fetch_stock_history(self, ticker):
         try:
-            api_key = os.getenv("TWELVE_DATA_KEY")
-            url = "https://api.twelvedata.com/time_series"
-            params = {"symbol": ticker, "interval": "1day", "outputsize": "5000", "apikey": api_key}
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if "values" not in data:
-                print(f"[API Error] {ticker}: {data.get('message', 'Unknown Error')}")
-                return None
-                
-            df = pd.DataFrame(data['values'])
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
-            df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume', 'datetime': 'Date'})
-            return df.iloc[::-1].reset_index(drop=True)
+            # Served from the local price store; only the missing tail is fetched from Twelve Data
+            bars = get_price_store().get_history(ticker, outputsize=5000, interval="1day")
+            df = to_frame(bars)
+            df['Date'] = df['Date'].dt.strftime('%Y-%m-%d')
+            return df
+        except DataFetchException as e:
+            print(f"[API Error] {ticker}: {e}")
+            return None
         except Exception as e:
             print(f"[Network Error] {e}")
             return None
@@ -83,7 +75,7 @@ class DataProcessor:
         if df is None: return None
         
         # 1. Feature Engineering
-        df = add_technical_indicators(df)
+        df = add_technical_indicators(df, columns=self.FEATURE_COLS)
         
         # 2. Target (Classification): 3-Class System
         horizon = 5
@@ -117,7 +109,8 @@ class DataProcessor:
         train_features = train_df[self.FEATURE_COLS].values
         val_features = val_df[self.FEATURE_COLS].values
         
-        self.scaler.fit(train_features)
+        from sklearn.preprocessing import StandardScaler
+        self.scaler = StandardScaler().fit(train_features)
         train_scaled = self.scaler.transform(train_features)
         val_scaled = self.scaler.transform(val_features)
         
@@ -139,9 +132,9 @@ class DataProcessor:
         df = df.replace([np.inf, -np.inf], np.nan).dropna()
         
         try:
-            dynamic_scaler = StandardScaler()
             features = df[self.FEATURE_COLS].values
-            scaled_data = dynamic_scaler.fit_transform(features)
+            moments = RunningMoments.of(features)
+            scaled_data = normalizer.FeatureNormalizer(moments.mean, moments.std()).transform(features)
             if len(scaled_data) < self.sequence_length: return None
             return np.array([scaled_data[-self.sequence_length:]])
         except Exception as e:
@@ -0,0 +1,130 @@
+"""
+Array-backed feature normalizer for serving.
+
+The LSTM's StandardScaler and the target stats are stored as plain arrays in a
+small versioned .npz (BrainConfig.SCALER_ARRAYS_PATH) next to the legacy
+scaler.pkl. Serving loads it with np.load (no pickle, no sklearn) and applies
+one fused (x - mean) / scale. The file records the sha256 of the pickle it
+mirrors; load() ignores it once the pickle has been rewritten without it.
+
+Convert an existing pickle:
+
+    python -m brain.neural_networks.normalizer
+"""
+import logging
+import os
+import pickle
+from typing import Optional, Sequence
+
+import numpy as np
+
+from brain.core.config import BrainConfig
+from brain.core.registry import artifact_sha256
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+class FeatureNormalizer:
+    """StandardScaler.transform over stored mean/scale vectors, plus the target stats."""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, target_mean: float = 0.0, target_std: float = 1.0,
+                 feature_names: Optional[Sequence[str]] = None, source_sha256: str = None):
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.scale = np.ascontiguousarray(scale, dtype=np.float64)
+        if self.mean.shape != self.scale.shape or self.mean.ndim != 1:
+            raise ValueError(f"mean {self.mean.shape} and scale {self.scale.shape} must be equal-length vectors")
+        self.target_mean = float(target_mean)
+        self.target_std = float(target_std)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.source_sha256 = source_sha256
+        self.n_features_in_ = len(self.mean)
+        self.nbytes = self.mean.nbytes + self.scale.nbytes
+
+    @classmethod
+    def from_scaler(cls, scaler, target_mean: float = 0.0, target_std: float = 1.0,
+                    feature_names: Optional[Sequence[str]] = None, source_sha256: str = None) -> "FeatureNormalizer":
+        """From a fitted sklearn StandardScaler (with_mean/with_std False become 0/1)."""
+        n = scaler.n_features_in_
+        mean = scaler.mean_ if getattr(scaler, "mean_", None) is not None and scaler.with_mean else np.zeros(n)
+        scale = scaler.scale_ if getattr(scaler, "scale_", None) is not None and scaler.with_std else np.ones(n)
+        return cls(mean, scale, target_mean, target_std, feature_names, source_sha256)
+
+    def transform(self, x: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """(x - mean) / scale in one output buffer; same values as StandardScaler.transform."""
+        x = np.asarray(x, dtype=np.float64)
+        if x.shape[-1] != self.n_features_in_:
+            raise ValueError(f"X has {x.shape[-1]} features, but the normalizer expects {self.n_features_in_}")
+        out = np.subtract(x, self.mean, out=out)
+        return np.divide(out, self.scale, out=out)
+
+    def save(self, path: str) -> str:
+        arrays = {
+            "format_version": np.array(FORMAT_VERSION),
+            "mean": self.mean,
+            "scale": self.scale,
+            "target": np.array([self.target_mean, self.target_std]),
+        }
+        if self.feature_names is not None:
+            arrays["feature_names"] = np.array(self.feature_names, dtype=str)
+        if self.source_sha256:
+            arrays["source_sha256"] = np.array(self.source_sha256)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureNormalizer":
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version > FORMAT_VERSION:
+                raise ValueError(f"{path} has format version {version}; this build reads up to {FORMAT_VERSION}")
+            target_mean, target_std = data["target"].tolist()
+            names = data["feature_names"].tolist() if "feature_names" in data.files else None
+            source = str(data["source_sha256"]) if "source_sha256" in data.files else None
+            return cls(data["mean"], data["scale"], target_mean, target_std, names, source)
+
+
+def read_pickle(path: str) -> FeatureNormalizer:
+    """The legacy scaler.pkl (dict with target stats, or a bare scaler) as a FeatureNormalizer. Needs sklearn."""
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if isinstance(data, dict):
+        return FeatureNormalizer.from_scaler(data["scaler"], data.get("mean", 0.0), data.get("std", 1.0),
+                                             source_sha256=artifact_sha256(path))
+    return FeatureNormalizer.from_scaler(data, source_sha256=artifact_sha256(path))
+
+
+def export(pickle_path: str = None, out_path: str = None, feature_names: Optional[Sequence[str]] = None) -> str:
+    """Writes the array file mirroring the pickle at pickle_path."""
+    pickle_path = pickle_path or BrainConfig.SCALER_PATH
+    out_path = out_path or BrainConfig.SCALER_ARRAYS_PATH
+    normalizer = read_pickle(pickle_path)
+    normalizer.feature_names = list(feature_names) if feature_names is not None else None
+    normalizer.save(out_path)
+    logger.info(f"Scaler arrays exported to {out_path}")
+    return out_path
+
+
+def load(path: str = None, pickle_path: str = None) -> Optional[FeatureNormalizer]:
+    """The array file at path, or None if missing or out of date with the pickle next to it."""
+    path = path or BrainConfig.SCALER_ARRAYS_PATH
+    pickle_path = pickle_path or BrainConfig.SCALER_PATH
+    if not os.path.exists(path):
+        return None
+    normalizer = FeatureNormalizer.load(path)
+    if (os.path.exists(pickle_path) and normalizer.source_sha256
+            and normalizer.source_sha256 != artifact_sha256(pickle_path)):
+        logger.warning(f"Scaler arrays {path} are stale (the pickle was rewritten). "
+                       f"Re-export with `python -m brain.neural_networks.normalizer`.")
+        return None
+    return normalizer
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from brain.neural_networks.data_processor import DataProcessor
+    print(export(feature_names=DataProcessor().FEATURE_COLS))
@@ -0,0 +1,139 @@
+"""
+Torch-free StockLSTM inference.
+
+NumpyStockLSTM reproduces StockLSTM.forward in eval mode (2-layer bidirectional
+LSTM -> Attention -> LayerNorm -> fc) with NumPy only, from weights exported to
+a compact .npz (BrainConfig.LSTM_NUMPY_PATH). Workers that serve it never import
+torch. Only export() needs torch:
+
+    python -m brain.neural_networks.numpy_lstm
+"""
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+
+from brain.core.config import BrainConfig
+from brain.core.registry import artifact_sha256
+
+logger = logging.getLogger(__name__)
+
+LAYER_NORM_EPS = 1e-5  # nn.LayerNorm default
+
+
+def export(model_path: str = None, out_path: str = None) -> str:
+    """Writes the checkpoint's weights (float32) plus its sha256 to a compressed .npz."""
+    import torch
+
+    model_path = model_path or BrainConfig.MODEL_PATH
+    out_path = out_path or BrainConfig.LSTM_NUMPY_PATH
+    state = torch.load(model_path, map_location="cpu")
+    arrays = {name.replace(".", "__"): t.detach().numpy().astype(np.float32) for name, t in state.items()}
+    tmp = out_path + ".tmp.npz"
+    np.savez_compressed(tmp, __source_sha256__=np.array(artifact_sha256(model_path)), **arrays)
+    os.replace(tmp, out_path)
+    logger.info(f"StockLSTM weights exported to {out_path}")
+    return out_path
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # Overflow-free logistic
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+class NumpyStockLSTM:
+    """Callable like StockLSTM: (batch, seq_len, input_size) float32 -> (batch, 3) logits."""
+
+    def __init__(self, weights: dict, source_sha256: str = None):
+        w = {k.replace("__", "."): np.ascontiguousarray(v, dtype=np.float32) for k, v in weights.items()}
+        self.source_sha256 = source_sha256
+        self.device = "cpu"
+        self.input_size = w["lstm.weight_ih_l0"].shape[1]
+        self.hidden_size = w["lstm.weight_hh_l0"].shape[1]
+        self.num_layers = sum(1 for k in w if k.startswith("lstm.weight_ih_l") and not k.endswith("_reverse"))
+
+        # Per layer, both directions stacked on a leading axis so one matmul per step serves both:
+        # w_ih (2, in, 4H), w_hh (2, H, 4H), bias (2, 4H). Gates are reordered from torch's
+        # i, f, g, o to i, f, o, g so the three sigmoid gates are one contiguous slice.
+        H = self.hidden_size
+        order = np.r_[0:2 * H, 3 * H:4 * H, 2 * H:3 * H]
+        self.layers = []
+        for layer in range(self.num_layers):
+            dirs = [f"l{layer}", f"l{layer}_reverse"]
+            self.layers.append((
+                np.stack([w[f"lstm.weight_ih_{d}"][order].T for d in dirs]),
+                np.stack([w[f"lstm.weight_hh_{d}"][order].T for d in dirs]),
+                np.stack([(w[f"lstm.bias_ih_{d}"] + w[f"lstm.bias_hh_{d}"])[order] for d in dirs]),
+            ))
+        self.att_w = w["attention.attention.weight"][0]
+        self.att_b = w["attention.attention.bias"][0]
+        self.ln_w, self.ln_b = w["layer_norm.weight"], w["layer_norm.bias"]
+        self.fc_w, self.fc_b = w["fc.weight"].T.copy(), w["fc.bias"]
+        self.nbytes = sum(a.nbytes for a in w.values())
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyStockLSTM":
+        with np.load(path) as data:
+            weights = {k: data[k] for k in data.files if k != "__source_sha256__"}
+            source = str(data["__source_sha256__"]) if "__source_sha256__" in data.files else None
+        return cls(weights, source)
+
+    def _bilstm_layer(self, x: np.ndarray, w_ih: np.ndarray, w_hh: np.ndarray, bias: np.ndarray) -> np.ndarray:
+        batch, steps, _ = x.shape
+        H = self.hidden_size
+        # Input projections for every step of both directions at once: (2, batch, steps, 4H)
+        gates_x = np.matmul(x[None], w_ih[:, None]) + bias[:, None, None, :]
+        h = np.zeros((2, batch, H), dtype=np.float32)
+        c = np.zeros((2, batch, H), dtype=np.float32)
+        out = np.empty((2, batch, steps, H), dtype=np.float32)
+        for t in range(steps):
+            rt = steps - 1 - t  # reverse direction walks the sequence backwards
+            gates = np.matmul(h, w_hh)
+            gates[0] += gates_x[0, :, t]
+            gates[1] += gates_x[1, :, rt]
+            ifo = _sigmoid(gates[..., :3 * H])
+            g = np.tanh(gates[..., 3 * H:])
+            c = ifo[..., H:2 * H] * c + ifo[..., :H] * g
+            h = ifo[..., 2 * H:] * np.tanh(c)
+            out[0, :, t] = h[0]
+            out[1, :, rt] = h[1]
+        return np.concatenate([out[0], out[1]], axis=-1)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        if x.ndim == 2:
+            x = x[None]
+        for w_ih, w_hh, bias in self.layers:
+            x = self._bilstm_layer(x, w_ih, w_hh, bias)
+
+        # Attention: softmax over time of a linear score, weighted sum of the LSTM outputs
+        scores = x @ self.att_w + self.att_b
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        weights = scores / scores.sum(axis=1, keepdims=True)
+        context = np.einsum("bt,bth->bh", weights, x)
+
+        mean = context.mean(axis=-1, keepdims=True)
+        var = context.var(axis=-1, keepdims=True)
+        context = (context - mean) / np.sqrt(var + LAYER_NORM_EPS) * self.ln_w + self.ln_b
+        return context @ self.fc_w + self.fc_b
+
+
+def load(path: str = None, model_path: str = None) -> Optional[NumpyStockLSTM]:
+    """The exported weights at path, or None if missing or exported from another checkpoint."""
+    path = path or BrainConfig.LSTM_NUMPY_PATH
+    model_path = model_path or BrainConfig.MODEL_PATH
+    if not os.path.exists(path):
+        return None
+    model = NumpyStockLSTM.load(path)
+    if os.path.exists(model_path) and model.source_sha256 != artifact_sha256(model_path):
+        logger.warning(f"NumPy LSTM weights {path} are stale (exported from another checkpoint). "
+                       f"Re-export with `python -m brain.neural_networks.numpy_lstm`.")
+        return None
+    logger.info(f"NumPy StockLSTM loaded from {path}")
+    return model
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(export())
@@ -0,0 +1,115 @@
+"""
+CPU serving artifact for StockLSTM.
+
+build() turns the trained checkpoint (hybrid_lstm.pth) into a frozen TorchScript
+module, optionally with dynamic int8 quantization of the nn.LSTM and nn.Linear
+layers, and saves it next to the checkpoint (BrainConfig.LSTM_SERVING_PATH).
+The artifact records the sha256 of the checkpoint it was built from; load()
+ignores an artifact whose source no longer matches, so a retrained model is
+never served through a stale export.
+
+    python -m brain.neural_networks.serving [--mode int8|fp32]
+"""
+import json
+import logging
+import os
+import sys
+from typing import Optional
+
+import torch
+
+from brain.core.config import BrainConfig
+from brain.core.registry import artifact_sha256
+from brain.neural_networks.model import StockLSTM
+
+logger = logging.getLogger(__name__)
+
+MODES = ("int8", "fp32")
+SEQUENCE_LENGTH = 60  # PredictionEngine's input window
+
+
+def load_eager(model_path: str) -> StockLSTM:
+    """fp32 eager StockLSTM on CPU, sized from the checkpoint."""
+    state = torch.load(model_path, map_location="cpu")
+    input_size, hidden_size = state["lstm.weight_ih_l0"].shape[1], state["lstm.weight_hh_l0"].shape[1]
+    model = StockLSTM(input_size=input_size, hidden_size=hidden_size)
+    model.load_state_dict(state)
+    return model.eval()
+
+
+def compile_model(model: StockLSTM, mode: str = "int8") -> torch.jit.ScriptModule:
+    """Traced + frozen TorchScript module; mode "int8" quantizes LSTM/Linear weights first."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown LSTM serving mode '{mode}'. Choose one of {MODES}.")
+    model = model.eval()
+    if mode == "int8":
+        from torch.ao.quantization import quantize_dynamic
+        model = quantize_dynamic(model, {torch.nn.LSTM, torch.nn.Linear}, dtype=torch.qint8)
+    example = torch.zeros(1, SEQUENCE_LENGTH, model.lstm.input_size)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    return torch.jit.freeze(traced.eval())
+
+
+class ServingLSTM:
+    """Callable like StockLSTM (x -> logits) over a loaded TorchScript artifact."""
+
+    def __init__(self, module: torch.jit.ScriptModule, meta: dict, nbytes: int):
+        self.module = module
+        self.mode = meta["mode"]
+        self.input_size = meta["input_size"]
+        self.source_sha256 = meta["source_sha256"]
+        self.device = torch.device("cpu")
+        self.nbytes = nbytes
+
+    def __call__(self, x: torch.Tensor) -> torch.Tensor:
+        return self.module(x)
+
+
+def build(model_path: str = None, out_path: str = None, mode: str = None) -> str:
+    """Exports the checkpoint at model_path to out_path (defaults from BrainConfig)."""
+    model_path = model_path or BrainConfig.MODEL_PATH
+    out_path = out_path or BrainConfig.LSTM_SERVING_PATH
+    mode = mode or BrainConfig.LSTM_SERVING_MODE
+
+    model = load_eager(model_path)
+    compiled = compile_model(model, mode)
+    meta = {"mode": mode, "input_size": model.lstm.input_size, "source_sha256": artifact_sha256(model_path),
+            "torch": torch.__version__}
+    tmp = out_path + ".tmp"
+    torch.jit.save(compiled, tmp, _extra_files={"meta.json": json.dumps(meta)})
+    os.replace(tmp, out_path)
+    logger.info(f"LSTM serving artifact ({mode}) written to {out_path}")
+    return out_path
+
+
+def load(path: str = None, model_path: str = None, mode: str = None) -> Optional[ServingLSTM]:
+    """
+    The artifact at path, or None if it is missing, was built from another checkpoint,
+    or was built in another mode than the configured one.
+    """
+    path = path or BrainConfig.LSTM_SERVING_PATH
+    model_path = model_path or BrainConfig.MODEL_PATH
+    mode = mode or BrainConfig.LSTM_SERVING_MODE
+    if not os.path.exists(path):
+        return None
+
+    extra = {"meta.json": ""}
+    module = torch.jit.load(path, map_location="cpu", _extra_files=extra)
+    meta = json.loads(extra["meta.json"])
+    if os.path.exists(model_path) and meta.get("source_sha256") != artifact_sha256(model_path):
+        logger.warning(f"LSTM serving artifact {path} is stale (built from another checkpoint); "
+                       f"serving the eager model. Rebuild with `python -m brain.neural_networks.serving`.")
+        return None
+    if meta.get("mode") != mode:
+        logger.warning(f"LSTM serving artifact {path} was built as {meta.get('mode')}, not {mode}; "
+                       f"serving the eager model. Rebuild with `python -m brain.neural_networks.serving --mode {mode}`.")
+        return None
+    logger.info(f"LSTM serving artifact loaded ({meta['mode']}) from {path}")
+    return ServingLSTM(module.eval(), meta, os.path.getsize(path))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    mode = sys.argv[sys.argv.index("--mode") + 1] if "--mode" in sys.argv else None
+    print(build(mode=mode))
@@ -91,5 +91,13 @@ class ModelTrainer:
                 data_processor.save_scaler()
             else:
                 patience_counter += 1
+        
+        # Inference artifacts next to the best checkpoint: compiled CPU serving module
+        # (brain.neural_networks.serving) and torch-free weights (brain.neural_networks.numpy_lstm)
+        if os.path.exists(self.model_path):
+            from brain.neural_networks import numpy_lstm, serving
+            stem = os.path.splitext(self.model_path)[0]
+            serving.build(self.model_path, stem + ".serving.pt")
+            numpy_lstm.export(self.model_path, stem + ".npz")
                 
         return model
@@ -1,88 +1,101 @@
-import os
-import torch
 import numpy as np
 import logging
-import pickle
+import os
 import pandas as pd
-from typing import List, Tuple
-from sklearn.preprocessing import StandardScaler 
+from typing import List, Optional, Tuple
 from brain.core.config import BrainConfig
-from brain.core.types import StockDataPoint
-from brain.neural_networks.model import StockLSTM
-from brain.core.indicators import add_technical_indicators
+from brain.core.types import PriceHistory
+from brain.core.registry import artifact_sha256, lstm_candidates, model_registry
+from brain.core.features import build_feature_frame, select_features
+from brain.core.indicators import FEATURE_SETS
+from brain.neural_networks.numpy_lstm import NumpyStockLSTM
+from brain.prediction.prediction_cache import PredictionCache, content_version, get_prediction_cache, lookup
 
 logger = logging.getLogger(__name__)
 
 class PredictionEngine:
     """
-    Manages the PyTorch LSTM model for price direction prediction.
+    Manages the LSTM model for price direction prediction.
+    Runs on torch (compiled serving artifact or eager checkpoint) or, with
+    BrainConfig.LSTM_RUNTIME = "numpy", on the torch-free NumPy port.
+    Results for a ticker are cached per (last bar, price window, model version).
     """
-    def __init__(self):
+    CACHE_NAME = "lstm"
+    SEQUENCE_LENGTH = 60
+
+    def __init__(self, cache: Optional[PredictionCache] = None):
+        """`cache` overrides the process-wide prediction cache (tests, benchmarks)."""
         self.config = BrainConfig.get_instance()
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.device = None
         self.model = None
         self.scaler = None
+        self.cache = cache
+        self.model_version = None
         self.target_mean = 0.0
         self.target_std = 1.0
         self._loaded = False
-        self.FEATURE_COLS = [
-            'Log_Ret', 'RSI', 'MACD', 'MACD_Signal', 
-            'BB_Pct', 'Vol_Ratio', 'ROC', 
-            'SMA_Ratio', 'ATR_Pct', 'CCI', 
-            'Ret_1d', 'Ret_3d', 'Ret_5d', 'Ret_10d', 'Ret_20d',
-            'Sentiment', 'NewsVol'
-        ]
+        self.FEATURE_COLS = list(FEATURE_SETS["lstm"])
         
     def _load_resources(self):
         if self._loaded:
             return
 
         try:
-            # Load Model
-            self.model = StockLSTM(input_size=17) 
-            if os.path.exists(self.config.MODEL_PATH):
-                state = torch.load(self.config.MODEL_PATH, map_location=self.device)
-                self.model.load_state_dict(state)
-                self.model.to(self.device)
-                self.model.eval()
-            else:
-                logger.warning("Model weights not found.")
+            # Shared, load-once instances from the model registry.
+            # NumPy runtime: the exported weights, no torch import at all.
+            # Torch runtime: the compiled serving artifact wins when present; the eager checkpoint is the fallback.
+            for name in lstm_candidates(self.config.LSTM_RUNTIME):
+                self.model = model_registry.get(name)
+                if self.model is not None:
+                    break
+                if name == "lstm_numpy":
+                    logger.warning("NumPy LSTM weights unavailable; falling back to the torch runtime.")
+            if self.model is None:
                 return
+            self.device = getattr(self.model, "device", None) or next(self.model.parameters()).device
 
             # Load Scaler & Target Stats
-            scaler_path = "brain/saved_models/scaler.pkl"
-            if os.path.exists(scaler_path):
-                with open(scaler_path, 'rb') as f:
-                    data = pickle.load(f)
-                    if isinstance(data, dict):
-                        self.scaler = data['scaler']
-                        self.target_mean = data.get('mean', 0.0)
-                        self.target_std = data.get('std', 1.0)
-                    else:
-                        self.scaler = data
+            bundle = model_registry.get("scaler")
+            if bundle is not None:
+                self.scaler = bundle['scaler']
+                self.target_mean = bundle['mean']
+                self.target_std = bundle['std']
                         
                 logger.info(f"Neural Resources Loaded. Target Mean: {self.target_mean:.4f}, Std: {self.target_std:.4f}")
+                self.model_version = self._model_version()
+                if self.cache is None:
+                    self.cache = get_prediction_cache()
+                if self.cache is not None:
+                    self.cache.prune(self.CACHE_NAME, self.model_version)
                 self._loaded = True
-            else:
-                logger.warning("Scaler not found. Predictions will be inaccurate.")
 
         except Exception as e:
             logger.error(f"Resource load failed: {e}")
 
-    def prepare_data(self, data: List[StockDataPoint], sequence_length=60):
+    def _model_version(self) -> str:
+        """Content version of what is serving: runtime, weights and scaler."""
+        source = getattr(self.model, "source_sha256", None)
+        if source is None and os.path.exists(self.config.MODEL_PATH):
+            source = artifact_sha256(self.config.MODEL_PATH)
+        return content_version(type(self.model).__name__, getattr(self.model, "mode", ""), source,
+                               getattr(self.scaler, "mean", ""), getattr(self.scaler, "scale", ""),
+                               self.target_mean, self.target_std)
+
+    def prepare_data(self, data: PriceHistory, sequence_length=SEQUENCE_LENGTH,
+                     features: Optional[pd.DataFrame] = None):
+        """
+        Builds the scaled (1, sequence_length, n_features) input window.
+        `features` is the shared frame from build_feature_frame; if not given, only the
+        FEATURE_COLS of the last sequence_length rows are built.
+        """
         if not data or len(data) < sequence_length + 30: 
             return None
             
-        records = [
-            {'Open': d.open, 'High': d.high, 'Low': d.low, 'Close': d.close, 'Volume': d.volume, 'datetime': d.datetime} 
-            for d in data
-        ]
-        df = pd.DataFrame(records)
-        
-        df = add_technical_indicators(df)
-        df['Sentiment'] = 0.0 
-        df['NewsVol'] = 0.0
-        df = df.replace([np.inf, -np.inf], np.nan).dropna()
+        if features is None:
+            features = build_feature_frame(data, columns=self.FEATURE_COLS, rows=sequence_length)
+        df = select_features(features, self.FEATURE_COLS)
+        if df is None:
+            return None
         
         try:
             # Use the PRE-TRAINED scaler, do not fit a new one!
@@ -90,55 +103,101 @@ class PredictionEngine:
                 logger.error("Scaler not loaded.")
                 return None
                 
-            features = df[self.FEATURE_COLS].values
-            scaled_data = self.scaler.transform(features)
-            
-            if len(scaled_data) < sequence_length: return None
-            return np.array([scaled_data[-sequence_length:]])
+            # Row-wise transform, so only the window itself is normalized
+            if len(df) < sequence_length: return None
+            return self.scaler.transform(df.values[-sequence_length:])[None]
         except Exception as e:
             logger.error(f"Scaling error: {e}")
             return None
 
-    def predict(self, data: List[StockDataPoint]) -> Tuple[str, float]:
+    def predict(self, data: PriceHistory,
+                features: Optional[pd.DataFrame] = None,
+                ticker: Optional[str] = None) -> Tuple[str, float]:
         """
+        Args:
+            data: Price history (oldest first).
+            features: Optional shared feature frame (see brain.core.features).
+            ticker: Enables the prediction cache.
         Returns:
             signal (str): "Bullish", "Bearish", or "Neutral"
             confidence (float): Probability (0.0 to 1.0)
         """
+        return self.predict_batch([data], features=[features], tickers=[ticker] if ticker else None)[0]
+
+    def predict_batch(self, histories: List[PriceHistory],
+                      features: Optional[List[Optional[pd.DataFrame]]] = None,
+                      tickers: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Batched predict(): the windows of all histories with enough data are stacked
+        into one (N, 60, n_features) tensor and scored in a single forward pass.
+        Histories with a cached prediction are skipped.
+        Returns one (signal, confidence) per history, in input order.
+        """
         self._load_resources()
         
         if not self._loaded:
-            return "Neutral (Model Off)", 0.0
+            return [("Neutral (Model Off)", 0.0)] * len(histories)
             
-        try:
-            input_tensor_np = self.prepare_data(data)
+        if features is None:
+            features = [None] * len(histories)
             
-            if input_tensor_np is None:
-                return "Neutral (Need More Data)", 0.0
+        results = [("Neutral (Need More Data)", 0.0)] * len(histories)
+        try:
+            keys, cached = lookup(self.cache, self.CACHE_NAME, self.model_version, histories, tickers)
+            windows, positions = [], []
+            for i, (data, frame) in enumerate(zip(histories, features)):
+                if keys[i] in cached:
+                    results[i] = cached[keys[i]]
+                    continue
+                try:
+                    input_np = self.prepare_data(data, features=frame)
+                except Exception as e:
+                    # One unreadable history only costs its own prediction
+                    logger.error(f"Inference Error: {e}")
+                    results[i] = ("Neutral (Error)", 0.0)
+                    continue
+                if input_np is not None:
+                    windows.append(input_np[0])
+                    positions.append(i)
+                    
+            if not windows:
+                return results
                 
-            input_tensor = torch.FloatTensor(input_tensor_np).to(self.device)
+            # CLASSIFICATION OUTPUT (Logits for 3 classes)
+            logits = self._forward(np.stack(windows).astype(np.float32))
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True) # [Sell, Hold, Buy]
             
-            with torch.no_grad():
-                # CLASSIFICATION OUTPUT (Logits for 3 classes)
-                logits = self.model(input_tensor)
-                probs = torch.softmax(logits, dim=1) # [Sell, Hold, Buy]
-                
-                # Get the class with highest probability
-                confidence, predicted_class = torch.max(probs, 1)
-                class_idx = predicted_class.item()
-                conf_val = confidence.item()
+            # Get the class with highest probability
+            predicted_class = probs.argmax(axis=1)
+            confidence = probs.max(axis=1)
                 
-            # Map Class Index to Signal
-            # 0 = Sell, 1 = Hold, 2 = Buy
-            if class_idx == 2:
-                signal = "Bullish"
-            elif class_idx == 0:
-                signal = "Bearish"
-            else:
-                signal = "Neutral"
+            for i, class_idx, conf_val in zip(positions, predicted_class.tolist(), confidence.tolist()):
+                results[i] = (self._class_to_signal(class_idx), conf_val)
             
-            return signal, conf_val
+            if self.cache is not None:
+                self.cache.put_many({keys[i]: results[i] for i in positions if keys[i] is not None})
+            return results
             
         except Exception as e:
             logger.error(f"Inference Error: {e}")
-            return "Neutral (Error)", 0.0
+            return [("Neutral (Error)", 0.0)] * len(histories)
+
+    def _forward(self, windows: np.ndarray) -> np.ndarray:
+        """(N, 60, n_features) float32 -> (N, 3) logits on whichever runtime is loaded."""
+        if isinstance(self.model, NumpyStockLSTM):
+            return self.model(windows)
+        import torch
+        with torch.no_grad():
+            return self.model(torch.from_numpy(windows).to(self.device)).cpu().numpy()
+
+    @staticmethod
+    def _class_to_signal(class_idx: int) -> str:
+        # Map Class Index to Signal
+        # 0 = Sell, 1 = Hold, 2 = Buy
+        if class_idx == 2:
+            return "Bullish"
+        elif class_idx == 0:
+            return "Bearish"
+        return "Neutral"
@@ -0,0 +1,147 @@
+"""
+Persistent cache for model predictions.
+
+Daily bars change once per session, so a model's output for a ticker is fixed
+until a new bar arrives or the model is redeployed. Entries are keyed by
+(model name, model version, ticker, last bar timestamp, digest of the price
+window). Model versions are content hashes of the loaded artifacts, so a new
+model file changes every key; stale versions are dropped from disk when a
+model opens the cache, and a ticker's entries for older last bars when a newer
+one is written. The disk table is also capped at PREDICTION_CACHE_MAX_ROWS
+(oldest first), which bounds revised windows of the same bar. Stored in a
+brain.core.sqlite_store.SqliteLRUStore (in-memory LRU over SQLite).
+"""
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from brain.core.config import BrainConfig
+from brain.core.sqlite_store import SqliteLRUStore
+from brain.core.types import PriceHistory, as_price_series
+
+logger = logging.getLogger(__name__)
+
+Prediction = Tuple[str, float]
+
+
+def window_digest(data: PriceHistory) -> str:
+    """Digest of every bar (timestamp + OHLCV) the models see; the same for a list and its PriceSeries."""
+    series = as_price_series(data)
+    h = hashlib.blake2b(digest_size=16)
+    for name in series.__slots__:
+        column = getattr(series, name)
+        h.update((column.view(np.int64) if column.dtype.kind == "M" else column).data)
+    return h.hexdigest()
+
+
+def content_version(*parts) -> str:
+    """Short version tag from artifact bytes / arrays / strings."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part).tobytes()
+        elif not isinstance(part, (bytes, bytearray)):
+            part = str(part).encode("utf-8")
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def key_parts(key: str) -> Tuple[str, str, str, str]:
+    """(model, version, ticker, last bar) of a PredictionCache key."""
+    model, version, ticker, last_bar = key.split("|", 4)[:4]
+    return model, version, ticker, last_bar
+
+
+class PredictionCache(SqliteLRUStore):
+    def __init__(self, path: str, memory_entries: int = 2048, max_rows: Optional[int] = None):
+        """
+        Args:
+            path: SQLite file (created on first use).
+            memory_entries: Capacity of the in-memory LRU layer.
+            max_rows: Cap on the disk rows (default BrainConfig.PREDICTION_CACHE_MAX_ROWS).
+        """
+        super().__init__(
+            path, "predictions", {"signal": "TEXT NOT NULL", "value": "REAL NOT NULL"},
+            key_columns={"model": "TEXT NOT NULL", "version": "TEXT NOT NULL", "ticker": "TEXT NOT NULL",
+                         "last_bar": "TEXT NOT NULL"},
+            key_parts=key_parts, indexes=[("model", "ticker", "last_bar")],
+            memory_entries=memory_entries, max_rows=max_rows or BrainConfig.PREDICTION_CACHE_MAX_ROWS,
+            name="predictions",
+        )
+        self._pruned = set()
+        self._counters["pruned"] = 0
+
+    @staticmethod
+    def key(model: str, version: str, ticker: str, data: PriceHistory) -> str:
+        series = as_price_series(data)
+        last_bar = str(series.datetime[-1].astype("datetime64[s]")) if len(series) else ""
+        return f"{model}|{version}|{ticker.upper()}|{last_bar}|{window_digest(series)}"
+
+    def _count_pruned(self, removed: int) -> None:
+        with self._lock:
+            self._counters["pruned"] += removed
+
+    def prune(self, model: str, version: str) -> None:
+        """Drops the model's entries from other versions (once per model/version per process)."""
+        with self._lock:
+            if (model, version) in self._pruned:
+                return
+            self._pruned.add((model, version))
+        removed = self.delete_where(
+            "model = ? AND version != ?", (model, version),
+            lambda k: k.startswith(f"{model}|") and not k.startswith(f"{model}|{version}|"))
+        if removed:
+            self._count_pruned(removed)
+            logger.info(f"Prediction cache: dropped {removed} '{model}' entries from older model versions")
+
+    def put_many(self, predictions: Dict[str, Prediction]) -> None:
+        """
+        Stores the predictions and drops each (model, ticker)'s entries for older last
+        bars: once a new bar is in, predictions for superseded windows are never asked for.
+        """
+        super().put_many({key: (signal, float(value)) for key, (signal, value) in predictions.items()})
+        newest: Dict[Tuple[str, str], str] = {}
+        for key in predictions:
+            model, _, ticker, last_bar = key_parts(key)
+            newest[model, ticker] = max(newest.get((model, ticker), ""), last_bar)
+        for (model, ticker), last_bar in newest.items():
+            removed = self.delete_where(
+                "model = ? AND ticker = ? AND last_bar < ?", (model, ticker, last_bar),
+                lambda k: key_parts(k)[0::2] == (model, ticker) and key_parts(k)[3] < last_bar)
+            if removed:
+                self._count_pruned(removed)
+
+
+_default_cache: Optional[PredictionCache] = None
+_default_lock = threading.Lock()
+
+
+def get_prediction_cache() -> Optional[PredictionCache]:
+    """Process-wide cache shared by the LSTM and XGBoost predictors (None when PREDICTION_CACHE=false)."""
+    global _default_cache
+    if not BrainConfig.PREDICTION_CACHE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PredictionCache(BrainConfig.PREDICTION_CACHE_PATH,
+                                             memory_entries=BrainConfig.PREDICTION_CACHE_MEMORY_ENTRIES)
+        return _default_cache
+
+
+def lookup(cache: Optional[PredictionCache], model: str, version: Optional[str],
+           histories: List[PriceHistory],
+           tickers: Optional[List[Optional[str]]]) -> Tuple[List[Optional[str]], Dict[str, Prediction]]:
+    """
+    Per-history cache keys (None where the history cannot be cached: no cache,
+    unknown model version, no ticker or no bars) and the cached predictions found.
+    """
+    if cache is None or version is None or not tickers:
+        return [None] * len(histories), {}
+    keys = [cache.key(model, version, ticker, data) if ticker and len(data) else None
+            for ticker, data in zip(tickers, histories)]
+    wanted = [k for k in keys if k is not None]
+    return keys, cache.get_many(wanted) if wanted else {}
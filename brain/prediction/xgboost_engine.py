@@ -1,108 +1,256 @@
 import pandas as pd
 import numpy as np
-import xgboost as xgb
-import os
 import logging
-from typing import List, Tuple
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Optional, Tuple
 from brain.core.config import BrainConfig
-from brain.core.types import StockDataPoint
-from brain.core.indicators import add_technical_indicators
-from sklearn.preprocessing import StandardScaler
+from brain.core.types import PriceHistory, PriceSeries
+from brain.core.features import select_features
+from brain.core.indicators import FEATURE_SETS, compute_indicators
+from brain.core.registry import model_registry
+from brain.core.streaming import RunningMoments
+from brain.prediction.prediction_cache import PredictionCache, content_version, get_prediction_cache, lookup
 
 logger = logging.getLogger(__name__)
 
+
+def history_arrays(data: PriceHistory) -> Tuple[np.ndarray, np.ndarray]:
+    """(datetime64[ns] timestamps, float64 closes), oldest first, like history_to_frame."""
+    if isinstance(data, PriceSeries):
+        return data.datetime, data.close
+    stamps = [d.datetime for d in data]
+    try:
+        timestamps = np.array(stamps, dtype="datetime64[ns]")
+    except (ValueError, TypeError):
+        timestamps = pd.to_datetime(stamps).to_numpy(dtype="datetime64[ns]")
+    closes = np.fromiter((d.close for d in data), dtype=np.float64, count=len(data))
+    if len(timestamps) > 1 and (np.diff(timestamps) < np.timedelta64(0)).any():
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, closes = timestamps[order], closes[order]
+    return timestamps, closes
+
+
+def feature_matrix(close: np.ndarray) -> np.ndarray:
+    """
+    The XGBoost FEATURE_COLS, in order, computed from the indicator registry
+    (same values as add_technical_indicators, without the other indicators or a DataFrame).
+    """
+    _, values = compute_indicators(close, "xgboost")
+    zeros = np.zeros(len(close))  # Sentiment / NewsVol placeholders, as in build_feature_frame
+    return np.column_stack([values.get(name, zeros) for name in FEATURE_SETS["xgboost"]])
+
+
+class _ScaleState:
+    """Running moments of one ticker's model-ready rows, plus the rows they cover."""
+    def __init__(self, timestamps: np.ndarray, rows: np.ndarray):
+        self.timestamps = timestamps
+        self.rows = rows
+        self.moments = RunningMoments.of(rows)
+        self._removed_since_reseed = 0
+
+    def advance(self, timestamps: np.ndarray, rows: np.ndarray) -> bool:
+        """
+        Moves the window to (timestamps, rows) by removing the rows that fell off the
+        front and adding the new ones. False if the new window does not continue this
+        one (moved backwards, gaps, or revised/recomputed overlapping rows).
+        """
+        k = int(np.searchsorted(self.timestamps, timestamps[0]))
+        overlap = len(self.timestamps) - k
+        if overlap <= 0 or overlap > len(timestamps) or self.timestamps[k] != timestamps[0]:
+            return False
+        if not (np.array_equal(self.timestamps[k:], timestamps[:overlap])
+                and np.array_equal(self.rows[k:], rows[:overlap])):
+            return False
+
+        self.moments.remove(self.rows[:k])
+        self.moments.add(rows[overlap:])
+        self.timestamps, self.rows = timestamps, rows
+
+        # Re-derive from the rows once per full turnover so floating-point drift stays bounded
+        self._removed_since_reseed += k
+        if self._removed_since_reseed >= len(rows):
+            self.moments = RunningMoments.of(rows)
+            self._removed_since_reseed = 0
+        return True
+
+
 class XGBoostPredictor:
     """
     The 'Quant Analyst'.
     Uses a PRE-TRAINED XGBoost model to predict probability of significant price increase.
     INFERENCE ONLY.
+    Results for a ticker are cached per (last bar, price window, model version).
     """
-    def __init__(self):
+    MAX_TRACKED_TICKERS = 512
+    CACHE_NAME = "xgboost"
+
+    def __init__(self, model=None, cache: Optional[PredictionCache] = None):
+        """`model` / `cache` override the shared registry instance and prediction cache (tests, benchmarks)."""
         self.config = BrainConfig.get_instance()
         self.model = None
+        self._booster = None
         self._is_ready = False
-        
+        self.cache = cache
+        self.model_version = None
+
+        # Per-ticker running normalization state (see _moments)
+        self._states: "OrderedDict[str, _ScaleState]" = OrderedDict()
+        self._states_lock = Lock()
+
         # Exact feature order for Training and Inference consistency
         # Updated to Stationary Features
-        self.FEATURE_COLS = [
-            'Log_Ret', 'RSI', 'MACD', 'MACD_Signal', 
-            'BB_Pct', 'Vol_Ratio', 'ROC', 
-            'SMA_Ratio',
-            'Sentiment', 'NewsVol'
-        ]
-        
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) 
-        self.model_path = os.path.join(base_dir, "saved_models", "xgboost_model.json")
-        
-        self._load_model()
-        
-    def _load_model(self):
-        if os.path.exists(self.model_path):
-            try:
-                self.model = xgb.XGBClassifier()
-                self.model.load_model(self.model_path)
-                self._is_ready = True
-                logger.info(f"XGBoost Model loaded from {self.model_path}")
-            except Exception as e:
-                logger.error(f"Failed to load XGBoost model: {e}")
-        else:
-            logger.warning(f"XGBoost model file not found at {self.model_path}. Predictor disabled.")
-
-    def predict_probability(self, data: List[StockDataPoint]) -> Tuple[str, float]:
+        self.FEATURE_COLS = list(FEATURE_SETS["xgboost"])
+
+        self.model_path = self.config.XGB_MODEL_PATH
+
+        self._load_model(model)
+
+    def _load_model(self, model=None):
+        # Shared, load-once instance from the model registry
+        self.model = model if model is not None else model_registry.get("xgboost")
+        self._is_ready = self.model is not None
+        # Scored through the raw booster: inplace_predict on the ndarray, no DMatrix per call
+        self._booster = self.model.get_booster() if self._is_ready else None
+        if self._is_ready:
+            # Content version of the trees and the feature set they are fed
+            self.model_version = content_version(bytes(self._booster.save_raw()), *self.FEATURE_COLS)
+            if self.cache is None:
+                self.cache = get_prediction_cache()
+            if self.cache is not None:
+                self.cache.prune(self.CACHE_NAME, self.model_version)
+
+    def predict_probability(self, data: PriceHistory,
+                            features: Optional[pd.DataFrame] = None,
+                            ticker: Optional[str] = None) -> Tuple[str, float]:
         """
         Returns (Signal, Probability).
         Signal: "Bullish" | "Bearish" | "Neutral"
         Probability: 0.0 to 1.0 (Probability of UP move)
+        `features` is the shared frame from build_feature_frame; without it only the
+        model's columns are computed. `ticker` enables the incremental normalization.
+        """
+        return self.predict_probability_batch([data], features=[features],
+                                              tickers=[ticker] if ticker else None)[0]
+
+    def predict_probability_batch(self, histories: List[PriceHistory],
+                                  features: Optional[List[Optional[pd.DataFrame]]] = None,
+                                  tickers: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Batched predict_probability(): each history is normalized over its own window,
+        then the current-state rows are stacked into one (N, n_features) matrix
+        and scored with a single booster call. Histories with a cached prediction
+        are skipped. Results are in input order.
         """
         if not self._is_ready or not self.model:
-            return "Neutral (Model Missing)", 0.5
-            
-        if not data or len(data) < 50:
-            return "Neutral (Low Data)", 0.5
-
-        # 1. Convert to DataFrame
-        records = [{'close': d.close, 'open': d.open, 'high': d.high, 'low': d.low, 'volume': d.volume} for d in data]
-        df = pd.DataFrame(records)
-        
-        # 2. Feature Engineering (Centralized)
-        df = df.rename(columns={'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'})
-        df = add_technical_indicators(df)
-        
-        # Fill missing features
-        df['Sentiment'] = 0.0
-        df['NewsVol'] = 0.0
-        
-        # Drop NaNs
-        df = df.replace([np.inf, -np.inf], np.nan).dropna()
-        
-        if df.empty:
-            return "Neutral", 0.5
-            
-        # 3. Dynamic Scaling (CRITICAL)
+            return [("Neutral (Model Missing)", 0.5)] * len(histories)
+
+        if features is None:
+            features = [None] * len(histories)
+        if tickers is None:
+            tickers = [None] * len(histories)
+
+        keys, cached = lookup(self.cache, self.CACHE_NAME, self.model_version, histories, tickers)
+        results = []
+        rows, positions = [], []
+        for i, (data, frame, ticker) in enumerate(zip(histories, features, tickers)):
+            if keys[i] in cached:
+                results.append(cached[keys[i]])
+                continue
+            row, fallback = self._prepare_row(data, frame, ticker)
+            results.append(fallback)
+            if row is not None:
+                rows.append(row)
+                positions.append(i)
+
+        if not rows:
+            return results
+
         try:
-            scaler = StandardScaler()
-            # Fit on the entire window (dynamic scaling)
-            features = df[self.FEATURE_COLS].values
-            scaled_features = scaler.fit_transform(features)
-            
-            # Select the LAST row (current state)
-            last_row = scaled_features[-1].reshape(1, -1)
-            
             # 4. Predict
-            # predict_proba returns [[prob_0, prob_1]]
-            probs = self.model.predict_proba(last_row)[0]
-            prob_up = float(probs[1])
-            
-            # 5. Threshold Logic (0.6 / 0.4)
-            if prob_up > 0.6:
-                signal = "Bullish"
-            elif prob_up < 0.4:
-                signal = "Bearish"
-            else:
-                signal = "Neutral"
-                
-            return signal, round(prob_up, 4)
-            
+            # Binary models return P(class 1) per row; multi-class ones a row of class probabilities
+            probs = self._booster.inplace_predict(np.vstack(rows))
+            prob_up = probs[:, 1] if probs.ndim == 2 else probs
+
+            for i, p in zip(positions, prob_up.tolist()):
+                results[i] = (self._probability_to_signal(p), round(p, 4))
+
+            if self.cache is not None:
+                self.cache.put_many({keys[i]: results[i] for i in positions if keys[i] is not None})
+            return results
+
+        except Exception as e:
+            logger.error(f"XGB Inference Error: {e}")
+            for i in positions:
+                results[i] = ("Neutral (Error)", 0.5)
+            return results
+
+    def _feature_rows(self, data: PriceHistory,
+                      features: Optional[pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, rows) of the model-ready rows: finite in every FEATURE_COL."""
+        if features is not None:
+            df = select_features(features, self.FEATURE_COLS)
+            if df is None:
+                return np.empty(0, dtype="datetime64[ns]"), np.empty((0, len(self.FEATURE_COLS)))
+            return df.index.to_numpy(dtype="datetime64[ns]"), df.to_numpy(dtype=np.float64)
+
+        timestamps, closes = history_arrays(data)
+        rows = feature_matrix(closes)
+        valid = np.isfinite(rows).all(axis=1)
+        return timestamps[valid], rows[valid]
+
+    def _moments(self, ticker: Optional[str], timestamps: np.ndarray,
+                 rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (mean, std) of the window's rows. With a ticker, the previous window's running
+        moments are advanced by just the rows that left and arrived when the new
+        window continues it; otherwise they are computed over the window.
+        """
+        if ticker is None:
+            moments = RunningMoments.of(rows)
+            return moments.mean, moments.std()
+
+        key = ticker.upper()
+        with self._states_lock:
+            state = self._states.get(key)
+            if state is None or not state.advance(timestamps, rows):
+                state = _ScaleState(timestamps, rows)
+                self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.MAX_TRACKED_TICKERS:
+                self._states.popitem(last=False)
+            return state.moments.mean, state.moments.std()
+
+    def _prepare_row(self, data: PriceHistory,
+                     features: Optional[pd.DataFrame],
+                     ticker: Optional[str] = None) -> Tuple[Optional[np.ndarray], Tuple[str, float]]:
+        """
+        Returns (normalized current-state row, fallback result). The row is None when
+        the history cannot be scored; the fallback is then the final answer.
+        """
+        if not data or len(data) < 50:
+            return None, ("Neutral (Low Data)", 0.5)
+
+        try:
+            # 1-2. Feature Engineering (shared frame, or just the model's columns)
+            timestamps, rows = self._feature_rows(data, features)
+            if len(rows) == 0:
+                return None, ("Neutral", 0.5)
+
+            # 3. Dynamic Scaling (CRITICAL): z-score of the LAST row (current state)
+            # against the whole window, as a StandardScaler fitted on the window would
+            mean, std = self._moments(ticker, timestamps, rows)
+            return (rows[-1] - mean) / std, ("Neutral (Error)", 0.5)
+
         except Exception as e:
             logger.error(f"XGB Inference Error: {e}")
-            return "Neutral (Error)", 0.5
+            return None, ("Neutral (Error)", 0.5)
+
+    @staticmethod
+    def _probability_to_signal(prob_up: float) -> str:
+        # 5. Threshold Logic (0.6 / 0.4)
+        if prob_up > 0.6:
+            return "Bullish"
+        elif prob_up < 0.4:
+            return "Bearish"
+        return "Neutral"
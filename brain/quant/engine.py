@@ -5,6 +5,8 @@ Generates Composite Trading Scores (-100 to +100) using RSI, SMA, MACD, and Sent
 
 import pandas as pd
 import numpy as np
+from brain.core import kernels
+from brain.core.types import PriceSeries
 
 
 class QuantEngine:
@@ -20,7 +22,7 @@ class QuantEngine:
         Initialize the Quant Engine with raw price data.
         
         Args:
-            data: List of dictionaries containing OHLCV data.
+            data: List of dictionaries containing OHLCV data, or a PriceSeries.
                   Expected keys: 'datetime', 'open', 'high', 'low', 'close', 'volume'
         """
         self.raw_data = data
@@ -34,6 +36,9 @@ class QuantEngine:
         Returns:
             Processed DataFrame with datetime index and numeric columns.
         """
+        if isinstance(self.raw_data, PriceSeries):
+            self.df = self.raw_data.to_frame()
+            return self.df
         self.df = pd.DataFrame(self.raw_data)
         
         # Ensure numeric types for price columns
@@ -68,23 +73,11 @@ class QuantEngine:
         if self.df is None or len(self.df) < period + 1:
             return np.nan
         
-        # Calculate price changes
-        delta = self.df['close'].diff()
-        
-        # Separate gains and losses
-        gains = delta.where(delta > 0, 0.0)
-        losses = (-delta).where(delta < 0, 0.0)
-        
-        # Calculate exponential moving average of gains and losses
-        avg_gain = gains.ewm(span=period, min_periods=period, adjust=False).mean()
-        avg_loss = losses.ewm(span=period, min_periods=period, adjust=False).mean()
-        
-        # Calculate RS and RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        # EWM-smoothed gains/losses -> RS -> RSI (shared kernel)
+        rsi = kernels.rsi(self.df['close'].to_numpy(), period, method="ewm")
         
         # Return the most recent RSI value
-        return float(rsi.iloc[-1]) if not pd.isna(rsi.iloc[-1]) else np.nan
+        return float(rsi[-1]) if not pd.isna(rsi[-1]) else np.nan
     
     def calc_sma(self, period: int = 50) -> float:
         """
@@ -102,23 +95,20 @@ class QuantEngine:
         if self.df is None or len(self.df) < period:
             return np.nan
         
-        sma = self.df['close'].rolling(window=period).mean()
+        sma = kernels.rolling_mean(self.df['close'].to_numpy(), period)
         
-        return float(sma.iloc[-1]) if not pd.isna(sma.iloc[-1]) else np.nan
+        return float(sma[-1]) if not pd.isna(sma[-1]) else np.nan
     
     def calc_macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> dict:
         # ... (Existing MACD implementation)
         if self.df is None or len(self.df) < slow + signal:
             return {'macd_line': np.nan, 'signal_line': np.nan, 'histogram': np.nan}
-        ema_fast = self.df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = self.df['close'].ewm(span=slow, adjust=False).mean()
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        macd_line, signal_line = kernels.macd(self.df['close'].to_numpy(), fast, slow, signal)
         histogram = macd_line - signal_line
         return {
-            'macd_line': float(macd_line.iloc[-1]),
-            'signal_line': float(signal_line.iloc[-1]),
-            'histogram': float(histogram.iloc[-1])
+            'macd_line': float(macd_line[-1]),
+            'signal_line': float(signal_line[-1]),
+            'histogram': float(histogram[-1])
         }
 
     def calc_bollinger_bands(self, period: int = 20, std_dev: int = 2) -> dict:
@@ -126,15 +116,12 @@ class QuantEngine:
         if self.df is None or len(self.df) < period:
             return {'upper': np.nan, 'lower': np.nan, 'middle': np.nan}
         
-        middle_band = self.df['close'].rolling(window=period).mean()
-        std = self.df['close'].rolling(window=period).std()
-        upper_band = middle_band + (std * std_dev)
-        lower_band = middle_band - (std * std_dev)
+        upper_band, lower_band, middle_band, _ = kernels.bollinger_bands(self.df['close'].to_numpy(), period, std_dev)
         
         return {
-            'upper': float(upper_band.iloc[-1]),
-            'lower': float(lower_band.iloc[-1]),
-            'middle': float(middle_band.iloc[-1])
+            'upper': float(upper_band[-1]),
+            'lower': float(lower_band[-1]),
+            'middle': float(middle_band[-1])
         }
 
     def calculate_score(self, sentiment_score: float) -> dict:
@@ -1,55 +1,22 @@
 
-import torch
-from transformers import BertTokenizer, BertForSequenceClassification, pipeline
 import logging
+from brain.core.config import BrainConfig
+from brain.core.registry import model_registry
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Constants
-MODEL_NAME = "yiyanghkust/finbert-tone"
-
-# Singleton Storage
-_nlp_pipeline = None
+MODEL_NAME = BrainConfig.FINBERT_MODEL_NAME
 
 def get_pipeline():
     """
     Lazy loads the FinBERT pipeline.
     Returns None if loading fails.
+    The instance is the registry's, shared with SentimentEngine (one copy per process).
     """
-    global _nlp_pipeline
-    if _nlp_pipeline is None:
-        logger.info("Initializing FinBERT model (Lazy Load)...")
-        try:
-            tokenizer = BertTokenizer.from_pretrained(MODEL_NAME)
-            model = BertForSequenceClassification.from_pretrained(MODEL_NAME)
-            
-            # Auto-detect device: CUDA > MPS (Mac) > CPU
-            if torch.cuda.is_available():
-                device = 0 
-                logger.info(f"FinBERT loading on GPU: {torch.cuda.get_device_name(0)}")
-            elif torch.backends.mps.is_available():
-                device = "mps" 
-                logger.info("FinBERT loading on MPS (Apple Silicon)")
-            else:
-                device = -1
-                logger.info("FinBERT loading on CPU")
-
-            _nlp_pipeline = pipeline(
-                "sentiment-analysis", 
-                model=model, 
-                tokenizer=tokenizer, 
-                top_k=None, 
-                device=device
-            )
-            logger.info("FinBERT initialized successfully.")
-            
-        except Exception as e:
-            logger.critical(f"Failed to load FinBERT: {e}")
-            return None
-            
-    return _nlp_pipeline
+    return model_registry.get("finbert")
 
 def analyze_sentiment_batch(texts: list[str]) -> list[float]:
     """
@@ -3,6 +3,8 @@ import requests
 import re
 import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 # Use New Industry-Grade Engine
 from brain.analysis.sentiment import SentimentEngine
@@ -21,6 +23,8 @@ TRUSTED_SOURCES = [
 # Track dead keys in memory (Global state for the running process)
 _BAD_KEYS = set()
 
+GNEWS_PAGE_SIZE = 10 # Free Tier Limit
+
 def calculate_source_weight(url: str) -> float:
     """
     Returns a weight multiplier (1.0 to 1.5) based on domain authority.
@@ -82,13 +86,201 @@ def generate_mock_news(ticker: str) -> tuple[list, float]:
     avg_sentiment = 0.35
     return mock_articles, avg_sentiment
 
-def fetch_gnews(ticker: str, company_name: str = None) -> tuple[list, float]:
+class _KeyRing:
+    """
+    Thread-safe view of the active GNews keys for one fetch_gnews call.
+    Concurrent page requests share it, so a key that fails is skipped (and, if
+    exhausted, added to _BAD_KEYS) exactly once no matter how many pages saw it fail.
+    """
+
+    def __init__(self, keys: list):
+        self.keys = keys
+        self.idx = 0
+        self._lock = threading.Lock()
+
+    def current(self):
+        with self._lock:
+            return self.keys[self.idx] if self.idx < len(self.keys) else None
+
+    def fail(self, key: str, exhausted: bool = False):
+        with self._lock:
+            if exhausted:
+                _BAD_KEYS.add(key)
+            # Another page may already have rotated past this key
+            if self.idx < len(self.keys) and self.keys[self.idx] == key:
+                self.idx += 1
+
+    def exhausted(self) -> bool:
+        with self._lock:
+            return self.idx >= len(self.keys)
+
+
+def _fetch_page(ring: _KeyRing, search_query: str, page: int):
+    """One GNews search page, rotating keys on failure. Returns the JSON payload or None."""
+    while True:
+        api_key = ring.current()
+        if api_key is None:
+            return None
+        try:
+            # Explicit max=10 (GNEWS_PAGE_SIZE)
+            url = f"https://gnews.io/api/v4/search?q={search_query}&lang=en&sortby=publishedAt&token={api_key}&page={page}&max={GNEWS_PAGE_SIZE}"
+            
+            logger.info(f"Fetching GNews Page {page}...")
+            res = requests.get(url, timeout=10)
+            
+            if res.status_code == 200:
+                return res.json()
+            elif res.status_code in [403, 429]:
+                logger.warning(f"Key exhausted. Switching.")
+                ring.fail(api_key, exhausted=True)
+            else:
+                logger.error(f"GNews Error {res.status_code}: {res.text}")
+                ring.fail(api_key)
+        except Exception as e:
+            logger.error(f"Network Error: {e}")
+            ring.fail(api_key)
+
+
+def _to_article(art: dict, score: float, now: datetime) -> dict:
+    # Weighting
+    source_url = art.get('url', '')
+    source_weight = calculate_source_weight(source_url)
+    
+    # Recency
+    try:
+        pub_date = art.get('publishedAt')
+        if pub_date:
+            dt = datetime.strptime(pub_date, "%Y-%m-%dT%H:%M:%SZ")
+            hours_old = (now - dt).total_seconds() / 3600
+            recency_weight = max(0.5, 1.0 - (hours_old / 72.0))
+            pub_str = dt.strftime('%Y-%m-%d')
+        else:
+            recency_weight = 1.0
+            pub_str = now.strftime('%Y-%m-%d')
+    except:
+        recency_weight = 1.0
+        pub_str = now.strftime('%Y-%m-%d')
+
+    final_weight = source_weight * recency_weight
+
+    return {
+        "title": art.get('title', ''),
+        "link": source_url,
+        "image": art.get('image', ''),
+        "publisher": art.get('source', {}).get('name', 'GNews'),
+        "published": pub_str,
+        "sentiment": score, # Already rounded/damped by engine
+        "debug": {
+            "source": "GNews",
+            "weight": round(final_weight, 2),
+            "raw_score": score
+        }
+    }
+
+
+def _score_candidates(candidates: list, valid_articles: list, target_count: int, now: datetime):
+    """Scores candidates in one FinBERT batch and appends the valid ones (up to target_count)."""
+    if not candidates:
+        return
+    texts = [f"{c.get('title', '')}. {c.get('description', '') or ''}" for c in candidates]
+    scores = SentimentEngine.analyze_batch(texts)
+    
+    for art, score in zip(candidates, scores):
+        if len(valid_articles) >= target_count:
+            break
+        # Filter: Reject weak signals (using the new damped score)
+        # Damped score of 0.05 is still very weak.
+        if abs(score) < 0.05:
+            continue
+        valid_articles.append(_to_article(art, score, now))
+
+
+def _dedupe(articles: list, seen_titles: set) -> list:
+    candidates = []
+    for art in articles:
+        title = art.get('title', '')
+        if not title or title in seen_titles:
+            continue
+        candidates.append(art)
+        seen_titles.add(title)
+    return candidates
+
+
+def _collect_sequential(ring, search_query, max_pages, target_count, valid_articles, seen_titles, now):
+    """Original mode: one page at a time, one FinBERT batch per page."""
+    for page in range(1, max_pages + 1):
+        if len(valid_articles) >= target_count:
+            break
+            
+        response_data = _fetch_page(ring, search_query, page)
+        if not response_data or "articles" not in response_data:
+            break
+            
+        articles = response_data.get("articles", [])
+        if not articles:
+            logger.info("No more articles found.")
+            break
+        
+        _score_candidates(_dedupe(articles, seen_titles), valid_articles, target_count, now)
+
+
+def _collect_concurrent(ring, search_query, max_pages, target_count, valid_articles, seen_titles, now, max_in_flight):
+    """
+    Concurrent mode: pages are requested in order with at most `max_in_flight` outstanding.
+    New pages stop being scheduled once there are enough unique candidates to likely reach
+    target_count (GNEWS_OVERSAMPLE x target) or the results run out; everything collected
+    is then deduplicated (in page order) and scored in one FinBERT batch. Only if that
+    still falls short are further pages fetched.
+    """
+    oversample = float(os.getenv("GNEWS_OVERSAMPLE", 2.0))
+    next_page = 1
+    exhausted = False
+    
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="gnews") as pool:
+        while len(valid_articles) < target_count and not exhausted and next_page <= max_pages:
+            pages = {}
+            in_flight = {}
+            unique = 0
+            wave_seen = set(seen_titles)
+            needed = (target_count - len(valid_articles)) * oversample
+            
+            while (in_flight or (unique < needed and not exhausted and next_page <= max_pages)):
+                # Keep the pipe full while more candidates are still needed (counting full pages already in flight)
+                while len(in_flight) < max_in_flight and unique + len(in_flight) * GNEWS_PAGE_SIZE < needed \
+                        and not exhausted and next_page <= max_pages:
+                    in_flight[pool.submit(_fetch_page, ring, search_query, next_page)] = next_page
+                    next_page += 1
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = in_flight.pop(future)
+                    data = future.result()
+                    articles = (data or {}).get("articles") or []
+                    if not articles:
+                        # No data (keys gone / error) or past the last page
+                        exhausted = True
+                        if data is not None:
+                            logger.info("No more articles found.")
+                    elif len(articles) < GNEWS_PAGE_SIZE:
+                        # Short page: it was the last one, don't spend quota on the next
+                        exhausted = True
+                    pages[page] = articles
+                    unique += len(_dedupe(articles, wave_seen))
+            
+            # Dedupe in page order so results match the sequential mode's ordering
+            candidates = []
+            for page in sorted(pages):
+                candidates.extend(_dedupe(pages[page], seen_titles))
+            _score_candidates(candidates, valid_articles, target_count, now)
+
+
+def fetch_gnews(ticker: str, company_name: str = None, concurrent: bool = None) -> tuple[list, float]:
     """
     Fetches news from GNews API with strict credit conservation.
     Uses new SentimentEngine.
+    concurrent: request pages in parallel (default: $GNEWS_CONCURRENT, on), with at most
+    $GNEWS_MAX_IN_FLIGHT pages outstanding, scoring the collected articles in one batch.
     """
-    global _BAD_KEYS
-    
     keys = [os.getenv("GNEWS_API_KEY1"), os.getenv("GNEWS_API_KEY2")]
     active_keys = [k for k in keys if k and k not in _BAD_KEYS]
     
@@ -113,114 +305,20 @@ def fetch_gnews(ticker: str, company_name: str = None) -> tuple[list, float]:
     target_count = 20
     max_pages = 5 # Increased to 5 to ensure 20 valid articles after strict filtering
     
-    current_key_idx = 0
+    ring = _KeyRing(active_keys)
+    if concurrent is None:
+        concurrent = os.getenv("GNEWS_CONCURRENT", "true").lower() == "true"
     
-    for page in range(1, max_pages + 1):
-        if len(valid_articles) >= target_count:
-            break
-            
-        response_data = None
-        
-        # Retry loop for keys
-        while current_key_idx < len(active_keys):
-            api_key = active_keys[current_key_idx]
-            try:
-                # Explicit max=10 (Free Tier Limit)
-                url = f"https://gnews.io/api/v4/search?q={search_query}&lang=en&sortby=publishedAt&token={api_key}&page={page}&max=10"
-                
-                logger.info(f"Fetching GNews Page {page}...")
-                res = requests.get(url, timeout=10)
-                
-                if res.status_code == 200:
-                    response_data = res.json()
-                    break 
-                elif res.status_code in [403, 429]:
-                    logger.warning(f"Key exhausted. Switching.")
-                    _BAD_KEYS.add(api_key)
-                    current_key_idx += 1 
-                else:
-                    logger.error(f"GNews Error {res.status_code}: {res.text}")
-                    current_key_idx += 1 
-            except Exception as e:
-                logger.error(f"Network Error: {e}")
-                current_key_idx += 1
-        
-        if not response_data or "articles" not in response_data:
-            break
-            
-        articles = response_data.get("articles", [])
-        if not articles:
-            logger.info("No more articles found.")
-            break
-            
-        # Process Batch
-        # We process title+description.
-        # To optimize, we could batch analyze, but the loop logic filters duplicates first.
-        # Let's collect texts to analyze in batch for this page.
-        
-        candidates = []
-        for art in articles:
-            title = art.get('title', '')
-            if not title or title in seen_titles:
-                continue
-            candidates.append(art)
-            seen_titles.add(title)
-            
-        if not candidates:
-            continue
-            
-        # Batch Analysis
-        texts = [f"{c.get('title', '')}. {c.get('description', '') or ''}" for c in candidates]
-        scores = SentimentEngine.analyze_batch(texts)
-        
-        for art, score in zip(candidates, scores):
-            if len(valid_articles) >= target_count:
-                break
-                
-            # Filter: Reject weak signals (using the new damped score)
-            # Damped score of 0.05 is still very weak.
-            if abs(score) < 0.05:
-                continue
-                
-            # Weighting
-            source_url = art.get('url', '')
-            source_weight = calculate_source_weight(source_url)
-            
-            # Recency
-            try:
-                pub_date = art.get('publishedAt')
-                if pub_date:
-                    dt = datetime.strptime(pub_date, "%Y-%m-%dT%H:%M:%SZ")
-                    hours_old = (now - dt).total_seconds() / 3600
-                    recency_weight = max(0.5, 1.0 - (hours_old / 72.0))
-                    pub_str = dt.strftime('%Y-%m-%d')
-                else:
-                    recency_weight = 1.0
-                    pub_str = now.strftime('%Y-%m-%d')
-            except:
-                recency_weight = 1.0
-                pub_str = now.strftime('%Y-%m-%d')
-
-            final_weight = source_weight * recency_weight
-
-            valid_articles.append({
-                "title": art.get('title', ''),
-                "link": source_url,
-                "image": art.get('image', ''),
-                "publisher": art.get('source', {}).get('name', 'GNews'),
-                "published": pub_str,
-                "sentiment": score, # Already rounded/damped by engine
-                "debug": {
-                    "source": "GNews",
-                    "weight": round(final_weight, 2),
-                    "raw_score": score
-                }
-            })
+    if concurrent:
+        max_in_flight = max(1, int(os.getenv("GNEWS_MAX_IN_FLIGHT", 3)))
+        _collect_concurrent(ring, search_query, max_pages, target_count, valid_articles, seen_titles, now, max_in_flight)
+    else:
+        _collect_sequential(ring, search_query, max_pages, target_count, valid_articles, seen_titles, now)
 
     # Final Aggregation
     if not valid_articles:
         # Only fallback to mock if we ran out of keys or had errors
-        if not active_keys or current_key_idx >= len(active_keys):
+        if ring.exhausted():
             return generate_mock_news(ticker)
         
         # If API succeeded but just found no news (e.g. obscure ticker), return empty
@@ -240,4 +338,4 @@ def fetch_gnews(ticker: str, company_name: str = None) -> tuple[list, float]:
     final_sentiment = total_score / total_weight if total_weight > 0 else 0.0
     
     logger.info(f"Final: {len(valid_articles)} articles, Sentiment: {final_sentiment:.4f}")
-    return valid_articles, final_sentiment
\ No newline at end of file
+    return valid_articles, final_sentiment
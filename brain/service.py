@@ -1,50 +1,216 @@
-from typing import List, Dict, Any
-from brain.core.types import AnalysisResult, StockDataPoint, Article, MarketSignal
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import List, Dict, Any, Optional, Tuple, Union
+from brain.core.types import AnalysisResult, Article, MarketSignal, PriceHistory, PriceSeries, as_price_series
 from brain.core.config import BrainConfig
-from brain.core.indicators import add_technical_indicators
+from brain.core.features import build_feature_frame
+from brain.core.indicators import FEATURE_SETS
+from brain.core.stage_graph import Stage, StageGraph
+from brain.core.streaming import StreamingIndicatorEngine
 from brain.prediction.engine import PredictionEngine
 from brain.prediction.xgboost_engine import XGBoostPredictor
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# The shared feature frame holds only what its readers need: the technical-scoring
+# columns and the LSTM features, for the last LSTM window of rows.
+FRAME_COLUMNS = tuple(dict.fromkeys(FEATURE_SETS["technical"] + FEATURE_SETS["lstm"]))
+FRAME_ROWS = PredictionEngine.SEQUENCE_LENGTH
+
 class BrainService:
     """
     The Central Nervous System.
     Orchestrates Technical Analysis, Sentiment Aggregation, Neural Prediction, and XGBoost Analysis.
+    Each analysis is a stage graph: features -> (technical | lstm) -> ensemble, with xgboost
+    alongside (it normalizes over the whole history, so it builds its own columns from the
+    full window). The three model stages run concurrently on a shared pool.
     """
+    _stage_pool: Optional[ThreadPoolExecutor] = None
+    _indicator_streams: Optional[StreamingIndicatorEngine] = None
+    _lock = Lock()
+
     def __init__(self):
         self.config = BrainConfig.get_instance()
         self.lstm_predictor = PredictionEngine()
         self.xgb_predictor = XGBoostPredictor()
+
+    @classmethod
+    def get_stage_pool(cls) -> ThreadPoolExecutor:
+        """Process-wide pool for the concurrent stages of every analysis."""
+        if cls._stage_pool is None:
+            with cls._lock:
+                if cls._stage_pool is None:
+                    cls._stage_pool = ThreadPoolExecutor(max_workers=BrainConfig.BRAIN_STAGE_WORKERS,
+                                                         thread_name_prefix="brain-stage")
+        return cls._stage_pool
+
+    @classmethod
+    def get_indicator_streams(cls) -> Optional[StreamingIndicatorEngine]:
+        """Process-wide per-ticker indicator state (None when STREAMING_INDICATORS=false)."""
+        if not BrainConfig.STREAMING_INDICATORS:
+            return None
+        if cls._indicator_streams is None:
+            with cls._lock:
+                if cls._indicator_streams is None:
+                    cls._indicator_streams = StreamingIndicatorEngine(
+                        keep_rows=FRAME_ROWS, max_tickers=BrainConfig.STREAMING_INDICATORS_MAX_TICKERS)
+        return cls._indicator_streams
+
+    def _feature_frame(self, ticker: str, history_data: PriceSeries) -> pd.DataFrame:
+        """The shared frame; incremental per ticker when only new bars arrived since the last analysis."""
+        streams = self.get_indicator_streams()
+        if streams is None:
+            return build_feature_frame(history_data, columns=FRAME_COLUMNS, rows=FRAME_ROWS)
+        return streams.frame(ticker, history_data, FRAME_ROWS)
+
+    def _run_graph(self, features, technical, lstm, xgboost, ensemble, neutral_technical,
+                   lstm_fallback, xgb_fallback):
+        """
+        Runs the analysis graph. `features` and `ensemble` run in the calling thread and
+        propagate errors; the model stages degrade to their fallbacks on error or timeout.
+        Returns (ensemble result, per-stage report).
+        """
+        timeout = self.config.BRAIN_STAGE_TIMEOUT_SECONDS
+        graph = StageGraph([
+            Stage("features", features, inline=True),
+            Stage("technical", technical, deps=["features"], fallback=lambda _: neutral_technical(), timeout=timeout),
+            Stage("lstm", lstm, deps=["features"], fallback=lambda _: lstm_fallback, timeout=timeout),
+            Stage("xgboost", xgboost, fallback=lambda: xgb_fallback, timeout=timeout),
+            Stage("ensemble", ensemble, deps=["technical", "lstm", "xgboost"], inline=True),
+        ])
+        results, report = graph.run(self.get_stage_pool())
+        return results["ensemble"], report
         
     def analyze_ticker(self, 
                        ticker: str, 
-                       history_data: List[StockDataPoint], 
+                       history_data: PriceHistory, 
                        sentiment_score: float, 
                        news_articles: List[Article]) -> AnalysisResult:
+        # Columnar from here on: every stage reads the same validated arrays
+        history_data = as_price_series(history_data)
                        
-        # 1. Technical Analysis (Centralized)
-        # Convert to DataFrame
-        records = [
-            {
-                'datetime': d.datetime, 
-                'open': d.open, 
-                'high': d.high, 
-                'low': d.low, 
-                'close': d.close, 
-                'volume': d.volume
-            } 
-            for d in history_data
-        ]
-        df = pd.DataFrame(records)
-        df['datetime'] = pd.to_datetime(df['datetime'])
-        df.set_index('datetime', inplace=True)
-        df.sort_index(inplace=True)
-        
-        # Use centralized indicators
-        # Note: We need to map lowercase keys to Title Case for indicators or handle it there.
-        # Indicators expects 'Close' or 'close'.
-        df = add_technical_indicators(df)
-        
+        result, report = self._run_graph(
+            # 0. Shared Feature Frame
+            # Built ONCE per request; technical scoring and the LSTM read from it.
+            features=lambda: self._feature_frame(ticker, history_data),
+            # 1. Technical Analysis (Centralized)
+            technical=self._technical_analysis,
+            # 2. AI Model Predictions (Ensemble): A. LSTM, B. XGBoost
+            lstm=lambda df: self.lstm_predictor.predict(history_data, features=df, ticker=ticker),
+            xgboost=lambda: self.xgb_predictor.predict_probability(history_data, ticker=ticker),
+            ensemble=lambda technical, lstm_result, xgb_result: self._compose_result(
+                ticker, history_data, sentiment_score, news_articles, technical, lstm_result, xgb_result),
+            neutral_technical=lambda: self._neutral_technical(history_data),
+            lstm_fallback=("Neutral (Error)", 0.0),
+            xgb_fallback=("Neutral (Error)", 0.5),
+        )
+        result.components["stages"] = report
+        return result
+
+    def analyze_batch(self,
+                      tickers: List[str],
+                      histories: List[PriceHistory],
+                      sentiment_scores: List[float],
+                      news_articles: List[List[Article]]) -> List[Union[AnalysisResult, Exception]]:
+        """
+        Same as analyze_ticker for many tickers at once.
+        Features/technicals are built per ticker, but each model runs ONE batched
+        forward pass over all tickers (stacked LSTM windows, one XGBoost matrix),
+        through the same stage graph. Results are returned in input order.
+        Failures stay per ticker: a failing technical or model input degrades only
+        that ticker, and a ticker whose history or features cannot be built gets
+        its exception in place of a result.
+        """
+        n = len(tickers)
+        errors: List[Optional[Exception]] = [None] * n
+        series: List[Optional[PriceSeries]] = [None] * n
+        for i, history in enumerate(histories):
+            try:
+                series[i] = as_price_series(history)
+            except Exception as e:
+                logger.warning(f"Batch history for {tickers[i]} rejected: {e}")
+                errors[i] = e
+
+        def features():
+            frames: List[Optional[pd.DataFrame]] = [None] * n
+            for i in range(n):
+                if errors[i] is None:
+                    try:
+                        frame = self._feature_frame(tickers[i], series[i])
+                        if frame.empty:
+                            raise ValueError(f"No price bars for {tickers[i]}")
+                        frames[i] = frame
+                    except Exception as e:
+                        logger.warning(f"Batch features for {tickers[i]} failed: {e}")
+                        errors[i] = e
+            return frames
+
+        def technical(frames):
+            technicals = []
+            for i, df in enumerate(frames):
+                if df is None:
+                    technicals.append(None)
+                    continue
+                try:
+                    technicals.append(self._technical_analysis(df))
+                except Exception as e:
+                    logger.warning(f"Batch technicals for {tickers[i]} failed: {e}")
+                    technicals.append(self._neutral_technical(series[i]))
+            return technicals
+
+        def scatter(positions, values, fallback):
+            # Batched model outputs back to input order; tickers left out get the fallback
+            out = [fallback] * n
+            for i, value in zip(positions, values):
+                out[i] = value
+            return out
+
+        def lstm(frames):
+            positions = [i for i in range(n) if frames[i] is not None]
+            return scatter(positions, self.lstm_predictor.predict_batch(
+                [series[i] for i in positions], features=[frames[i] for i in positions],
+                tickers=[tickers[i] for i in positions]), ("Neutral (Error)", 0.0))
+
+        def xgboost():
+            # Runs alongside features, so it only skips the histories that could not be read
+            positions = [i for i in range(n) if series[i] is not None]
+            return scatter(positions, self.xgb_predictor.predict_probability_batch(
+                [series[i] for i in positions], tickers=[tickers[i] for i in positions]), ("Neutral (Error)", 0.5))
+
+        def ensemble(technicals, lstm_results, xgb_results):
+            results = []
+            for i in range(n):
+                if errors[i] is not None:
+                    results.append(errors[i])
+                    continue
+                try:
+                    results.append(self._compose_result(tickers[i], series[i], sentiment_scores[i], news_articles[i],
+                                                        technicals[i], lstm_results[i], xgb_results[i]))
+                except Exception as e:
+                    logger.warning(f"Batch result for {tickers[i]} failed: {e}")
+                    results.append(e)
+            return results
+
+        results, report = self._run_graph(
+            features=features,
+            technical=technical,
+            lstm=lstm,
+            xgboost=xgboost,
+            ensemble=ensemble,
+            neutral_technical=lambda: [None if errors[i] is not None else self._neutral_technical(series[i])
+                                       for i in range(n)],
+            lstm_fallback=[("Neutral (Error)", 0.0)] * n,
+            xgb_fallback=[("Neutral (Error)", 0.5)] * n,
+        )
+        for result in results:
+            if isinstance(result, AnalysisResult):
+                result.components["stages"] = report
+        return results
+
+    def _technical_analysis(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Latest raw indicator values and their partial scores."""
         # Extract latest values for logic
         current_price = df['close'].iloc[-1]
         rsi_val = df['RSI'].iloc[-1]
@@ -66,13 +232,51 @@ class BrainService:
         if not pd.isna(rsi_val):
             rsi_score = 100 - ((rsi_val - 30) * 5)
             rsi_score = max(-100, min(100, rsi_score))
-            
-        # 2. AI Model Predictions (Ensemble)
-        # A. LSTM
-        lstm_signal, lstm_conf = self.lstm_predictor.predict(history_data)
+
+        return {
+            "values": {
+                "current_price": current_price,
+                "rsi": rsi_val,
+                "sma": sma_val,
+                "macd": {"macd": macd_line, "signal": signal_line, "hist": hist},
+                "bollinger": {"upper": bb_upper, "lower": bb_lower}
+            },
+            "scores": {
+                "rsi": rsi_score,
+                "trend": trend_score,
+                "bb": bb_score
+            }
+        }
+
+    @staticmethod
+    def _neutral_technical(history_data: PriceSeries) -> Dict[str, Any]:
+        """Fallback for a failed technical stage: latest close, no indicators, zero scores."""
+        return {
+            "values": {
+                "current_price": float(history_data.close[-1]),
+                "rsi": None,
+                "sma": None,
+                "macd": {"macd": None, "signal": None, "hist": None},
+                "bollinger": {"upper": None, "lower": None}
+            },
+            "scores": {"rsi": 0, "trend": 0, "bb": 0}
+        }
+
+    def _compose_result(self,
+                        ticker: str,
+                        history_data: PriceSeries,
+                        sentiment_score: float,
+                        news_articles: List[Article],
+                        technical: Dict[str, Any],
+                        lstm_result: Tuple[str, float],
+                        xgb_result: Tuple[str, float]) -> AnalysisResult:
+        """Ensemble weighting, signal and result construction."""
+        current_price = technical["values"]["current_price"]
+        rsi_score = technical["scores"]["rsi"]
+        trend_score = technical["scores"]["trend"]
+        lstm_signal, lstm_conf = lstm_result
+        xgb_signal_str, xgb_prob = xgb_result
         
-        # B. XGBoost
-        xgb_signal_str, xgb_prob = self.xgb_predictor.predict_probability(history_data)
         # Normalize XGB probability (0-1) to Score (-100 to 100)
         xgb_score = (xgb_prob - 0.5) * 200 
         
@@ -119,7 +323,7 @@ class BrainService:
         elif trend_score < -70: strategy = "Bearish Trend Follow"
         elif sentiment_normalized > 60 and xgb_signal_str == "Bullish": strategy = "News-Quant Convergence"
         
-        prices = [d.close for d in history_data[-30:]]
+        prices = history_data.close[-30:].tolist()
         support = min(prices) if prices else 0
         resistance = max(prices) if prices else 0
         
@@ -129,20 +333,7 @@ class BrainService:
 
         # 5. Construct Result
         quant_components = {
-            "technical": {
-                "values": {
-                    "current_price": current_price,
-                    "rsi": rsi_val,
-                    "sma": sma_val,
-                    "macd": {"macd": macd_line, "signal": signal_line, "hist": hist},
-                    "bollinger": {"upper": bb_upper, "lower": bb_lower}
-                },
-                "scores": {
-                    "rsi": rsi_score,
-                    "trend": trend_score,
-                    "bb": bb_score
-                }
-            },
+            "technical": technical,
             "neural": {
                 "signal": lstm_signal,
                 "confidence": lstm_conf
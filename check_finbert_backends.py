@@ -0,0 +1,83 @@
+"""
+Parity + latency check: FinBERT fp32 (torch) vs the int8 / ONNX Runtime backends.
+
+Usage: python check_finbert_backends.py [backend ...] [--offline]
+
+Exits non-zero if any backend's composite score drifts beyond
+BrainConfig.FINBERT_PARITY_TOLERANCE from fp32. --offline uses a randomly
+initialized BERT-base with FinBERT's architecture (no download; latency is
+representative, parity only exercises the conversion).
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+from brain.analysis.finbert_backends import BACKENDS, build_pipeline, parity_check
+from brain.analysis.sentiment import SentimentEngine
+
+TEXTS = [
+    "Apple beats quarterly earnings estimates as services revenue surges.",
+    "Tesla shares fall after regulators open a probe into Autopilot crashes.",
+    "Analysts raise Nvidia price target on strong data center demand.",
+    "Microsoft announces $60 billion buyback and dividend increase.",
+    "Intel warns of supply chain headwinds in the coming quarter.",
+    "Institutional investors trim Meta stakes amid valuation concerns.",
+    "Amazon reports record holiday sales but margins narrow.",
+    "JPMorgan flags rising credit card delinquencies in its consumer unit.",
+]
+
+
+def save_offline_model(words):
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizer
+
+    path = tempfile.mkdtemp(prefix="finbert-offline-")
+    with open(os.path.join(path, "vocab.txt"), "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words)))
+    BertTokenizer(os.path.join(path, "vocab.txt")).save_pretrained(path)
+    config = BertConfig(num_labels=3, id2label={0: "Neutral", 1: "Positive", 2: "Negative"},
+                        label2id={"Neutral": 0, "Positive": 1, "Negative": 2})
+    BertForSequenceClassification(config).save_pretrained(path)
+    return path
+
+
+def latency_ms(pipe, repeats=5):
+    pipe(TEXTS, truncation=True, max_length=512, batch_size=len(TEXTS))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pipe(TEXTS, truncation=True, max_length=512, batch_size=len(TEXTS))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    backends = [a for a in sys.argv[1:] if not a.startswith("--")] or [b for b in BACKENDS if b != "torch"]
+    model_name = SentimentEngine._model_name
+    if "--offline" in sys.argv:
+        words = {w.lower().strip(".,$") for t in TEXTS for w in t.split()}
+        model_name = save_offline_model(words)
+        os.environ.setdefault("FINBERT_ONNX_DIR", tempfile.mkdtemp(prefix="finbert-onnx-"))
+
+    reference = build_pipeline(model_name, "torch")
+    ref_ms = latency_ms(reference)
+    print(f"--- FinBERT backends vs fp32 ({len(TEXTS)} texts, best of 5) ---")
+    print(f"{'Backend':<12}{'batch ms':>10}{'speedup':>9}{'max |d|':>10}{'mean |d|':>10}{'labels':>8}  ok")
+    print(f"{'torch':<12}{ref_ms:>10.1f}{1.0:>8.1f}x{0.0:>10.4f}{0.0:>10.4f}{1.0:>8.2f}  reference")
+
+    failed = False
+    for backend in backends:
+        candidate = build_pipeline(model_name, backend)
+        report = parity_check(reference, candidate, TEXTS)
+        ms = latency_ms(candidate)
+        failed |= not report["ok"]
+        print(f"{backend:<12}{ms:>10.1f}{ref_ms / ms:>8.1f}x{report['max_abs_diff']:>10.4f}"
+              f"{report['mean_abs_diff']:>10.4f}{report['label_agreement']:>8.2f}  {report['ok']}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Latency + accuracy report: eager fp32 StockLSTM vs the compiled serving artifacts
+(TorchScript fp32 and TorchScript dynamic-int8), on the validation split of
+brain/saved_models/training_cache.npz.
+
+Usage: python check_lstm_serving.py [--limit N] [--build]
+
+--build also (re)writes BrainConfig.LSTM_SERVING_PATH in BrainConfig.LSTM_SERVING_MODE.
+Without the training cache, random windows are scored instead: latency and
+agreement with the eager model are still meaningful, accuracy is not reported.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.append(os.getcwd())
+
+from brain.core.config import BrainConfig
+from brain.neural_networks.serving import build, compile_model, load_eager
+
+CACHE_FILE = "brain/saved_models/training_cache.npz"
+
+
+def load_validation(input_size, limit):
+    if os.path.exists(CACHE_FILE):
+        with np.load(CACHE_FILE) as data:
+            x_val, y_val = data["x_val"][:limit], data["y_val"][:limit]
+        print(f"Validation split: {CACHE_FILE} ({len(x_val)} windows)")
+        return x_val.astype(np.float32), y_val.astype(np.int64)
+    print(f"{CACHE_FILE} not found: scoring {limit} random windows (no labels, accuracy skipped)")
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((limit, 60, input_size)).astype(np.float32), None
+
+
+def latency_ms(model, x, repeats=20):
+    with torch.no_grad():
+        for _ in range(3):
+            model(x)
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model(x)
+            best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def probabilities(model, x, batch_size=256):
+    with torch.no_grad():
+        return torch.cat([torch.softmax(model(x[i:i + batch_size]), dim=1)
+                          for i in range(0, len(x), batch_size)]).numpy()
+
+
+def main():
+    limit = int(sys.argv[sys.argv.index("--limit") + 1]) if "--limit" in sys.argv else 2048
+    eager = load_eager(BrainConfig.MODEL_PATH)
+    x_np, y = load_validation(eager.lstm.input_size, limit)
+    x = torch.from_numpy(x_np)
+
+    variants = {"eager": eager, "ts-fp32": compile_model(eager, "fp32"), "ts-int8": compile_model(eager, "int8")}
+    reference = probabilities(eager, x)
+    ref_class = reference.argmax(axis=1)
+
+    print(f"--- StockLSTM CPU serving ({torch.get_num_threads()} threads) ---")
+    print(f"{'Variant':<10}{'b=1 ms':>9}{'b=64 ms':>10}{'speedup64':>11}{'agree':>8}{'max|dp|':>9}{'val acc':>9}")
+    base64 = latency_ms(eager, x[:64])
+    for name, model in variants.items():
+        probs = reference if model is eager else probabilities(model, x)
+        b1, b64 = latency_ms(model, x[:1]), base64 if model is eager else latency_ms(model, x[:64])
+        agree = float(np.mean(probs.argmax(axis=1) == ref_class))
+        max_dp = float(np.abs(probs - reference).max())
+        acc = f"{np.mean(probs.argmax(axis=1) == y) * 100:.2f}%" if y is not None else "n/a"
+        print(f"{name:<10}{b1:>9.2f}{b64:>10.2f}{base64 / b64:>10.2f}x{agree:>8.3f}{max_dp:>9.4f}{acc:>9}")
+
+    if "--build" in sys.argv:
+        print(f"Built {build()} ({BrainConfig.LSTM_SERVING_MODE})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Synthetic daily price history shared by the tests and benchmarks.
+
+A geometric random walk (2% daily volatility) from 100, one bar per calendar
+day, as List[StockDataPoint] — the shape the data providers hand to the brain.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from brain.core.types import StockDataPoint
+
+
+def make_history(n: int, seed: int = 0, start: datetime = datetime(2022, 1, 3),
+                 open_ratio: float = 1.0, volume: Optional[int] = 1_000_000) -> List[StockDataPoint]:
+    """
+    n bars from `start`. Opens are close * open_ratio, highs/lows +-1% around the
+    close; volume=None draws a random volume per bar instead of a constant one.
+    """
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    volumes = rng.integers(1e5, 1e7, n) if volume is None else np.full(n, volume)
+    return [StockDataPoint(datetime=(start + timedelta(days=i)).strftime("%Y-%m-%d"), open=c * open_ratio,
+                           high=c * 1.01, low=c * 0.99, close=c, volume=int(v))
+            for i, (c, v) in enumerate(zip(closes, volumes))]
@@ -0,0 +1,163 @@
+"""
+Tests for /api/analyze/batch with stubbed stages (news, prices, Brain): the
+response shape, and failure isolation — one failing data source or ticker must
+not fail the others.
+
+Run: python -m pytest test_batch_endpoint.py -q
+"""
+import numpy as np
+import pytest
+
+from backend.cache import TTLCache
+from brain.core.types import AnalysisResult, MarketSignal, PriceSeries
+
+
+def price_series(n=300):
+    """Price-store column arrays (oldest first) wrapped as the price stage returns them."""
+    close = 100.5 + np.arange(n, dtype=np.float64)
+    return PriceSeries.from_bars({"date": np.datetime64("2024-01-01", "s") + np.arange(n) * 86400,
+                                  "open": close - 0.5, "high": close + 0.5, "low": close - 1.5, "close": close,
+                                  "volume": np.full(n, 1000, dtype=np.int64)})
+
+
+def analysis_for(ticker, sentiment):
+    return AnalysisResult(
+        ticker=ticker, current_price=100.0, sentiment_score=sentiment, technical_score=10.0, final_score=12.5,
+        signal=MarketSignal.BUY, confidence=0.8, articles=[],
+        components={
+            "technical": {"values": {"rsi": 55.0, "sma": 99.0, "current_price": 100.0,
+                                     "macd": {"macd": 0.5, "signal": 0.4, "hist": 0.1}},
+                          "scores": {"rsi": 10.0, "trend": 20.0}},
+            "neural": {"signal": "Bullish", "confidence": 0.7},
+            "weights": {"technical": 0.5, "sentiment": 0.5},
+        })
+
+
+class FakeBrain:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.bad = set()  # tickers the Brain reports as unanalyzable (per-ticker exceptions)
+        self.calls = []
+
+    def analyze_batch(self, tickers, histories, sentiments, news):
+        self.calls.append(list(tickers))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [ValueError(f"No price bars for {t}") if t in self.bad else analysis_for(t, s)
+                for t, s in zip(tickers, sentiments)]
+
+
+@pytest.fixture
+def stubs():
+    return {"news": {"sentiment": 0.25, "fail": set()}, "prices": {"fail": set()}, "brain": FakeBrain()}
+
+
+@pytest.fixture
+def app_module(monkeypatch, stubs):
+    import backend.app as app_module
+
+    news, prices, brain = stubs["news"], stubs["prices"], stubs["brain"]
+
+    def load_news_sentiment(ticker, force_refresh=False, company_name=None):
+        if ticker in news["fail"]:
+            raise ConnectionError("GNews unreachable")
+        return [], news["sentiment"]
+
+    def fetch_price_history(ticker, range_str="1W"):
+        if ticker in prices["fail"]:
+            raise ConnectionError("Twelve Data rate limited")
+        return price_series(), 7
+
+    monkeypatch.setattr(app_module, "load_news_sentiment", load_news_sentiment)
+    monkeypatch.setattr(app_module, "fetch_price_history", fetch_price_history)
+    monkeypatch.setattr(app_module, "get_brain_service", lambda: brain)
+    monkeypatch.setattr(app_module, "cache", TTLCache("analysis", ttl_seconds=600))
+    return app_module
+
+
+def test_response_shape(app_module, stubs):
+    client = app_module.app.test_client()
+    body = client.post("/api/analyze/batch", json={"tickers": ["aapl", "MSFT", "AAPL "], "range": "1W"}).get_json()
+
+    assert list(body) == ["results"] and set(body["results"]) == {"AAPL", "MSFT"}  # normalized, deduped
+    for result in body["results"].values():
+        assert set(result) >= {"current_sentiment", "news", "graph_data", "quant_analysis", "debug"}
+        assert result["cached"] is False and result["stale"] is False and result["coalesced"] is False
+        assert len(result["graph_data"]) == 7 and result["current_sentiment"] == 0.25
+        assert result["graph_data"][-1] == {"date": "2024-10-26", "open": 399.0, "high": 400.0, "low": 398.0,
+                                            "close": 399.5, "volume": 1000, "price": 399.5, "sentiment": 0.25}
+        assert result["quant_analysis"]["signal"] == "Buy"
+    assert stubs["brain"].calls == [["AAPL", "MSFT"]]  # one batched Brain pass
+
+    # Second call is served from the cache, GET form
+    body = client.get("/api/analyze/batch?tickers=MSFT,AAPL").get_json()
+    assert set(body["results"]) == {"MSFT", "AAPL"}
+    assert all(r["cached"] for r in body["results"].values())
+    assert len(stubs["brain"].calls) == 1
+
+
+def test_invalid_requests(app_module):
+    client = app_module.app.test_client()
+    assert client.get("/api/analyze/batch").status_code == 400
+    tickers = [f"T{i}" for i in range(app_module.BATCH_MAX_TICKERS + 1)]
+    assert client.post("/api/analyze/batch", json={"tickers": tickers}).status_code == 400
+
+
+def test_failing_news_degrades_to_neutral_for_that_ticker(app_module, stubs):
+    stubs["news"]["fail"].add("MSFT")
+    body = app_module.app.test_client().post("/api/analyze/batch", json={"tickers": ["AAPL", "MSFT"]}).get_json()
+
+    assert body["results"]["AAPL"]["current_sentiment"] == 0.25
+    assert body["results"]["MSFT"]["current_sentiment"] == 0.0
+    assert not any(r.get("circuit_breaker") for r in body["results"].values())
+
+
+def test_failing_prices_break_only_that_ticker(app_module, stubs):
+    stubs["prices"]["fail"].add("MSFT")
+    body = app_module.app.test_client().post("/api/analyze/batch",
+                                              json={"tickers": ["AAPL", "MSFT", "NVDA"]}).get_json()
+
+    msft = body["results"]["MSFT"]
+    assert msft["circuit_breaker"] is True and "rate limited" in msft["error"]
+    assert all("quant_analysis" in body["results"][t] for t in ("AAPL", "NVDA"))
+    assert stubs["brain"].calls == [["AAPL", "NVDA"]]
+    # Only successful analyses are cached
+    assert app_module.cache.get("MSFT_1W") is None and app_module.cache.get("AAPL_1W") is not None
+
+
+def test_unanalyzable_ticker_breaks_only_itself(app_module, stubs):
+    stubs["brain"].bad.add("MSFT")
+    body = app_module.app.test_client().post("/api/analyze/batch", json={"tickers": ["AAPL", "MSFT"]}).get_json()
+
+    assert body["results"]["MSFT"]["circuit_breaker"] is True and "No price bars" in body["results"]["MSFT"]["error"]
+    assert "quant_analysis" in body["results"]["AAPL"]
+
+
+def test_brain_failure_breaks_every_fetched_ticker(app_module, stubs):
+    stubs["brain"].fail = True
+    stubs["prices"]["fail"].add("MSFT")
+    body = app_module.app.test_client().post("/api/analyze/batch", json={"tickers": ["AAPL", "MSFT"]}).get_json()
+
+    assert body["results"]["AAPL"]["error"] == "model crashed"
+    assert "rate limited" in body["results"]["MSFT"]["error"]
+    assert all(r["circuit_breaker"] for r in body["results"].values())
+
+
+def test_price_stage_wraps_store_arrays(monkeypatch):
+    import backend.app as app_module
+
+    bars = {name: getattr(price_series(400), name) for name in ("open", "high", "low", "close", "volume")}
+    bars["date"] = np.datetime64("2024-01-01", "s") + np.arange(400) * 86400
+
+    class Store:
+        def get_history(self, ticker, outputsize, interval):
+            return bars
+
+    monkeypatch.setattr(app_module, "price_store", Store())
+    p_history, req_int = app_module.fetch_price_history("AAPL", "1M")
+    assert isinstance(p_history, PriceSeries) and req_int == 30 and len(p_history) == 400
+    assert np.shares_memory(p_history.close, bars["close"])  # no per-row round-trip
+
+    rows = app_module.graph_rows(p_history, req_int, 0.123456)
+    assert len(rows) == 30 and rows[0]["date"] == "2025-01-05" and rows[-1]["close"] == 499.5
+    assert all(r["sentiment"] == 0.1235 for r in rows)
@@ -0,0 +1,125 @@
+"""
+Tests for the bounded LRU + TTL cache (backend.cache) with an injected clock:
+LRU eviction, TTL expiry, stale-while-revalidate in backend.app, and the
+counters served by /api/cache/stats.
+
+Run: python -m pytest test_cache.py -q
+"""
+import threading
+import time
+
+from backend.cache import TTLCache, estimate_size
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TTLCache("test", max_entries=2, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1 and len(cache) == 2
+
+
+def test_byte_budget_evicts_and_rejects():
+    value = {"payload": "x" * 50}
+    cache = TTLCache("test", max_entries=10, max_bytes=2 * estimate_size(value), clock=FakeClock())
+    for key in "abc":
+        cache.set(key, value)
+    assert "a" not in cache and len(cache) == 2
+    assert cache.stats()["bytes"] == 2 * estimate_size(value)
+
+    assert cache.set("huge", {"payload": "x" * 500}) is False
+    assert cache.stats()["rejected"] == 1 and "huge" not in cache
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache("test", ttl_seconds=60, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=300)
+
+    clock.advance(59.9)
+    assert cache.get("a") == 1
+    clock.advance(0.1)
+    assert cache.get("a") is None and cache.get_entry("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1 and len(cache) == 1
+
+
+def test_stale_entries_are_served_within_the_grace_period():
+    clock = FakeClock()
+    cache = TTLCache("test", ttl_seconds=60, stale_seconds=30, clock=clock)
+    cache.set("a", 1)
+
+    clock.advance(75)
+    entry = cache.get_entry("a")
+    assert entry.stale and entry.value == 1 and entry.age == 75
+    assert cache.get("a") is None  # get() only returns fresh values
+
+    clock.advance(15)
+    assert cache.get_entry("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"], stats["expirations"]) == (0, 1, 2, 1)
+
+
+def test_stats_counters_and_hit_rate():
+    cache = TTLCache("test", max_entries=1, clock=FakeClock())
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+    cache.get("a", record_stats=False)
+    cache.set("b", 2)
+
+    stats = cache.stats()
+    assert stats["name"] == "test" and stats["entries"] == 1
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+    assert stats["hit_rate"] == round(2 / 3, 4)
+
+
+def test_stale_analysis_is_served_and_refreshed_in_background(monkeypatch):
+    import backend.app as app_module
+
+    clock = FakeClock()
+    cache = TTLCache("analysis", ttl_seconds=60, stale_seconds=600, clock=clock)
+    refreshed = threading.Event()
+
+    def fetch_stock_data(ticker, range_str, force_refresh=False, company_name=None):
+        refreshed.set()
+        return {"ticker": ticker, "version": 2}
+
+    monkeypatch.setattr(app_module, "cache", cache)
+    monkeypatch.setattr(app_module, "fetch_stock_data", fetch_stock_data)
+    cache.set("SWR_1W", {"ticker": "SWR", "version": 1})
+
+    client = app_module.app.test_client()
+    fresh = client.get("/api/analyze?ticker=SWR&range=1W").get_json()
+    assert fresh["version"] == 1 and fresh["cached"] and not fresh["stale"]
+    assert not refreshed.is_set()
+
+    clock.advance(120)
+    stale = client.get("/api/analyze?ticker=SWR&range=1W").get_json()
+    assert stale["version"] == 1 and stale["stale"] and stale["cache_age_seconds"] == 120
+    assert refreshed.wait(5)
+    for _ in range(500):
+        if cache.get_entry("SWR_1W", record_stats=False).value["version"] == 2:
+            break
+        time.sleep(0.01)
+    assert cache.get("SWR_1W")["version"] == 2
+
+    stats = client.get("/api/cache/stats").get_json()["analysis"]
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (2, 1, 0)
+    assert stats["entries"] == 1 and stats["ttl_seconds"] == 60 and stats["stale_seconds"] == 600
@@ -0,0 +1,87 @@
+"""
+Parity tests for the FinBERT backends (brain.analysis.finbert_backends) on a tiny,
+randomly initialized BERT with FinBERT's label layout (no model download).
+
+Run: python -m pytest test_finbert_backends.py -q
+"""
+import os
+
+import pytest
+
+from brain.analysis import finbert_backends
+from brain.analysis.finbert_backends import build_pipeline, composite_scores, parity_check
+
+TEXTS = [
+    "apple beats earnings estimates",
+    "tesla shares fall after probe",
+    "analysts raise nvidia target",
+    "intel warns of headwinds",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizer
+
+    torch.manual_seed(0)
+    path = str(tmp_path_factory.mktemp("tiny-finbert"))
+    words = sorted({w for t in TEXTS for w in t.split()})
+    with open(os.path.join(path, "vocab.txt"), "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words))
+    BertTokenizer(os.path.join(path, "vocab.txt")).save_pretrained(path)
+    config = BertConfig(vocab_size=len(words) + 5, hidden_size=64, num_hidden_layers=2, num_attention_heads=2,
+                        intermediate_size=128, num_labels=3,
+                        id2label={0: "Neutral", 1: "Positive", 2: "Negative"},
+                        label2id={"Neutral": 0, "Positive": 1, "Negative": 2})
+    BertForSequenceClassification(config).save_pretrained(path)
+    return path
+
+
+@pytest.fixture()
+def onnx_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(finbert_backends.BrainConfig, "FINBERT_ONNX_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_torch_int8_parity(tiny_model):
+    report = parity_check(build_pipeline(tiny_model, "torch"), build_pipeline(tiny_model, "torch-int8"), TEXTS)
+    assert report["ok"], report
+
+
+@pytest.mark.parametrize("backend", ["onnx", "onnx-int8"])
+def test_onnx_parity_and_export_once(tiny_model, onnx_dir, backend):
+    pytest.importorskip("onnxruntime")
+    reference = build_pipeline(tiny_model, "torch")
+    candidate = build_pipeline(tiny_model, backend)
+    report = parity_check(reference, candidate, TEXTS)
+    assert report["ok"], report
+    if backend == "onnx":
+        assert report["max_abs_diff"] < 1e-4
+
+    exported = sorted(os.listdir(onnx_dir))
+    assert exported
+    mtimes = [os.path.getmtime(onnx_dir / name) for name in exported]
+    build_pipeline(tiny_model, backend)
+    assert [os.path.getmtime(onnx_dir / name) for name in exported] == mtimes
+
+
+def test_output_matches_pipeline_contract(tiny_model, onnx_dir):
+    pytest.importorskip("onnxruntime")
+    out = build_pipeline(tiny_model, "onnx")(TEXTS, truncation=True, max_length=512, batch_size=2)
+    assert len(out) == len(TEXTS)
+    assert {item["label"] for item in out[0]} == {"Neutral", "Positive", "Negative"}
+    assert abs(sum(item["score"] for item in out[0]) - 1.0) < 1e-5
+    assert composite_scores(out).shape == (len(TEXTS),)
+
+
+def test_onnx_falls_back_without_onnxruntime(tiny_model, monkeypatch):
+    monkeypatch.setattr(finbert_backends, "ort", None)
+    pipe = build_pipeline(tiny_model, "onnx")
+    assert not isinstance(pipe, finbert_backends.OnnxSentimentPipeline)
+    assert len(pipe(TEXTS, truncation=True, max_length=512, batch_size=4)) == len(TEXTS)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        build_pipeline("unused", "tensorrt")
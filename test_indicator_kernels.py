@@ -0,0 +1,167 @@
+"""
+Parity tests: NumPy kernels (brain.core.kernels) vs the original pandas implementations.
+
+Run: python -m pytest -q test_indicator_kernels.py
+"""
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from brain.core import kernels
+from brain.core.indicators import add_technical_indicators
+from brain.quant.engine import QuantEngine
+
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+# --- Reference (original pandas) implementations ---
+
+def ref_rsi_sma(series, period=14):
+    delta = series.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+def ref_rsi_ewm(series, period=14):
+    delta = series.diff()
+    gains = delta.where(delta > 0, 0.0)
+    losses = (-delta).where(delta < 0, 0.0)
+    avg_gain = gains.ewm(span=period, min_periods=period, adjust=False).mean()
+    avg_loss = losses.ewm(span=period, min_periods=period, adjust=False).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def ref_cci(high, low, close, period=20):
+    tp = (high + low + close) / 3
+    sma = tp.rolling(window=period).mean()
+    mad = tp.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean())
+    return (tp - sma) / (0.015 * mad + 1e-6)
+
+def ref_add_technical_indicators(df):
+    df = df.copy()
+    close, high, low = df['close'], df['high'], df['low']
+    df['RSI'] = ref_rsi_sma(close)
+    df['ROC'] = close.pct_change(periods=10) * 100
+    df['CCI'] = ref_cci(high, low, close)
+    exp1 = close.ewm(span=12, adjust=False).mean()
+    exp2 = close.ewm(span=26, adjust=False).mean()
+    df['MACD'] = exp1 - exp2
+    df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    middle = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    df['BB_Upper'] = middle + std * 2
+    df['BB_Lower'] = middle - std * 2
+    df['BB_Middle'] = middle
+    df['BB_Pct'] = (close - df['BB_Lower']) / (df['BB_Upper'] - df['BB_Lower'])
+    ranges = pd.concat([high - low, np.abs(high - close.shift()), np.abs(low - close.shift())], axis=1)
+    df['ATR_Pct'] = ranges.max(axis=1).rolling(window=14).mean() / close
+    df['SMA_50'] = close.rolling(window=50).mean()
+    df['Log_Ret'] = np.log(close / close.shift(1))
+    returns = close.pct_change()
+    df['Vol_Ratio'] = returns.rolling(window=5).std() / returns.rolling(window=20).std()
+    df['SMA_Ratio'] = close / close.rolling(window=50).mean()
+    df['Ret_1d'] = df['Log_Ret'].shift(1)
+    for lag in (3, 5, 10, 20):
+        df[f'Ret_{lag}d'] = close.pct_change(lag)
+    return df
+
+
+# --- Fixtures ---
+
+def make_ohlc(n=1500, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.03, n))
+    low = close * (1 - rng.uniform(0, 0.03, n))
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close,
+                         'volume': rng.integers(1e5, 1e7, n)})
+
+
+def assert_parity(actual, expected, rtol=RTOL, atol=ATOL):
+    actual = np.asarray(actual, dtype=float)
+    expected = np.asarray(expected, dtype=float)
+    assert actual.shape == expected.shape
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+
+
+# --- Tests ---
+
+def test_rolling_primitives():
+    x = pd.Series(make_ohlc()['close'])
+    for window in (5, 14, 20, 50):
+        assert_parity(kernels.rolling_mean(x.to_numpy(), window), x.rolling(window).mean())
+        assert_parity(kernels.rolling_std(x.to_numpy(), window), x.rolling(window).std())
+
+
+def test_rolling_mean_with_nan_gap():
+    x = make_ohlc()['close'].copy()
+    x.iloc[100] = np.nan
+    assert_parity(kernels.rolling_mean(x.to_numpy(), 20), x.rolling(20).mean())
+
+
+def test_ewm_matches_pandas_including_gaps():
+    x = make_ohlc()['close'].copy()
+    x.iloc[:3] = np.nan
+    x.iloc[[200, 201, 500]] = np.nan
+    for span, min_periods in ((9, 0), (12, 0), (14, 14), (26, 5)):
+        expected = x.ewm(span=span, min_periods=min_periods, adjust=False).mean()
+        assert_parity(kernels.ewm_mean(x.to_numpy(), span, min_periods=min_periods), expected)
+
+
+def test_rsi_both_methods():
+    close = make_ohlc()['close']
+    assert_parity(kernels.rsi(close.to_numpy(), 14, method="sma"), ref_rsi_sma(close))
+    assert_parity(kernels.rsi(close.to_numpy(), 14, method="ewm"), ref_rsi_ewm(close))
+
+
+def test_cci_matches_rolling_apply():
+    df = make_ohlc()
+    expected = ref_cci(df['high'], df['low'], df['close'])
+    assert_parity(kernels.cci(df['high'], df['low'], df['close']), expected, rtol=1e-7)
+
+
+def test_add_technical_indicators_parity():
+    df = make_ohlc()
+    expected = ref_add_technical_indicators(df)
+    actual = add_technical_indicators(df)
+    assert list(actual.columns) == list(expected.columns)
+    for col in expected.columns:
+        assert_parity(actual[col], expected[col], rtol=1e-7)
+
+
+def test_add_technical_indicators_short_history():
+    df = make_ohlc(n=30)
+    expected = ref_add_technical_indicators(df)
+    actual = add_technical_indicators(df)
+    for col in expected.columns:
+        assert_parity(actual[col], expected[col], rtol=1e-7)
+
+
+def test_float32_mode():
+    df = make_ohlc()
+    full = add_technical_indicators(df)
+    half = add_technical_indicators(df, dtype=np.float32)
+    assert half['RSI'].dtype == np.float32
+    for col in ('RSI', 'MACD', 'BB_Pct', 'CCI', 'Log_Ret', 'SMA_Ratio'):
+        assert_parity(half[col], full[col], rtol=1e-5, atol=1e-5)
+
+
+def test_quant_engine_uses_same_values():
+    df = make_ohlc(n=300)
+    df['datetime'] = pd.bdate_range(end="2025-01-01", periods=len(df))
+    engine = QuantEngine(df.to_dict('records'))
+    close = df['close']
+    assert np.isclose(engine.calc_rsi(), ref_rsi_ewm(close).iloc[-1], rtol=RTOL)
+    assert np.isclose(engine.calc_sma(), close.rolling(50).mean().iloc[-1], rtol=RTOL)
+    bb = engine.calc_bollinger_bands()
+    expected_upper = (close.rolling(20).mean() + close.rolling(20).std() * 2).iloc[-1]
+    assert np.isclose(bb['upper'], expected_upper, rtol=RTOL)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main(["-q", __file__]))
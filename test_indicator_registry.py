@@ -0,0 +1,85 @@
+"""
+Tests for the declarative indicator registry (brain.core.indicators): minimal
+dependency plans, lookbacks, and tail-only computation matching full history.
+
+Run: python -m pytest test_indicator_registry.py -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from brain.core import indicators
+from brain.core.features import build_feature_frame
+from brain.core.indicators import FEATURE_SETS, add_technical_indicators, compute_indicators, lookback, plan
+from brain.core.streaming import INDICATOR_COLUMNS
+from brain.core.types import PriceSeries
+from brain.prediction.engine import PredictionEngine
+from brain.prediction.xgboost_engine import feature_matrix
+
+
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({"open": close * 0.995, "high": close * 1.01, "low": close * 0.99, "close": close,
+                         "volume": rng.integers(1e5, 1e7, n)},
+                        index=pd.date_range("2006-01-02", periods=n, freq="D", name="datetime"))
+
+
+def test_plan_is_minimal_and_ordered():
+    steps = plan(["SMA_Ratio", "Ret_1d"])
+    assert [s.outputs for s in steps] == [("SMA_50",), ("SMA_Ratio",), ("Log_Ret",), ("Ret_1d",)]
+    assert plan(["Sentiment", "RSI", "RSI"]) == [indicators.INDICATORS["RSI"]]
+    assert FEATURE_SETS["all"] == tuple(INDICATOR_COLUMNS)
+    assert set(FEATURE_SETS["xgboost"]) <= set(FEATURE_SETS["lstm"])
+    with pytest.raises(KeyError):
+        compute_indicators(np.ones(10), "unknown")
+
+
+def test_lookbacks_chain_through_dependencies():
+    assert lookback(["RSI"]) == 15 and lookback(["SMA_Ratio"]) == 50 and lookback(["Ret_1d"]) == 3
+    assert lookback(["Sentiment"]) == 1
+    assert lookback(["MACD_Signal"]) == indicators.ewm_window(26) + indicators.ewm_window(9) - 1
+    assert lookback(FEATURE_SETS["technical"]) == lookback(["MACD_Signal"])
+
+
+def test_full_history_is_unchanged():
+    df = make_frame(400)
+    full = add_technical_indicators(df)
+    assert list(full.columns) == list(df.columns) + INDICATOR_COLUMNS
+    subset = add_technical_indicators(df, columns="xgboost")
+    for name in subset.columns:
+        np.testing.assert_array_equal(subset[name].to_numpy(), full[name].to_numpy())
+    assert "CCI" not in subset.columns and "SMA_50" in subset.columns  # SMA_Ratio's input
+
+
+@pytest.mark.parametrize("columns", ["technical", "lstm", ["Ret_20d", "CCI", "ATR_Pct"]])
+def test_tail_matches_full_history(columns):
+    df = make_frame(3000)
+    full = add_technical_indicators(df)
+    tail = add_technical_indicators(df, columns=columns, rows=60)
+    assert len(tail) == 60 and tail.index.equals(full.index[-60:])
+    wanted = [c for c in indicators.resolve(columns) if c in indicators.INDICATORS]
+    for name in wanted:
+        # Windowed columns are bit-identical; the EWMs agree to their settle tolerance
+        np.testing.assert_allclose(tail[name].to_numpy(), full[name].to_numpy()[-60:], rtol=1e-9, atol=1e-9)
+    start, _ = compute_indicators(df["close"].to_numpy(), columns, rows=60)
+    assert start == 3000 - (60 + lookback(wanted) - 1)
+
+
+def test_tail_widens_over_gaps():
+    df = make_frame(1000)
+    df.iloc[-30, df.columns.get_loc("close")] = np.nan  # a hole inside the requested rows
+    start, values = compute_indicators(df["close"].to_numpy(), ["Log_Ret"], rows=60)
+    assert start == 0 and len(values["Log_Ret"]) == 1000
+
+
+def test_consumers_request_their_feature_sets():
+    df = make_frame(1500)
+    series = PriceSeries.from_bars({"date": df.index.to_numpy(), **{c: df[c].to_numpy() for c in df.columns}})
+    frame = build_feature_frame(series, columns="lstm", rows=PredictionEngine.SEQUENCE_LENGTH)
+    assert len(frame) == 60 and set(FEATURE_SETS["lstm"]) <= set(frame.columns)
+    assert "SMA_50" in frame.columns and "BB_Upper" in frame.columns  # inputs of SMA_Ratio / outputs of BB_Pct
+    assert (frame["Sentiment"] == 0).all()
+
+    reference = add_technical_indicators(df).assign(Sentiment=0.0, NewsVol=0.0)[list(FEATURE_SETS["xgboost"])]
+    np.testing.assert_array_equal(feature_matrix(df["close"].to_numpy()), reference.to_numpy())
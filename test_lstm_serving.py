@@ -0,0 +1,50 @@
+"""
+Tests for the compiled StockLSTM serving artifact (brain.neural_networks.serving).
+
+Run: python -m pytest test_lstm_serving.py -q
+"""
+import numpy as np
+import pytest
+import torch
+
+from brain.neural_networks import serving
+from brain.neural_networks.model import StockLSTM
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    torch.manual_seed(0)
+    model = StockLSTM(input_size=17, hidden_size=32).eval()
+    path = tmp_path / "hybrid_lstm.pth"
+    torch.save(model.state_dict(), path)
+    return str(path)
+
+
+@pytest.mark.parametrize("mode,atol", [("fp32", 1e-5), ("int8", 0.05)])
+def test_artifact_matches_eager(checkpoint, tmp_path, mode, atol):
+    out = serving.build(checkpoint, str(tmp_path / "serving.pt"), mode)
+    served = serving.load(out, checkpoint, mode)
+    assert served.mode == mode and served.input_size == 17
+
+    x = torch.randn(8, 60, 17)
+    with torch.no_grad():
+        expected = torch.softmax(serving.load_eager(checkpoint)(x), dim=1).numpy()
+        actual = torch.softmax(served(x), dim=1).numpy()
+    np.testing.assert_allclose(actual, expected, atol=atol)
+
+
+def test_stale_or_missing_artifact_is_ignored(checkpoint, tmp_path):
+    assert serving.load(str(tmp_path / "missing.pt"), checkpoint) is None
+
+    out = serving.build(checkpoint, str(tmp_path / "serving.pt"), "fp32")
+    torch.save(StockLSTM(input_size=17, hidden_size=32).state_dict(), checkpoint)  # retrained
+    assert serving.load(out, checkpoint) is None
+
+
+def test_default_mode_is_fp32_and_mismatched_artifact_is_ignored(checkpoint, tmp_path):
+    from brain.core.config import BrainConfig
+
+    assert BrainConfig.LSTM_SERVING_MODE == "fp32"
+    out = serving.build(checkpoint, str(tmp_path / "serving.pt"), "int8")
+    assert serving.load(out, checkpoint) is None  # int8 is served only when configured
+    assert serving.load(out, checkpoint, "int8").mode == "int8"
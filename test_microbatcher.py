@@ -0,0 +1,92 @@
+"""
+Tests for cross-request micro-batching (brain.analysis.batcher.MicroBatcher).
+
+Run: python -m pytest test_microbatcher.py -q
+"""
+import threading
+import time
+
+import pytest
+
+from brain.analysis.batcher import MicroBatcher
+
+
+class Recorder:
+    def __init__(self, delay=0.0, fail_on=None):
+        self.batches = []
+        self.delay = delay
+        self.fail_on = fail_on
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        time.sleep(self.delay)
+        if self.fail_on is not None and self.fail_on in items:
+            raise RuntimeError("boom")
+        return [x * 10 for x in items]
+
+
+def run_concurrently(batcher, requests):
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def call(i):
+        barrier.wait()
+        results[i] = batcher(requests[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_callers_share_batches():
+    fn = Recorder(delay=0.02)
+    batcher = MicroBatcher(fn, max_batch_size=64, max_wait_ms=20)
+    requests = [[i * 100 + j for j in range(3)] for i in range(16)]
+
+    results = run_concurrently(batcher, requests)
+    assert results == [[x * 10 for x in r] for r in requests]
+    assert len(fn.batches) < 16
+    assert sum(len(b) for b in fn.batches) == 48
+    assert batcher.stats()["requests"] == 16
+
+
+def test_max_batch_size_is_respected_without_splitting_requests():
+    fn = Recorder(delay=0.02)
+    batcher = MicroBatcher(fn, max_batch_size=8, max_wait_ms=20)
+    requests = [[i] * 3 for i in range(10)]
+
+    run_concurrently(batcher, requests)
+    assert all(len(b) <= 8 for b in fn.batches)
+    assert all(len(b) % 3 == 0 for b in fn.batches)
+
+    # A single oversized request still goes through whole
+    assert batcher(list(range(20))) == [x * 10 for x in range(20)]
+    assert len(fn.batches[-1]) == 20
+
+
+def test_single_caller_waits_at_most_max_wait():
+    batcher = MicroBatcher(Recorder(), max_wait_ms=30)
+    start = time.monotonic()
+    assert batcher([1, 2]) == [10, 20]
+    assert time.monotonic() - start < 0.5
+
+
+def test_errors_reach_every_caller_in_the_batch_only():
+    fn = Recorder(delay=0.02, fail_on=-1)
+    batcher = MicroBatcher(fn, max_wait_ms=50)
+    bad = batcher.submit([-1])
+    good_same_batch = batcher.submit([1])
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=2)
+    with pytest.raises(RuntimeError):
+        good_same_batch.result(timeout=2)
+    # The worker survives and keeps serving
+    assert batcher([2]) == [20]
+
+
+def test_empty_request_resolves_immediately():
+    batcher = MicroBatcher(Recorder())
+    assert batcher([]) == []
@@ -0,0 +1,116 @@
+"""
+Tests for the process-wide model registry (brain.core.registry).
+
+Run: python -m pytest test_model_registry.py -q
+"""
+import os
+import threading
+import time
+
+import pytest
+
+from brain.core.config import BrainConfig
+from brain.core.registry import ModelRegistry, lstm_candidates, model_registry
+
+
+def test_loads_once_under_concurrency():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"weights": object()}
+
+    registry = ModelRegistry()
+    registry.register("m", loader)
+    assert not registry.is_loaded("m")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("m"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    status = registry.status()["m"]
+    assert status["loaded"] and status["available"]
+    assert status["load_seconds"] >= 0.05
+
+
+def test_failure_is_recorded_and_not_retried_until_reload():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("disk on fire")
+        return "model"
+
+    registry = ModelRegistry()
+    registry.register("m", loader)
+    assert registry.get("m") is None
+    assert registry.get("m") is None
+    assert len(calls) == 1
+    assert registry.status()["m"]["error"] == "disk on fire"
+
+    assert registry.reload("m") == "model"
+    assert registry.status()["m"]["error"] is None
+
+
+def test_unknown_model():
+    with pytest.raises(KeyError):
+        ModelRegistry().get("nope")
+
+
+def test_lstm_candidates_follow_the_runtime():
+    assert lstm_candidates("torch") == ["lstm_serving", "lstm"]
+    assert lstm_candidates("numpy") == ["lstm_numpy", "lstm_serving", "lstm"]
+    assert set(lstm_candidates()) <= set(model_registry.names())
+
+
+@pytest.mark.skipif(not os.path.exists(BrainConfig.MODEL_PATH), reason="LSTM checkpoint not present")
+def test_entry_points_share_one_lstm():
+    from backend.manager import ModelManager
+    from brain.prediction.engine import PredictionEngine
+
+    engine = PredictionEngine()
+    engine._load_resources()
+    manager = ModelManager()
+    manager.load_resources()
+
+    assert manager.model is model_registry.get("lstm")
+    # PredictionEngine serves the compiled artifact when one is current, else the same eager model
+    serving = model_registry.get("lstm_serving")
+    assert engine.model is (serving if serving is not None else manager.model)
+    # Sized from the checkpoint, not a hard-coded width
+    assert manager.model.lstm.input_size == len(engine.FEATURE_COLS)
+    status = model_registry.status()["lstm"]
+    assert status["available"] and status["size_mb"] > 0
+
+
+def test_warm_up_runs_synthetic_inference_once():
+    calls = []
+    registry = ModelRegistry()
+    registry.register("m", lambda: "model", warmup=lambda model: calls.append(model))
+    registry.register("plain", lambda: "other")
+
+    assert registry.warm_up() == {"m": True, "plain": True}
+    assert registry.warm_up(["m"]) == {"m": True}
+    assert calls == ["model"]
+    status = registry.status()["m"]
+    assert status["warm"] and status["warmup_seconds"] is not None
+
+
+def test_warm_up_failure_is_reported_not_raised():
+    def boom(model):
+        raise RuntimeError("bad kernel")
+
+    registry = ModelRegistry()
+    registry.register("m", lambda: "model", warmup=boom)
+    registry.register("missing", lambda: None)
+
+    assert registry.warm_up() == {"m": False, "missing": False}
+    assert registry.status()["m"]["error"] == "warm-up failed: bad kernel"
+    assert registry.status()["missing"]["error"] == "artifact not found"
@@ -0,0 +1,130 @@
+"""
+Tests for concurrent GNews paging (brain.sentiment.news.fetch_gnews): in-flight cap,
+dedupe, single FinBERT batch, early stop and key rotation with _BAD_KEYS.
+GNews and FinBERT are replaced with in-process fakes.
+
+Run: python -m pytest test_news_concurrent.py -q
+"""
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from brain.sentiment import news
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status_code = status
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeGNews:
+    def __init__(self, pages=5, per_page=10, exhausted_keys=(), duplicate_every=0):
+        self.pages = pages
+        self.per_page = per_page
+        self.exhausted_keys = set(exhausted_keys)
+        self.duplicate_every = duplicate_every
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, url, timeout=None):
+        q = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        page, key = int(q["page"]), q["token"]
+        with self.lock:
+            self.calls.append((page, key))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        if key in self.exhausted_keys:
+            return FakeResponse(429, {"errors": ["quota"]})
+        if page > self.pages:
+            return FakeResponse(200, {"articles": []})
+        articles = []
+        for i in range(self.per_page):
+            n = (page - 1) * self.per_page + i
+            # Repeat an earlier title to exercise dedupe
+            title = f"Headline {n - 1}" if self.duplicate_every and n % self.duplicate_every == 0 and n else f"Headline {n}"
+            articles.append({"title": title, "description": "d", "url": f"https://x.com/{n}",
+                             "publishedAt": "2026-10-16T10:00:00Z", "source": {"name": "X"}})
+        return FakeResponse(200, {"articles": articles})
+
+
+@pytest.fixture()
+def gnews(monkeypatch):
+    batches = []
+
+    def fake_batch(texts):
+        batches.append(len(texts))
+        # Every other article is "weak" and gets filtered out
+        return [0.0 if int(t.split()[1].rstrip(".")) % 2 else 0.5 for t in texts]
+
+    monkeypatch.setenv("GNEWS_API_KEY1", "k1")
+    monkeypatch.setenv("GNEWS_API_KEY2", "k2")
+    monkeypatch.setattr(news.SentimentEngine, "analyze_batch", staticmethod(fake_batch))
+    monkeypatch.setattr(news, "_BAD_KEYS", set())
+
+    def install(fake):
+        monkeypatch.setattr(news.requests, "get", fake)
+        return batches
+    return install
+
+
+def test_concurrent_single_batch_and_cap(gnews, monkeypatch):
+    monkeypatch.setenv("GNEWS_MAX_IN_FLIGHT", "2")
+    fake = FakeGNews()
+    batches = gnews(fake)
+
+    articles, sentiment = news.fetch_gnews("AAPL", concurrent=True)
+    assert len(articles) == 20
+    assert sentiment == pytest.approx(0.5)
+    # 2x oversample of 20 -> 4 pages, scored in one batch
+    assert sorted(p for p, _ in fake.calls) == [1, 2, 3, 4]
+    assert batches == [40]
+    assert fake.max_in_flight <= 2
+
+
+def test_concurrent_matches_sequential(gnews):
+    fake = FakeGNews(duplicate_every=7)
+    gnews(fake)
+    sequential, _ = news.fetch_gnews("AAPL", concurrent=False)
+    concurrent, _ = news.fetch_gnews("AAPL", concurrent=True)
+    assert [a["title"] for a in concurrent] == [a["title"] for a in sequential]
+    assert len({a["title"] for a in concurrent}) == len(concurrent)
+
+
+def test_short_page_stops_paging(gnews):
+    fake = FakeGNews(pages=1, per_page=6)
+    gnews(fake)
+    articles, _ = news.fetch_gnews("AAPL", concurrent=True)
+    assert len(articles) == 3
+    assert max(p for p, _ in fake.calls) <= 3
+
+
+def test_exhausted_key_rotates_once(gnews, monkeypatch):
+    monkeypatch.setenv("GNEWS_MAX_IN_FLIGHT", "3")
+    fake = FakeGNews(exhausted_keys={"k1"})
+    gnews(fake)
+    articles, _ = news.fetch_gnews("AAPL", concurrent=True)
+    assert len(articles) == 20
+    assert news._BAD_KEYS == {"k1"}
+    # Once rotated, no page goes back to the dead key
+    first_k2 = min(i for i, (_, k) in enumerate(fake.calls) if k == "k2")
+    assert all(k == "k2" for _, k in fake.calls[first_k2 + 3:])
+
+
+def test_all_keys_exhausted_falls_back_to_mock(gnews):
+    fake = FakeGNews(exhausted_keys={"k1", "k2"})
+    gnews(fake)
+    articles, _ = news.fetch_gnews("AAPL", concurrent=True)
+    assert articles and articles[0]["debug"]["source"] == "Mock/Fallback"
+    assert news._BAD_KEYS == {"k1", "k2"}
@@ -0,0 +1,72 @@
+"""
+Tests for the torch-free StockLSTM port (brain.neural_networks.numpy_lstm).
+
+Run: python -m pytest test_numpy_lstm.py -q
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+from brain.core.config import BrainConfig
+from brain.neural_networks import numpy_lstm
+from brain.neural_networks.model import StockLSTM
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _logits(model, x):
+    with torch.no_grad():
+        return model(torch.from_numpy(x)).numpy()
+
+
+def test_matches_torch_logits_batched(tmp_path):
+    torch.manual_seed(1)
+    model = StockLSTM(input_size=17, hidden_size=32).eval()
+    checkpoint = tmp_path / "hybrid_lstm.pth"
+    torch.save(model.state_dict(), checkpoint)
+    port = numpy_lstm.load(numpy_lstm.export(str(checkpoint), str(tmp_path / "w.npz")), str(checkpoint))
+
+    x = np.random.default_rng(0).standard_normal((5, 60, 17)).astype(np.float32) * 3
+    np.testing.assert_allclose(port(x), _logits(model, x), atol=1e-5)
+    np.testing.assert_allclose(port(x[0]), _logits(model, x[:1]), atol=1e-5)  # single window, no batch axis
+    assert port(x).shape == (5, 3) and port(x).dtype == np.float32
+
+
+@pytest.mark.skipif(not os.path.exists(BrainConfig.MODEL_PATH), reason="LSTM checkpoint not present")
+def test_matches_shipped_checkpoint(tmp_path):
+    from brain.neural_networks.serving import load_eager
+
+    port = numpy_lstm.load(numpy_lstm.export(out_path=str(tmp_path / "w.npz")))
+    x = np.random.default_rng(2).standard_normal((16, 60, port.input_size)).astype(np.float32)
+    np.testing.assert_allclose(port(x), _logits(load_eager(BrainConfig.MODEL_PATH), x), atol=1e-4)
+
+
+def test_stale_export_is_ignored(tmp_path):
+    checkpoint = str(tmp_path / "hybrid_lstm.pth")
+    torch.save(StockLSTM(input_size=17, hidden_size=16).state_dict(), checkpoint)
+    out = numpy_lstm.export(checkpoint, str(tmp_path / "w.npz"))
+    assert numpy_lstm.load(str(tmp_path / "missing.npz"), checkpoint) is None
+
+    torch.save(StockLSTM(input_size=17, hidden_size=16).state_dict(), checkpoint)  # retrained
+    assert numpy_lstm.load(out, checkpoint) is None
+
+
+@pytest.mark.skipif(numpy_lstm.load() is None, reason="No current NumPy export of the checkpoint")
+def test_prediction_engine_runs_without_torch():
+    code = (
+        "import sys, numpy as np\n"
+        "from brain.core.types import StockDataPoint\n"
+        "from brain.prediction.engine import PredictionEngine\n"
+        "closes = 100 + 5 * np.sin(np.arange(200) / 8.0)\n"
+        "h = [StockDataPoint(datetime='2020-01-01', open=c, high=c * 1.01, low=c * 0.99, close=c, volume=10**6)"
+        " for c in closes]\n"
+        "signal, confidence = PredictionEngine().predict(h)\n"
+        "print(signal in ('Bullish', 'Bearish', 'Neutral'), 0 < confidence <= 1, 'torch' in sys.modules)\n"
+    )
+    env = dict(os.environ, LSTM_RUNTIME="numpy")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "True True False"
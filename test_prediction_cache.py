@@ -0,0 +1,139 @@
+"""
+Tests for the persistent prediction cache (brain.prediction.prediction_cache) and
+its use in XGBoostPredictor / PredictionEngine.
+
+Run: python -m pytest test_prediction_cache.py -q
+"""
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from brain.prediction.prediction_cache import PredictionCache, window_digest
+from brain.prediction.xgboost_engine import XGBoostPredictor
+from synthetic_history import make_history
+
+
+def fit_model(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((400, 10))
+    return xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, (X[:, 0] + X[:, 3] > 0).astype(int))
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "predictions.sqlite3")
+    data = make_history(100)
+    cache = PredictionCache(path)
+    key = cache.key("xgboost", "v1", "aapl", data)
+    cache.put_many({key: ("Bullish", 0.71)})
+    cache.close()
+
+    reopened = PredictionCache(path)
+    assert reopened.get_many([key, cache.key("xgboost", "v1", "MSFT", data)]) == {key: ("Bullish", 0.71)}
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["misses"], stats["disk_entries"]) == (1, 1, 1)
+
+
+def test_key_covers_ticker_last_bar_and_window():
+    data = make_history(100)
+    revised = data[:50] + [data[50].model_copy(update={"close": data[50].close + 1})] + data[51:]
+    key = PredictionCache.key("m", "v", "AAPL", data)
+    assert key == PredictionCache.key("m", "v", "aapl", list(data))
+    assert key != PredictionCache.key("m", "v", "AAPL", data[:-1])  # new bar
+    assert key != PredictionCache.key("m", "v", "AAPL", revised)  # revised history, same last bar
+    assert window_digest(data) != window_digest(revised)
+    assert key != PredictionCache.key("m", "v2", "AAPL", data)
+
+
+def test_xgboost_results_are_served_from_cache(tmp_path):
+    cache = PredictionCache(str(tmp_path / "p.sqlite3"))
+    predictor = XGBoostPredictor(model=fit_model(0), cache=cache)
+    data = make_history(300)
+
+    first = predictor.predict_probability(data, ticker="AAPL")
+    assert cache.stats()["writes"] == 1
+    predictor._booster = None  # any recomputation would now fail
+    assert predictor.predict_probability(data, ticker="AAPL") == first
+    assert predictor.predict_probability(data) == ("Neutral (Error)", 0.5)  # no ticker, no caching
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_batch_mixes_hits_and_misses(tmp_path):
+    cache = PredictionCache(str(tmp_path / "p.sqlite3"))
+    predictor = XGBoostPredictor(model=fit_model(0), cache=cache)
+    histories = [make_history(300, seed=s) for s in range(3)]
+    tickers = ["A", "B", "C"]
+
+    expected = predictor.predict_probability_batch(histories, tickers=tickers)
+    predictor.predict_probability(histories[1], ticker="B")
+    assert XGBoostPredictor(model=fit_model(0), cache=cache).predict_probability_batch(
+        histories, tickers=tickers) == expected
+    # Short histories are not cached: their fallback is never a model output
+    predictor.predict_probability(histories[0][:20], ticker="SHORT")
+    assert cache.stats()["writes"] == 3
+
+
+def test_new_model_version_invalidates(tmp_path):
+    path = str(tmp_path / "p.sqlite3")
+    data = make_history(300)
+    old = XGBoostPredictor(model=fit_model(0), cache=PredictionCache(path))
+    old.predict_probability(data, ticker="AAPL")
+    old.cache.close()
+
+    # "Deploy" a retrained model and restart: its entries miss and the old ones are dropped
+    new_cache = PredictionCache(path)
+    new = XGBoostPredictor(model=fit_model(1), cache=new_cache)
+    assert new.model_version != old.model_version
+    assert new_cache.stats()["pruned"] == 1
+    new.predict_probability(data, ticker="AAPL")
+    assert new_cache.stats()["misses"] == 1
+
+
+def test_lstm_results_are_served_from_cache(tmp_path):
+    from brain.prediction.engine import PredictionEngine
+
+    engine = PredictionEngine(cache=PredictionCache(str(tmp_path / "p.sqlite3")))
+    engine._load_resources()
+    if not engine._loaded:
+        pytest.skip("LSTM model or scaler not present")
+    data = make_history(300)
+
+    first = engine.predict(data, ticker="AAPL")
+    engine._forward = None  # any recomputation would now fail
+    assert engine.predict(data, ticker="AAPL") == first
+    assert engine.cache.stats()["memory_hits"] == 1
+
+
+def test_new_bar_supersedes_older_bars_and_rows_are_capped(tmp_path):
+    cache = PredictionCache(str(tmp_path / "p.sqlite3"), max_rows=3)
+    data = make_history(100)
+    old_bar = cache.key("xgboost", "v1", "AAPL", data[:-1])
+    other = cache.key("xgboost", "v1", "MSFT", data[:-1])
+    cache.put_many({old_bar: ("Bullish", 0.6), other: ("Bearish", 0.4)})
+
+    new_bar = cache.key("xgboost", "v1", "AAPL", data)
+    cache.put_many({new_bar: ("Bullish", 0.7)})
+    assert cache.get_many([old_bar, other, new_bar]) == {other: ("Bearish", 0.4), new_bar: ("Bullish", 0.7)}
+    assert cache.stats()["pruned"] == 1
+
+    # Revised windows of the same bar coexist, up to the row cap
+    for i in range(3):
+        revised = data[:10] + [data[10].model_copy(update={"close": data[10].close + i + 1})] + data[11:]
+        cache.put_many({cache.key("xgboost", "v1", "AAPL", revised): ("Neutral", 0.5)})
+    stats = cache.stats()
+    assert stats["disk_entries"] == 3 and stats["evicted"] == 2
+
+
+def test_older_table_layout_is_recreated(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "p.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE predictions (key TEXT PRIMARY KEY, signal TEXT, value REAL, created REAL)")
+    conn.execute("INSERT INTO predictions VALUES ('k', 'Bullish', 0.5, 0)")
+    conn.commit()
+    conn.close()
+
+    cache = PredictionCache(path)
+    key = cache.key("m", "v", "AAPL", make_history(50))
+    cache.put_many({key: ("Bullish", 0.5)})
+    assert cache.get_many(["k", key]) == {key: ("Bullish", 0.5)}
@@ -0,0 +1,108 @@
+"""
+Tests for the columnar price history (brain.core.types.PriceSeries) and its
+acceptance by the brain entry points alongside List[StockDataPoint].
+
+Run: python -m pytest test_price_series.py -q
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from brain.analysis.technical import TechnicalAnalyzer
+from brain.core.config import BrainConfig
+from brain.core.features import build_feature_frame, history_to_frame
+from brain.core.types import PriceSeries, as_price_series
+from brain.prediction.prediction_cache import PredictionCache
+from brain.prediction.xgboost_engine import XGBoostPredictor
+from synthetic_history import make_history
+
+
+def test_validates_and_sorts_once():
+    points = make_history(50)
+    series = PriceSeries.from_points(points[::-1])  # newest first in, oldest first out
+    assert series.datetime.dtype == np.dtype("datetime64[ns]") and series.volume.dtype == np.int64
+    assert series.close.tolist() == [p.close for p in points]
+    assert all(a.flags.c_contiguous and not a.flags.writeable for a in (series.datetime, series.close))
+
+    with pytest.raises(ValueError):
+        PriceSeries(series.datetime, series.open, series.high, series.low, series.close[:-1], series.volume)
+    with pytest.raises(ValueError):
+        PriceSeries(series.datetime, series.open, series.high, series.low, series.close, series.volume + 0.5)
+    with pytest.raises(ValueError):
+        PriceSeries(["2024-01-02", "NaT"], [1, 1], [1, 1], [1, 1], [1, 1], [1, 1])
+    with pytest.raises(AttributeError):
+        series.close = series.open
+
+
+def test_constructors_agree():
+    points = make_history(30)
+    rows = [{"date": p.datetime, "open": p.open, "high": p.high, "low": p.low, "close": p.close,
+             "volume": p.volume, "price": p.close} for p in points]
+    series = as_price_series(points)
+    bars = {"date": series.datetime.astype("datetime64[s]"), "open": series.open, "high": series.high,
+            "low": series.low, "close": series.close, "volume": series.volume}
+    for other in (PriceSeries.from_records(rows), PriceSeries.from_bars(bars)):
+        for name in PriceSeries.__slots__:
+            np.testing.assert_array_equal(getattr(other, name), getattr(series, name))
+    assert as_price_series(series) is series
+
+
+def test_list_compatibility():
+    points = make_history(40)
+    series = as_price_series(points)
+    assert len(series) == 40 and series[-1].close == points[-1].close
+    assert series[-1].datetime == datetime(2022, 2, 11)
+    tail = series[-10:]
+    assert isinstance(tail, PriceSeries) and np.shares_memory(tail.close, series.close)
+    assert [p.close for p in tail] == [p.close for p in points[-10:]]
+
+
+def test_frame_wraps_the_arrays():
+    points = make_history(200)
+    series = as_price_series(points)
+    frame = series.to_frame()
+    assert np.shares_memory(frame["close"].to_numpy(), series.close)
+    pd.testing.assert_frame_equal(frame, history_to_frame(points), check_index_type=False)
+    pd.testing.assert_frame_equal(build_feature_frame(series), build_feature_frame(points), check_index_type=False)
+
+    frame["close"] = 0.0  # replacing a column never touches the series
+    assert series.close[0] == points[0].close
+
+
+def test_technical_analyzer_handles_missing_history():
+    for empty in (None, [], as_price_series([])):
+        assert TechnicalAnalyzer(empty).analyze() == {}
+
+
+def test_entry_points_accept_both(tmp_path, monkeypatch):
+    monkeypatch.setattr(BrainConfig, "PREDICTION_CACHE_ENABLED", False)
+    points = make_history(300)
+    series = as_price_series(points)
+
+    assert TechnicalAnalyzer(series).analyze() == TechnicalAnalyzer(points).analyze()
+
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((400, 10))
+    predictor = XGBoostPredictor(model=xgb.XGBClassifier(n_estimators=20, max_depth=3).fit(X, X[:, 0] > 0))
+    assert predictor.predict_probability(series) == predictor.predict_probability(points)
+    assert predictor.predict_probability_batch([series, points[:100]]) == predictor.predict_probability_batch(
+        [points, as_price_series(points[:100])])
+
+    # A list and its PriceSeries share prediction-cache keys
+    assert PredictionCache.key("m", "v", "AAPL", points) == PredictionCache.key("m", "v", "AAPL", series)
+
+
+def test_analyze_ticker_same_result_for_list_and_series(monkeypatch):
+    from brain.service import BrainService
+
+    monkeypatch.setattr(BrainConfig, "PREDICTION_CACHE_ENABLED", False)
+    service = BrainService()
+    points = make_history(300)
+    from_list = service.analyze_ticker("AAPL", points, 0.1, [])
+    from_series = service.analyze_ticker("AAPL", as_price_series(points), 0.1, [])
+    for result in (from_list, from_series):
+        result.components.pop("stages")
+    assert from_list == from_series
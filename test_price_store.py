@@ -0,0 +1,104 @@
+"""
+Tests for the local OHLCV store (brain.core.price_store): cold full fetch,
+warm tail-only fetch, partial-bar overwrite and provider-failure fallback.
+
+Run: python -m pytest test_price_store.py -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from brain.core.exceptions import DataFetchException
+from brain.core.price_store import PriceStore
+from brain.core.twelvedata import parse_time_series
+
+
+class FakeProvider:
+    """Serves a synthetic daily series ending at `end`, newest first like Twelve Data."""
+
+    def __init__(self, n=800, end="2026-10-15"):
+        dates = pd.bdate_range(end=end, periods=n)
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        self.rows = [{
+            "datetime": d.strftime("%Y-%m-%d"),
+            "open": f"{c:.4f}", "high": f"{c * 1.01:.4f}", "low": f"{c * 0.99:.4f}", "close": f"{c:.4f}",
+            "volume": "1000",
+        } for d, c in zip(dates, close)]
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, ticker, interval, outputsize):
+        self.calls.append(outputsize)
+        if self.fail:
+            raise DataFetchException("rate limited")
+        return parse_time_series(self.rows[-outputsize:][::-1])
+
+
+def test_cold_fetch_then_tail_only(tmp_path, monkeypatch):
+    provider = FakeProvider()
+    store = PriceStore(root=str(tmp_path), fetch=provider)
+
+    bars = store.get_history("aapl", outputsize=300)
+    assert provider.calls == [300]
+    assert len(bars["date"]) == 300
+    assert str(bars["date"][-1]) == "2026-10-15T00:00:00"
+
+    # Two new sessions published; the warm read asks only for the gap
+    provider.rows += FakeProvider(n=2, end="2026-10-19").rows
+    monkeypatch.setattr(PriceStore, "missing_bars", staticmethod(lambda last, interval, now=None: 3))
+    bars = store.get_history("AAPL", outputsize=300)
+    assert provider.calls[-1] == 3
+    assert len(bars["date"]) == 300
+    assert str(bars["date"][-1]) == "2026-10-19T00:00:00"
+    assert np.all(np.diff(bars["date"].astype(np.int64)) > 0)
+    assert store.meta("AAPL")["rows"] == 302
+
+
+def test_partial_last_bar_is_replaced(tmp_path):
+    provider = FakeProvider()
+    store = PriceStore(root=str(tmp_path), fetch=provider)
+    store.get_history("MSFT", outputsize=100)
+
+    provider.rows[-1] = {**provider.rows[-1], "close": "999.0"}
+    bars = store.get_history("MSFT", outputsize=100)
+    assert bars["close"][-1] == 999.0
+    assert len(bars["date"]) == 100
+    assert len(np.unique(bars["date"])) == 100
+
+
+def test_deeper_request_backfills(tmp_path):
+    provider = FakeProvider()
+    store = PriceStore(root=str(tmp_path), fetch=provider)
+    store.get_history("NVDA", outputsize=100)
+    bars = store.get_history("NVDA", outputsize=500)
+    assert provider.calls[-1] == 500
+    assert len(bars["date"]) == 500
+
+    # Provider had fewer bars than asked: the store is marked complete, no more backfills
+    bars = store.get_history("NVDA", outputsize=5000)
+    assert len(bars["date"]) == 800
+    assert store.meta("NVDA")["complete"]
+
+
+def test_provider_failure_serves_disk(tmp_path):
+    provider = FakeProvider()
+    store = PriceStore(root=str(tmp_path), fetch=provider)
+    expected = store.get_history("TSLA", outputsize=200)
+
+    provider.fail = True
+    bars = store.get_history("TSLA", outputsize=200)
+    np.testing.assert_array_equal(bars["close"], expected["close"])
+
+    with pytest.raises(DataFetchException):
+        store.get_history("IBM", outputsize=200)
+
+
+def test_refresh_false_reads_disk_only(tmp_path):
+    provider = FakeProvider()
+    store = PriceStore(root=str(tmp_path), fetch=provider)
+    store.get_history("KO", outputsize=200)
+    n_calls = len(provider.calls)
+    bars = store.get_history("KO", outputsize=150, refresh=False)
+    assert len(provider.calls) == n_calls
+    assert len(bars["date"]) == 150
@@ -0,0 +1,95 @@
+"""
+Tests for the array-backed scaler (brain.neural_networks.normalizer).
+
+Run: python -m pytest test_scaler_arrays.py -q
+"""
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from brain.core.config import BrainConfig
+from brain.neural_networks import normalizer
+from brain.neural_networks.data_processor import DataProcessor
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _fitted(n_features=17, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal((500, n_features)) * rng.uniform(0.1, 50, n_features) + rng.uniform(-5, 5, n_features)
+    x[:, -2:] = 0.0  # Sentiment / NewsVol placeholders: constant columns, scale 1
+    return StandardScaler().fit(x), x
+
+
+def _write_pickle(path, scaler, mean=0.0, std=1.0):
+    with open(path, "wb") as f:
+        pickle.dump({"scaler": scaler, "mean": mean, "std": std}, f)
+
+
+def test_transform_matches_sklearn_exactly(tmp_path):
+    scaler, x = _fitted()
+    pkl = str(tmp_path / "scaler.pkl")
+    _write_pickle(pkl, scaler, mean=0.4, std=2.5)
+    loaded = normalizer.load(normalizer.export(pkl, str(tmp_path / "scaler.npz")), pkl)
+
+    assert np.array_equal(loaded.transform(x), scaler.transform(x))
+    assert np.array_equal(loaded.transform(x[-60:]), scaler.transform(x)[-60:])
+    assert (loaded.target_mean, loaded.target_std, loaded.n_features_in_) == (0.4, 2.5, 17)
+    with pytest.raises(ValueError):
+        loaded.transform(x[:, :5])
+
+
+def test_stale_arrays_are_ignored(tmp_path):
+    pkl, npz = str(tmp_path / "scaler.pkl"), str(tmp_path / "scaler.npz")
+    _write_pickle(pkl, _fitted(seed=0)[0])
+    normalizer.export(pkl, npz)
+    assert normalizer.load(str(tmp_path / "missing.npz"), pkl) is None
+
+    _write_pickle(pkl, _fitted(seed=1)[0])  # pickle rewritten by an older trainer
+    assert normalizer.load(npz, pkl) is None
+
+
+def test_save_scaler_writes_both_formats(tmp_path):
+    processor = DataProcessor(scaler_path=str(tmp_path / "scaler.pkl"))
+    processor.scaler, x = _fitted()
+    processor.target_mean, processor.target_std = 0.1, 3.0
+    processor.save_scaler()
+
+    with open(processor.scaler_path, "rb") as f:
+        legacy = pickle.load(f)
+    assert isinstance(legacy["scaler"], StandardScaler) and legacy["std"] == 3.0
+
+    reader = DataProcessor(scaler_path=processor.scaler_path)
+    assert reader.scaler_arrays_path == str(tmp_path / "scaler.npz")
+    assert reader.load_scaler()
+    assert isinstance(reader.scaler, normalizer.FeatureNormalizer)
+    assert reader.scaler.feature_names == processor.FEATURE_COLS
+    assert (reader.target_mean, reader.target_std) == (0.1, 3.0)
+    assert np.array_equal(reader.scaler.transform(x), legacy["scaler"].transform(x))
+
+
+@pytest.mark.skipif(normalizer.load() is None, reason="No current scaler array export")
+def test_registry_serves_scaler_without_sklearn():
+    code = (
+        "import sys\n"
+        "from brain.core.registry import model_registry\n"
+        "bundle = model_registry.get('scaler')\n"
+        "model_registry.warm_up(['scaler'])\n"
+        "print(type(bundle['scaler']).__name__, 'sklearn' in sys.modules)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["FeatureNormalizer", "False"]
+
+
+@pytest.mark.skipif(not os.path.exists(BrainConfig.SCALER_PATH), reason="Legacy scaler pickle not present")
+def test_shipped_arrays_mirror_the_pickle():
+    shipped = normalizer.load()
+    assert shipped is not None, "scaler.npz missing or stale; run `python -m brain.neural_networks.normalizer`"
+    legacy = normalizer.read_pickle(BrainConfig.SCALER_PATH)
+    np.testing.assert_array_equal(shipped.mean, legacy.mean)
+    np.testing.assert_array_equal(shipped.scale, legacy.scale)
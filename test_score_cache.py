@@ -0,0 +1,78 @@
+"""
+Tests for the persistent FinBERT score cache (brain.analysis.score_cache) and its
+use in SentimentEngine.analyze_batch. The FinBERT pipeline is replaced by a fake.
+
+Run: python -m pytest test_score_cache.py -q
+"""
+import pytest
+
+from brain.analysis.score_cache import ScoreCache, text_key
+from brain.analysis.sentiment import SentimentEngine
+
+
+def test_key_normalizes_whitespace_and_unicode():
+    assert text_key("Apple  beats\nestimates ", "m") == text_key("Apple beats estimates", "m")
+    assert text_key("ﬁnance", "m") == text_key("finance", "m")
+    assert text_key("Apple beats", "m") != text_key("Apple beats", "m2")
+    assert text_key("Apple beats", "m") != text_key("apple beats", "m")
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "scores.sqlite3")
+    cache = ScoreCache(path, "m")
+    keys = cache.keys_for(["a", "b"])
+    cache.put_many({keys[0]: 0.5, keys[1]: -0.25})
+    cache.close()
+
+    reopened = ScoreCache(path, "m")
+    assert reopened.get_many(keys + [text_key("c", "m")]) == {keys[0]: 0.5, keys[1]: -0.25}
+    stats = reopened.stats()
+    assert (stats["disk_hits"], stats["misses"], stats["memory_hits"]) == (2, 1, 0)
+
+    reopened.get_many(keys)
+    assert reopened.stats()["memory_hits"] == 2
+    assert reopened.stats()["hit_rate"] == pytest.approx(4 / 5)
+
+
+def test_memory_layer_is_bounded(tmp_path):
+    cache = ScoreCache(str(tmp_path / "s.sqlite3"), "m", memory_entries=2)
+    keys = cache.keys_for(["a", "b", "c"])
+    cache.put_many(dict(zip(keys, [0.1, 0.2, 0.3])))
+    assert cache.stats()["memory_entries"] == 2
+    # Evicted from memory, still served from disk
+    assert cache.get_many([keys[0]]) == {keys[0]: 0.1}
+    assert cache.stats()["disk_hits"] == 1
+
+
+@pytest.fixture()
+def engine(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_pipeline(inputs, **kwargs):
+        calls.append(list(inputs))
+        return [[{"label": "Positive", "score": 0.9}, {"label": "Negative", "score": 0.1}]
+                if "up" in t else
+                [{"label": "Positive", "score": 0.1}, {"label": "Negative", "score": 0.7}]
+                for t in inputs]
+
+    monkeypatch.setattr(SentimentEngine, "_pipeline", fake_pipeline)
+    monkeypatch.setattr(SentimentEngine, "_score_cache",
+                        ScoreCache(str(tmp_path / "s.sqlite3"), "finbert-test"))
+    return calls
+
+
+def test_analyze_batch_scores_only_misses(engine):
+    first = SentimentEngine.analyze_batch(["stock up", "stock down", "", "stock up"])
+    assert first == [0.76, -0.57, 0.0, 0.76]
+    # Duplicate text in the batch is scored once
+    assert engine == [["stock up", "stock down"]]
+
+    second = SentimentEngine.analyze_batch(["stock  down", "shares up", "stock up"])
+    assert second == [-0.57, 0.76, 0.76]
+    assert engine[-1] == ["shares up"]
+
+
+def test_analyze_batch_all_hits_skips_pipeline(engine):
+    SentimentEngine.analyze_batch(["stock up"])
+    SentimentEngine.analyze_batch(["stock up", "stock up"])
+    assert len(engine) == 1
@@ -0,0 +1,155 @@
+"""
+Tests for single-flight coalescing (backend.singleflight) and its use by the
+single-ticker and batch analysis paths of backend.app.
+
+Run: python -m pytest test_singleflight.py -q
+"""
+import threading
+import time
+
+import pytest
+
+from backend.singleflight import SingleFlight, SingleFlightTimeout
+
+N_THREADS = 8
+
+
+def run_concurrently(flight, key, fn, n=N_THREADS, timeout=5):
+    """Starts n callers of flight.do(key, fn) once fn is already running; returns their outcomes."""
+    outcomes = [None] * n
+
+    def call(i):
+        try:
+            outcomes[i] = flight.do(key, fn, timeout=timeout)
+        except BaseException as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    return outcomes
+
+
+def gated(result=None, error=None):
+    """fn that blocks until every caller has joined, and counts its runs."""
+    runs = []
+    release = threading.Event()
+
+    def fn():
+        runs.append(1)
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+    return fn, runs, release
+
+
+def release_when_joined(flight, release, waiters=N_THREADS - 1):
+    def watch():
+        deadline = time.monotonic() + 5
+        while flight.stats["coalesced"] < waiters and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+    threading.Thread(target=watch).start()
+
+
+def test_concurrent_callers_share_one_result():
+    flight = SingleFlight("test")
+    fn, runs, release = gated(result={"price": 1.0})
+    release_when_joined(flight, release)
+    outcomes = run_concurrently(flight, "AAPL", fn)
+
+    assert len(runs) == 1
+    assert all(result is outcomes[0][0] for result, _ in outcomes)
+    assert sorted(shared for _, shared in outcomes) == [False] + [True] * (N_THREADS - 1)
+    assert flight.stats == {"leaders": 1, "coalesced": N_THREADS - 1, "timeouts": 0}
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_callers_see_the_leaders_exception():
+    flight = SingleFlight("test")
+    error = ValueError("upstream down")
+    fn, runs, release = gated(error=error)
+    release_when_joined(flight, release)
+    outcomes = run_concurrently(flight, "AAPL", fn)
+
+    assert len(runs) == 1
+    assert all(outcome is error for outcome in outcomes)
+    # The failed call is gone: the next caller retries
+    assert flight.do("AAPL", lambda: "ok") == ("ok", False)
+
+
+def test_waiter_times_out_but_leader_completes():
+    flight = SingleFlight("test")
+    fn, runs, release = gated(result="slow")
+    leader = threading.Thread(target=flight.do, args=("AAPL", fn))
+    leader.start()
+    while flight.in_flight() == 0:
+        time.sleep(0.001)
+
+    with pytest.raises(SingleFlightTimeout):
+        flight.do("AAPL", fn, timeout=0.05)
+    release.set()
+    leader.join(5)
+    assert len(runs) == 1 and flight.stats["timeouts"] == 1
+
+
+def test_begin_finish_coalesces_with_do():
+    flight = SingleFlight("test")
+    call, leader = flight.begin("AAPL")
+    assert leader and flight.begin("MSFT")[1]
+
+    joined = []
+    waiter = threading.Thread(target=lambda: joined.append(flight.do("AAPL", lambda: "second run")))
+    waiter.start()
+    while flight.stats["coalesced"] == 0:
+        time.sleep(0.001)
+    flight.finish("AAPL", call, "batched")
+    waiter.join(5)
+    assert joined == [("batched", True)]
+
+
+def test_single_and_batch_requests_share_one_analysis(monkeypatch):
+    import backend.app as app_module
+
+    runs = []
+    release = threading.Event()
+
+    def fetch_stock_data(ticker, range_str, force_refresh=False, company_name=None):
+        runs.append(("single", ticker))
+        release.wait(5)
+        return {"ticker": ticker}
+
+    def fetch_stock_data_batch(tickers, range_str="1W", force_refresh=False):
+        runs.append(("batch", tuple(tickers)))
+        return {t: ({"ticker": t} if t != "SFBAD" else RuntimeError("no prices")) for t in tickers}
+
+    monkeypatch.setattr(app_module, "fetch_stock_data", fetch_stock_data)
+    monkeypatch.setattr(app_module, "fetch_stock_data_batch", fetch_stock_data_batch)
+    monkeypatch.setattr(app_module, "analyze_flight", SingleFlight("analyze"))
+
+    single = []
+    thread = threading.Thread(target=lambda: single.append(app_module.compute_analysis("SFONE", "1W", True)))
+    thread.start()
+    while app_module.analyze_flight.in_flight() == 0:
+        time.sleep(0.001)
+
+    batch = {}
+    batch_thread = threading.Thread(target=lambda: batch.update(
+        app_module.compute_analysis_batch(["SFONE", "SFTWO", "SFBAD"], "1W", force_refresh=True)))
+    batch_thread.start()
+    while app_module.analyze_flight.stats["coalesced"] == 0:
+        time.sleep(0.001)
+    release.set()
+    thread.join(5)
+    batch_thread.join(5)
+
+    # SFONE ran once, in the single-ticker flight; the batch fetched only the rest
+    assert runs == [("single", "SFONE"), ("batch", ("SFTWO", "SFBAD"))]
+    assert single == [({"ticker": "SFONE"}, False)]
+    assert batch["SFONE"] == ({"ticker": "SFONE"}, True)
+    assert batch["SFTWO"] == ({"ticker": "SFTWO"}, False)
+    assert isinstance(batch["SFBAD"][0], RuntimeError)
+    assert app_module.analyze_flight.in_flight() == 0
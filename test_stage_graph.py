@@ -0,0 +1,230 @@
+"""
+Tests for the analysis stage graph (brain.core.stage_graph) and its use in
+BrainService. Model stages are replaced by stubs.
+
+Run: python -m pytest test_stage_graph.py -q
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from brain.core.config import BrainConfig
+from brain.core.stage_graph import Stage, StageGraph
+from brain.prediction.engine import PredictionEngine
+from brain.service import BrainService
+from synthetic_history import make_history
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ThreadPoolExecutor(max_workers=4) as p:
+        yield p
+
+
+def sleeper(seconds, value):
+    def fn(*_):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def test_independent_stages_run_concurrently(pool):
+    graph = StageGraph([
+        Stage("ensemble", lambda a, b, c: a + b + c, deps=["a", "b", "c"], inline=True),
+        Stage("a", sleeper(0.2, 1), deps=["src"]),
+        Stage("b", sleeper(0.2, 2), deps=["src"]),
+        Stage("c", sleeper(0.2, 3), deps=["src"]),
+        Stage("src", lambda: None, inline=True),
+    ])
+    assert [s.name for s in graph.order][0] == "src" and graph.order[-1].name == "ensemble"
+
+    start = time.perf_counter()
+    results, report = graph.run(pool)
+    assert time.perf_counter() - start < 0.4  # ~0.2 s, not 0.6 s
+    assert results["ensemble"] == 6
+    assert all(report[name]["status"] == "ok" for name in "abc")
+    assert all(report[name]["ms"] >= 190 for name in "abc")
+
+
+def test_failure_and_timeout_degrade_to_fallbacks(pool):
+    release = threading.Event()
+
+    def stuck():
+        release.wait(5)
+        return "late"
+
+    def broken():
+        raise RuntimeError("boom")
+
+    graph = StageGraph([
+        Stage("slow", stuck, fallback=lambda: "neutral", timeout=0.1),
+        Stage("broken", broken, fallback=lambda: "neutral"),
+        Stage("ok", lambda: "fine"),
+        Stage("ensemble", lambda *xs: xs, deps=["slow", "broken", "ok"], inline=True),
+    ])
+    start = time.perf_counter()
+    results, report = graph.run(pool)
+    release.set()
+    assert time.perf_counter() - start < 1
+    assert results["ensemble"] == ("neutral", "neutral", "fine")
+    assert report["slow"]["status"] == "timeout"
+    assert report["broken"] == {"ms": report["broken"]["ms"], "status": "error", "error": "boom"}
+
+
+def test_timeout_counts_from_start_not_from_queueing():
+    # One worker: "queued" waits 0.3 s behind "busy" but runs in 0.05 s, well inside its timeout
+    with ThreadPoolExecutor(max_workers=1) as single:
+        graph = StageGraph([
+            Stage("busy", sleeper(0.3, "busy")),
+            Stage("queued", sleeper(0.05, "ran"), fallback=lambda: "fallback", timeout=0.2),
+        ])
+        results, report = graph.run(single)
+    assert results["queued"] == "ran" and report["queued"]["status"] == "ok"
+    assert report["queued"]["ms"] < 200
+
+
+def test_ready_pool_stages_are_submitted_before_inline_work(pool):
+    graph = StageGraph([
+        Stage("features", sleeper(0.2, "df"), inline=True),
+        Stage("independent", sleeper(0.2, "xgb")),
+        Stage("dependent", lambda df: df, deps=["features"]),
+    ])
+    start = time.perf_counter()
+    results, _ = graph.run(pool)
+    assert time.perf_counter() - start < 0.35  # overlapped, not 0.4 s
+    assert (results["independent"], results["dependent"]) == ("xgb", "df")
+
+
+def test_errors_without_fallback_propagate(pool):
+    with pytest.raises(ZeroDivisionError):
+        StageGraph([Stage("x", lambda: 1 / 0)]).run(pool)
+    with pytest.raises(TimeoutError):
+        StageGraph([Stage("x", sleeper(0.5, 1), timeout=0.05)]).run(pool)
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda b: b, deps=["b"]), Stage("b", lambda a: a, deps=["a"])])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda m: m, deps=["missing"])])
+    with pytest.raises(ValueError):
+        StageGraph([Stage("a", lambda: 1), Stage("a", lambda: 2)])
+
+
+class SlowLSTM:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def predict(self, data, features=None, ticker=None):
+        time.sleep(self.seconds)
+        return ("Bullish", 0.9)
+
+    def predict_batch(self, histories, features=None, tickers=None):
+        time.sleep(self.seconds)
+        return [("Bullish", 0.9)] * len(histories)
+
+
+class BrokenXGB:
+    def predict_probability(self, data, features=None, ticker=None):
+        raise RuntimeError("xgb down")
+
+    def predict_probability_batch(self, histories, features=None, tickers=None):
+        raise RuntimeError("xgb down")
+
+
+@pytest.fixture
+def service():
+    svc = BrainService.__new__(BrainService)
+    svc.config = BrainConfig()
+    svc.config.BRAIN_STAGE_TIMEOUT_SECONDS = 0.2
+    svc.xgb_predictor = BrokenXGB()
+    return svc
+
+
+def test_analyze_ticker_degrades_slow_and_failing_models(service):
+    service.lstm_predictor = SlowLSTM(1.0)
+    start = time.perf_counter()
+    result = service.analyze_ticker("AAPL", make_history(200), 0.1, [])
+    assert time.perf_counter() - start < 0.8
+
+    stages = result.components["stages"]
+    assert set(stages) == {"features", "technical", "lstm", "xgboost", "ensemble"}
+    assert (stages["lstm"]["status"], stages["xgboost"]["status"], stages["technical"]["status"]) == (
+        "timeout", "error", "ok")
+    assert result.components["neural"]["signal"] == "Neutral (Error)"
+    assert result.components["expert_opinion"]["xgboost"]["probability"] == 50.0
+    assert result.components["technical"]["values"]["rsi"] is not None
+
+
+def test_analyze_batch_runs_through_the_graph(service):
+    service.lstm_predictor = SlowLSTM(0.0)
+    results = service.analyze_batch(["A", "B"], [make_history(200, s) for s in (0, 1)], [0.0, 0.2], [[], []])
+    assert [r.ticker for r in results] == ["A", "B"]
+    assert all(r.components["neural"]["signal"] == "Bullish" for r in results)
+    assert results[0].components["stages"]["xgboost"]["status"] == "error"
+
+
+class RecordingLSTM:
+    """Batched LSTM stub that fails the whole batch if it is handed an unusable history."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, histories, features=None, tickers=None):
+        self.batches.append(list(tickers))
+        if any(frame is None or frame.empty for frame in features):
+            raise RuntimeError("bad window in batch")
+        return [("Bullish", 0.9)] * len(histories)
+
+
+def test_analyze_batch_isolates_a_malformed_history(service):
+    service.lstm_predictor = RecordingLSTM()
+    histories = [make_history(200, 0), [{"date": "2024-01-01"}], [], make_history(200, 1)]
+    results = service.analyze_batch(["A", "BAD", "EMPTY", "B"], histories, [0.0] * 4, [[]] * 4)
+
+    assert isinstance(results[1], AttributeError) and isinstance(results[2], ValueError)
+    assert [r.ticker for r in (results[0], results[3])] == ["A", "B"]
+    # Only the good tickers reach the models, so their predictions and technicals survive
+    assert service.lstm_predictor.batches == [["A", "B"]]
+    for result in (results[0], results[3]):
+        assert result.components["neural"]["signal"] == "Bullish"
+        assert result.components["technical"]["values"]["rsi"] is not None
+        assert result.components["stages"]["lstm"]["status"] == "ok"
+
+
+def test_analyze_batch_degrades_technicals_per_ticker(service, monkeypatch):
+    service.lstm_predictor = SlowLSTM(0.0)
+    histories = [make_history(200, 0), make_history(200, 1)]
+    original = BrainService._technical_analysis
+    broken = histories[1][-1].close
+
+    def technical_analysis(self, df):
+        if df["close"].iloc[-1] == broken:
+            raise KeyError("RSI")
+        return original(self, df)
+
+    monkeypatch.setattr(BrainService, "_technical_analysis", technical_analysis)
+    results = service.analyze_batch(["A", "B"], histories, [0.0, 0.0], [[], []])
+    assert results[0].components["technical"]["values"]["rsi"] is not None
+    assert results[1].components["technical"]["values"]["rsi"] is None  # neutral fallback, B only
+    assert results[0].components["stages"]["technical"]["status"] == "ok"
+
+
+def test_lstm_batch_skips_only_the_unreadable_window(monkeypatch):
+    engine = PredictionEngine(cache=None)
+    good, bad = make_history(200, 0), make_history(200, 1)
+
+    def prepare_data(data, features=None):
+        if data is bad:
+            raise ValueError("corrupt window")
+        return np.zeros((1, engine.SEQUENCE_LENGTH, len(engine.FEATURE_COLS)))
+
+    monkeypatch.setattr(engine, "_load_resources", lambda: None)
+    monkeypatch.setattr(engine, "_loaded", True)
+    monkeypatch.setattr(engine, "prepare_data", prepare_data)
+    monkeypatch.setattr(engine, "_forward", lambda windows: np.tile([0.0, 0.0, 5.0], (len(windows), 1)))
+    results = engine.predict_batch([good, bad, good])
+    assert [signal for signal, _ in results] == ["Bullish", "Neutral (Error)", "Bullish"]
@@ -0,0 +1,127 @@
+"""
+Startup of the Flask service: import-time budget (fast-start mode) and warm-up readiness.
+
+Importing backend.app must not pull in the ML stack; models and BrainService are
+built on first use. The budget is measured with `python -X importtime` and can be
+tuned per machine with IMPORT_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("torch", "transformers", "xgboost", "sklearn", "pandas", "scipy")
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", 2000))
+
+
+def _run(*args):
+    env = dict(os.environ, FAST_START="true")
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def test_app_import_skips_heavy_modules():
+    out = _run("-c", "import json, sys, backend.app; "
+                     f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == []
+
+
+def test_app_import_within_budget():
+    out = _run("-X", "importtime", "-c", "import backend.app")
+    cumulative_us = None
+    for line in out.stderr.splitlines():
+        if line.startswith("import time:") and line.rstrip().endswith("| backend.app"):
+            cumulative_us = int(line.split("|")[1])
+    assert cumulative_us is not None, "backend.app missing from -X importtime output"
+    assert cumulative_us / 1000 < IMPORT_BUDGET_MS, (
+        f"import backend.app took {cumulative_us / 1000:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+
+
+def test_brain_service_built_on_first_use():
+    out = _run("-c", "import sys, backend.app as a; before = 'torch' in sys.modules; "
+                     "s = a.get_brain_service(); print(before, s is a.get_brain_service())")
+    assert out.stdout.strip().splitlines()[-1] == "False True"
+
+
+def test_readiness_holds_traffic_until_warm(monkeypatch):
+    import backend.app as app_module
+
+    class FakeBrain:
+        def analyze_ticker(self, ticker, history, sentiment, news):
+            assert len(history) >= 90
+            return None
+
+    monkeypatch.setattr(app_module, "WARMUP_ON_BOOT", True)
+    monkeypatch.setattr(app_module, "WARMUP_MODELS", [])
+    monkeypatch.setattr(app_module, "get_brain_service", FakeBrain)
+    monkeypatch.setitem(app_module.warmup_state, "state", "pending")
+    client = app_module.app.test_client()
+
+    assert client.get("/health/live").status_code == 200
+    warming = client.get("/health/ready")
+    assert warming.status_code == 503 and warming.json["status"] == "warming"
+
+    app_module.warm_up()
+    ready = client.get("/health/ready")
+    assert ready.status_code == 200 and ready.json["warmup"]["state"] == "done"
+    assert set(ready.json["models"]) == {"finbert", "lstm_serving", "lstm_numpy", "lstm", "scaler", "xgboost"}
+
+
+def test_failed_warmup_is_not_ready(monkeypatch):
+    import backend.app as app_module
+
+    class BrokenBrain:
+        def analyze_ticker(self, ticker, history, sentiment, news):
+            raise RuntimeError("weights missing")
+
+    monkeypatch.setattr(app_module, "WARMUP_MODELS", [])
+    monkeypatch.setattr(app_module, "get_brain_service", BrokenBrain)
+    for key in ("state", "error", "seconds", "brain_seconds"):
+        monkeypatch.setitem(app_module.warmup_state, key, app_module.warmup_state[key])
+    client = app_module.app.test_client()
+
+    app_module.warm_up()
+    response = client.get("/health/ready")
+    assert response.status_code == 503 and response.json["status"] == "degraded"
+    assert response.json["warmup"]["state"] == "failed" and "weights missing" in response.json["warmup"]["error"]
+    assert client.get("/health/live").status_code == 200
+
+
+def test_dotenv_is_loaded_before_the_switches_are_read():
+    # Stands in for a .env file: whatever load_dotenv puts in os.environ must reach the flags
+    out = _run("-c", "import json, os, dotenv; "
+                     "dotenv.load_dotenv = lambda *a, **k: os.environ.update("
+                     "WARMUP_MODELS='scaler', FAST_START='maybe', WARMUP_ON_BOOT='false', LSTM_RUNTIME='numpy') "
+                     "or True; import backend.app as a; from brain.core.config import BrainConfig; "
+                     "print(json.dumps([a.WARMUP_MODELS, a.FAST_START, BrainConfig.LSTM_RUNTIME]))")
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == [["scaler"], False, "numpy"]
+
+
+def test_warmup_keeps_one_lstm_runtime(monkeypatch):
+    import backend.app as app_module
+    from brain.core.registry import ModelRegistry
+
+    assert "lstm" not in app_module.WARMUP_MODELS  # the eager checkpoint is only a fallback
+
+    class FakeBrain:
+        def analyze_ticker(self, ticker, history, sentiment, news):
+            return None
+
+    def run(serving_available):
+        registry = ModelRegistry()
+        registry.register("lstm_serving", lambda: object() if serving_available else None)
+        registry.register("lstm", object)
+        registry.register("lstm_numpy", lambda: None)
+        monkeypatch.setattr(app_module, "model_registry", registry)
+        monkeypatch.setattr(app_module, "WARMUP_MODELS", ["lstm_serving"])
+        app_module.warm_up()
+        assert app_module.warmup_state["state"] == "done"
+        return registry.is_loaded("lstm")
+
+    monkeypatch.setattr(app_module, "get_brain_service", FakeBrain)
+    monkeypatch.setattr(app_module, "lstm_candidates", lambda: ["lstm_serving", "lstm"])
+    for key in ("state", "error", "seconds", "brain_seconds"):
+        monkeypatch.setitem(app_module.warmup_state, key, app_module.warmup_state[key])
+
+    assert run(serving_available=True) is False
+    assert run(serving_available=False) is True
@@ -0,0 +1,128 @@
+"""
+Tests for the incremental indicator engine (brain.core.streaming): per-bar state
+equal to add_technical_indicators, bounded per-ticker buffers, rebuilds on
+revised history, snapshot/restore, and its use by BrainService.
+
+Run: python -m pytest test_streaming_indicators.py -q
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from brain.core.features import build_feature_frame
+from brain.core.indicators import add_technical_indicators
+from brain.core.streaming import INDICATOR_COLUMNS, IndicatorState, StreamingIndicatorEngine
+from brain.core.types import PriceSeries
+
+
+def make_series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return PriceSeries(np.datetime64("2006-01-02") + np.arange(n), close * 0.995, close * 1.01, close * 0.99,
+                       close, rng.integers(1e5, 1e7, n))
+
+
+def assert_columns_close(actual: pd.DataFrame, expected: pd.DataFrame):
+    assert actual.index.equals(expected.index)
+    for col in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(actual[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9, atol=1e-9,
+                                   err_msg=col)
+
+
+def test_per_bar_state_matches_add_technical_indicators():
+    series = make_series(400)
+    state = IndicatorState()
+    rows = [state.update(h, l, c) for h, l, c in zip(series.high, series.low, series.close)]
+    assert_columns_close(pd.DataFrame(rows, index=series.to_frame().index),
+                         add_technical_indicators(series.to_frame()))
+
+
+def test_state_seeded_from_arrays_continues_like_the_loop():
+    series = make_series(300)
+    looped = IndicatorState()
+    for h, l, c in zip(series.high[:250], series.low[:250], series.close[:250]):
+        looped.update(h, l, c)
+    seeded = IndicatorState.from_arrays(series.high[:250], series.low[:250], series.close[:250])
+    for h, l, c in zip(series.high[250:], series.low[250:], series.close[250:]):
+        expected, actual = looped.update(h, l, c), seeded.update(h, l, c)
+        np.testing.assert_allclose([actual[k] for k in INDICATOR_COLUMNS], [expected[k] for k in INDICATOR_COLUMNS],
+                                   rtol=1e-9)
+
+
+def test_new_bars_update_incrementally_with_bounded_buffers():
+    series = make_series(2000)
+    engine = StreamingIndicatorEngine(keep_rows=60)
+    assert_columns_close(engine.frame("AAPL", series[:1995], 60), build_feature_frame(series[:1995], rows=60))
+
+    for end in range(1996, 2001):
+        frame = engine.frame("aapl", series[:end], 60)
+        assert len(frame) == 60 and (frame["Sentiment"] == 0).all()
+        assert_columns_close(frame, add_technical_indicators(series[:end].to_frame()).iloc[-60:])
+    assert engine.stats()["incremental"] == 5 and engine.stats()["bars_appended"] == 5
+    assert engine.stats()["rebuilds"] == 1
+
+    stream = engine._streams["AAPL"]
+    assert all(len(v) == 60 for v in stream.rows.values())
+    assert len(stream.timestamps) == len(stream.bars) == engine.verify_bars
+
+
+def test_revised_or_shifted_history_rebuilds():
+    series = make_series(1000)
+    engine = StreamingIndicatorEngine(keep_rows=60)
+    engine.frame("AAPL", series, 60)
+
+    close = series.close.copy()
+    close[-10] *= 1.05  # a revised bar inside the verified window
+    revised = PriceSeries(series.datetime, series.open, series.high, series.low, close, series.volume)
+    assert_columns_close(engine.frame("AAPL", revised, 60), build_feature_frame(revised, rows=60))
+    assert engine.stats()["rebuilds"] == 2
+
+    # The window start sliding forward keeps the tail aligned: still incremental
+    engine.frame("AAPL", revised[1:], 60)
+    assert engine.stats()["incremental"] == 1
+    # A short history from another start cannot reuse a stream built from a longer one
+    assert_columns_close(engine.frame("AAPL", revised[-100:], 60), build_feature_frame(revised[-100:], rows=60))
+    assert engine.stats()["rebuilds"] == 3
+
+
+def test_tickers_are_bounded():
+    engine = StreamingIndicatorEngine(keep_rows=10, max_tickers=2)
+    for ticker in ("A", "B", "C"):
+        engine.frame(ticker, make_series(200), 10)
+    assert engine.snapshot("A") is None and engine.stats()["tickers"] == 2
+
+
+def test_snapshot_restore_round_trip():
+    series = make_series(800)
+    engine = StreamingIndicatorEngine(keep_rows=60)
+    engine.frame("AAPL", series[:-3], 60)
+    snapshot = json.loads(json.dumps(engine.snapshot("AAPL")))
+
+    restored = StreamingIndicatorEngine(keep_rows=60)
+    restored.restore("AAPL", snapshot)
+    pd.testing.assert_frame_equal(restored.frame("AAPL", series, 60), engine.frame("AAPL", series, 60))
+    assert restored.stats()["incremental"] == 1 and restored.stats()["rebuilds"] == 0
+
+
+def test_brain_service_reuses_streams(monkeypatch):
+    from brain.core.config import BrainConfig
+    from brain.service import BrainService
+
+    monkeypatch.setattr(BrainConfig, "PREDICTION_CACHE_ENABLED", False)
+    monkeypatch.setattr(BrainService, "_indicator_streams", None)
+    service = BrainService()
+    series = make_series(700)
+    service.analyze_ticker("STREAM", series[:-1], 0.0, [])
+    result = service.analyze_ticker("STREAM", series, 0.0, [])
+    assert service.get_indicator_streams().stats()["incremental"] == 1
+
+    monkeypatch.setattr(BrainConfig, "STREAMING_INDICATORS", False)
+    assert service.get_indicator_streams() is None
+    rebuilt = service.analyze_ticker("STREAM", series, 0.0, [])
+    expected, actual = result.components["technical"]["values"], rebuilt.components["technical"]["values"]
+    for name in ("rsi", "sma", "current_price"):
+        assert actual[name] == pytest.approx(expected[name], rel=1e-9)
+    assert actual["macd"] == pytest.approx(expected["macd"], rel=1e-9)
+    assert actual["bollinger"] == pytest.approx(expected["bollinger"], rel=1e-9)
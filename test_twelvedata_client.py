@@ -0,0 +1,179 @@
+"""
+Tests for the pooled Twelve Data client (brain.core.twelvedata) against a local
+fake HTTP server: parsing, retry on transient failures, error payloads,
+read timeouts, connection reuse and the shared token bucket (with a bounded wait).
+
+Run: python -m pytest test_twelvedata_client.py -q
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pytest
+
+from brain.core.exceptions import DataFetchException
+from brain.core.price_store import PriceStore
+from brain.core.twelvedata import RateLimitTimeout, TokenBucket, TwelveDataClient, TwelveDataError
+
+
+def make_values(n):
+    # Twelve Data order: newest first, numbers as strings
+    return [{
+        "datetime": f"2026-01-{day:02d}",
+        "open": str(100.0 + day), "high": str(101.0 + day), "low": str(99.0 + day),
+        "close": str(100.5 + day), "volume": str(1000 * day),
+    } for day in range(n, 0, -1)]
+
+
+class FakeTwelveData(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    script = []       # queued behaviours for upcoming requests: int status, "slow", or dict payload
+    requests = []
+    ports = set()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        FakeTwelveData.requests.append((url.path, params))
+        FakeTwelveData.ports.add(self.client_address[1])
+
+        action = FakeTwelveData.script.pop(0) if FakeTwelveData.script else None
+        if action == "slow":
+            time.sleep(0.5)
+        if isinstance(action, int):
+            return self._send(action, {"status": "error"})
+        if isinstance(action, dict):
+            return self._send(200, action)
+        if url.path == "/time_series":
+            return self._send(200, {"status": "ok", "values": make_values(int(params["outputsize"]))})
+        return self._send(200, {"status": "ok", "data": [{"symbol": params.get("symbol")}]})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    FakeTwelveData.script = []
+    FakeTwelveData.requests = []
+    FakeTwelveData.ports = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeTwelveData)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(base_url, **kwargs):
+    kwargs.setdefault("limiter", TokenBucket(1000, per=1.0))
+    kwargs.setdefault("backoff", 0.01)
+    return TwelveDataClient(api_key="test", base_url=base_url, **kwargs)
+
+
+def test_time_series_parses_to_arrays(server):
+    bars = make_client(server).time_series("AAPL", outputsize=5)
+    assert bars["date"].dtype == np.dtype("datetime64[s]")
+    assert bars["volume"].dtype == np.int64
+    np.testing.assert_array_equal(bars["close"], [101.5, 102.5, 103.5, 104.5, 105.5])
+    assert str(bars["date"][0]) == "2026-01-01T00:00:00"
+    path, params = FakeTwelveData.requests[0]
+    assert path == "/time_series" and params["apikey"] == "test" and params["outputsize"] == "5"
+
+
+def test_retries_transient_failures(server):
+    FakeTwelveData.script = [503, {"status": "error", "code": 429, "message": "credits"}]
+    client = make_client(server)
+    bars = client.time_series("AAPL", outputsize=3)
+    assert len(bars["close"]) == 3
+    assert client.stats["retries"] == 2
+    assert len(FakeTwelveData.requests) == 3
+
+
+def test_gives_up_after_max_retries(server):
+    FakeTwelveData.script = [500] * 10
+    client = make_client(server, max_retries=2)
+    with pytest.raises(TwelveDataError):
+        client.time_series("AAPL")
+    assert len(FakeTwelveData.requests) == 3
+
+
+def test_error_payload_is_not_retried(server):
+    FakeTwelveData.script = [{"status": "error", "code": 400, "message": "symbol not found"}]
+    client = make_client(server)
+    with pytest.raises(TwelveDataError, match="symbol not found") as excinfo:
+        client.time_series("NOPE")
+    assert excinfo.value.code == 400
+    assert len(FakeTwelveData.requests) == 1
+
+
+def test_read_timeout_is_retried(server):
+    FakeTwelveData.script = ["slow"]
+    client = make_client(server, read_timeout=0.1)
+    bars = client.time_series("AAPL", outputsize=2)
+    assert len(bars["close"]) == 2
+    assert client.stats["retries"] == 1
+
+
+def test_connections_are_reused(server):
+    client = make_client(server)
+    for _ in range(5):
+        client.time_series("AAPL", outputsize=2)
+    assert len(FakeTwelveData.ports) == 1
+
+
+def test_rate_limiter_paces_requests(server):
+    # 5 requests with a burst of 2 at 20/s: at least 3 * 50ms of waiting
+    client = make_client(server, limiter=TokenBucket(20, per=1.0, capacity=2))
+    start = time.monotonic()
+    for _ in range(5):
+        client.time_series("AAPL", outputsize=1)
+    assert time.monotonic() - start >= 0.14
+
+
+def test_symbol_search_skips_limiter(server):
+    limiter = TokenBucket(1, per=60.0, capacity=1)
+    limiter.acquire()
+    client = make_client(server, limiter=limiter)
+    assert client.symbol_search("AAP") == [{"symbol": "AAP"}]
+
+
+def test_token_bucket_timeout():
+    bucket = TokenBucket(1, per=60.0, capacity=1)
+    assert bucket.acquire(timeout=0.01)
+    assert not bucket.acquire(timeout=0.05)
+
+
+def test_rate_limit_wait_is_bounded(server):
+    limiter = TokenBucket(1, per=60.0, capacity=1)
+    limiter.acquire()
+    client = make_client(server, limiter=limiter, rate_limit_timeout=0.05)
+    start = time.monotonic()
+    with pytest.raises(RateLimitTimeout) as excinfo:
+        client.time_series("AAPL", outputsize=2)
+    assert time.monotonic() - start < 1 and excinfo.value.code == 429
+    assert FakeTwelveData.requests == [] and client.stats["throttled"] == 1
+
+
+def test_rate_limited_store_serves_disk_or_fails(server, tmp_path):
+    limiter = TokenBucket(1, per=60.0, capacity=1)
+    client = make_client(server, limiter=limiter, rate_limit_timeout=0.05)
+    store = PriceStore(root=str(tmp_path), fetch=lambda t, i, n: client.time_series(t, interval=i, outputsize=n))
+    stored = store.get_history("AAPL", outputsize=5)  # spends the only credit
+
+    # The bucket is empty: stored bars are served instead of waiting for a credit
+    np.testing.assert_array_equal(store.get_history("AAPL", outputsize=5)["close"], stored["close"])
+    with pytest.raises(DataFetchException):
+        store.get_history("MSFT", outputsize=5)
+    assert client.stats["throttled"] == 2 and len(FakeTwelveData.requests) == 1
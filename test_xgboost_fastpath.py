@@ -0,0 +1,83 @@
+"""
+Parity tests for the XGBoost fast path (brain.prediction.xgboost_engine):
+lean features + running normalization + booster.inplace_predict must score
+exactly like the previous path (full feature frame, StandardScaler fitted on
+the window, sklearn predict_proba).
+
+Run: python -m pytest test_xgboost_fastpath.py -q
+"""
+import numpy as np
+import pytest
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+
+from brain.core.config import BrainConfig
+from brain.core.features import build_feature_frame, select_features
+from brain.prediction.xgboost_engine import XGBoostPredictor, feature_matrix, history_arrays
+from synthetic_history import make_history
+
+
+@pytest.fixture(autouse=True)
+def no_prediction_cache(monkeypatch):
+    # Parity is about the computation; never answer from the on-disk prediction cache
+    monkeypatch.setattr(BrainConfig, "PREDICTION_CACHE_ENABLED", False)
+
+
+@pytest.fixture(scope="module", params=["binary", "multiclass"])
+def model(request):
+    rng = np.random.default_rng(42)
+    X = rng.standard_normal((600, 10))
+    if request.param == "binary":
+        y = (X[:, 0] + X[:, 3] > 0).astype(int)
+        clf = xgb.XGBClassifier(n_estimators=40, max_depth=3)
+    else:
+        y = np.digitize(X[:, 0] - X[:, 5], [-0.5, 0.5])
+        clf = xgb.XGBClassifier(n_estimators=40, max_depth=3, objective="multi:softprob", num_class=3)
+    return clf.fit(X, y)
+
+
+def reference(model, data):
+    """The pre-fast-path computation."""
+    cols = XGBoostPredictor(model=model).FEATURE_COLS
+    df = select_features(build_feature_frame(data), cols)
+    row = StandardScaler().fit_transform(df.values)[-1]
+    prob_up = float(model.predict_proba(row[None])[0][1])
+    return XGBoostPredictor._probability_to_signal(prob_up), round(prob_up, 4)
+
+
+def test_feature_matrix_matches_feature_frame():
+    data = make_history(400, seed=3)
+    cols = XGBoostPredictor(model=None).FEATURE_COLS
+    frame = build_feature_frame(data)[cols].to_numpy()
+    np.testing.assert_allclose(feature_matrix(history_arrays(data)[1]), frame, rtol=1e-12, equal_nan=True)
+
+
+def test_single_ticker_parity(model):
+    predictor = XGBoostPredictor(model=model)
+    for seed in range(5):
+        data = make_history(250, seed=seed)
+        expected = reference(model, data)
+        assert predictor.predict_probability(data) == expected
+        assert predictor.predict_probability(data, features=build_feature_frame(data)) == expected
+
+
+def test_batch_parity(model):
+    histories = [make_history(n, seed=s) for s, n in enumerate([120, 300, 40, 500, 90])]
+    expected = [reference(model, h) if len(h) >= 50 else ("Neutral (Low Data)", 0.5) for h in histories]
+    predictor = XGBoostPredictor(model=model)
+    tickers = ["A", "B", "C", "D", "E"]
+    assert predictor.predict_probability_batch(histories) == expected
+    assert predictor.predict_probability_batch(histories, tickers=tickers) == expected
+
+
+def test_incremental_normalization_tracks_growing_history(model):
+    predictor = XGBoostPredictor(model=model)
+    full = make_history(400, seed=7)
+    for n in range(200, 400, 13):
+        assert predictor.predict_probability(full[:n], ticker="aapl") == reference(model, full[:n])
+    assert len(predictor._states) == 1
+
+    # A revised bar inside the window forces a rebuild instead of a wrong incremental update
+    revised = list(full)
+    revised[300] = revised[300].model_copy(update={"close": revised[300].close * 1.05})
+    assert predictor.predict_probability(revised, ticker="AAPL") == reference(model, revised)
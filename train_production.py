@@ -1,4 +1,3 @@
-import time
 import numpy as np
 import sys
 import os
@@ -80,9 +79,6 @@ def fetch_and_aggregate():
             except Exception as e:
                 print(f"Error {ticker}: {e}")
 
-        if i + batch_size < total_tickers:
-            print("Cooling down 70s...")
-            time.sleep(70)
 
     if not raw_train_feats: raise ValueError("No data")
 
@@ -162,8 +158,7 @@ def fetch_and_process_correctly():
             except Exception as e:
                 print(f"Error {ticker}: {e}")
         
-        if i + batch_size < total_tickers:
-            time.sleep(70)
+        # No fixed cool-down: the shared Twelve Data rate limiter paces fetches
             
     # Phase 2: Global Scaling (Features Only)
     print("--- Phase 2: Global Scaling ---")